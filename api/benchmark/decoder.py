@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+import json
+import timeit
+from datetime import UTC, datetime
+
+import orjson
+
+from src.listener.decoder import decode_node_telemetry
+
+NUMBER = 100_000
+
+REPEAT = 5
+
+NODE_MAC_ADDRESS = "05:05:05:05:05:05"
+
+PAYLOAD = orjson.dumps(
+    {
+        "core_coldtag_mac_address": "01:01:01:01:01:01",
+        "temperature": 4.125,
+        "humidity": 61.5,
+        "core_coldtag_received_time": "2025-01-01T00:00:05Z",
+        "event_time": "2025-01-01T00:00:00Z",
+    }
+)
+
+
+def decode_node_telemetry_legacy(node_mac_address: str, payload: bytes) -> tuple:
+    data = json.loads(payload.decode())
+    return (
+        node_mac_address,
+        data["core_coldtag_mac_address"],
+        float(data["temperature"]),
+        float(data["humidity"]),
+        datetime.strptime(data["core_coldtag_received_time"], "%Y-%m-%dT%H:%M:%SZ").astimezone(UTC),
+        datetime.strptime(data["event_time"], "%Y-%m-%dT%H:%M:%SZ").astimezone(UTC),
+    )
+
+
+def main() -> None:
+    candidates = {
+        "legacy (json + strptime)": lambda: decode_node_telemetry_legacy(NODE_MAC_ADDRESS, PAYLOAD),
+        "decoder (orjson + fromisoformat)": lambda: decode_node_telemetry(NODE_MAC_ADDRESS, PAYLOAD),
+    }
+
+    results = {
+        name: min(timeit.repeat(candidate, number=NUMBER, repeat=REPEAT)) / NUMBER * 1e9
+        for name, candidate in candidates.items()
+    }
+    baseline = next(iter(results.values()))
+
+    for name, elapsed in results.items():
+        print(f"{name:<36} {elapsed:>10.1f} ns/message {baseline / elapsed:>6.2f}x")  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
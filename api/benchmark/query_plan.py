@@ -0,0 +1,400 @@
+#!/usr/bin/env python3
+import asyncio
+import contextlib
+import os
+import re
+import sys
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterator
+from datetime import UTC, datetime, timedelta
+from typing import Any, Self
+
+import asyncpg
+import orjson
+from fastapi import FastAPI
+
+from src.persistence import EventKey, EventPage
+from src.persistence.core_coldtag import CoreColdtagEventCreateSchema, CoreColdtagPersistence
+from src.persistence.node_coldtag import NodeColdtagEventCreateSchema, NodeColdtagPersistence
+from src.persistence.route_cycle import RouteCyclePersistence
+
+CORES = 20
+
+NODES = 200
+
+DAYS = 30
+
+# One reading per node and per core every this many minutes over DAYS
+INTERVAL_MINUTES = 15
+
+EVENT_TABLES = frozenset(
+    {
+        "core_coldtag_event",
+        "node_coldtag_event",
+        "node_coldtag_event_alert_liquid",
+        "node_coldtag_event_alert_impact",
+        "route_cycle_alert_temperature",
+        "route_cycle_alert_humidity",
+    }
+)
+
+# Rows are generated in event_time order, the way ingestion appends them
+SEED = f"""
+    INSERT INTO create_core_coldtag (mac_address)
+    SELECT 'FE:ED:00:00:' || LPAD(TO_HEX(i / 256), 2, '0') || ':' || LPAD(TO_HEX(i % 256), 2, '0')
+    FROM GENERATE_SERIES(1, {CORES}) i;
+
+    INSERT INTO create_node_coldtag (mac_address)
+    SELECT 'FE:ED:00:01:' || LPAD(TO_HEX(i / 256), 2, '0') || ':' || LPAD(TO_HEX(i % 256), 2, '0')
+    FROM GENERATE_SERIES(1, {NODES}) i;
+
+    CREATE TEMPORARY TABLE seed_core ON COMMIT DROP AS
+    SELECT id FROM create_core_coldtag WHERE mac_address LIKE 'FE:ED:00:00:%';
+
+    CREATE TEMPORARY TABLE seed_node ON COMMIT DROP AS
+    SELECT id, (SELECT MIN(id) FROM seed_core) + id % {CORES} AS core_coldtag_id
+    FROM create_node_coldtag WHERE mac_address LIKE 'FE:ED:00:01:%';
+
+    CREATE TEMPORARY TABLE seed_time ON COMMIT DROP AS
+    SELECT t AS event_time
+    FROM GENERATE_SERIES(NOW() - INTERVAL '{DAYS} days', NOW(), INTERVAL '{INTERVAL_MINUTES} minutes') t;
+
+    INSERT INTO core_coldtag_event (core_coldtag_id, latitude, longitude, event_time)
+    SELECT c.id, 3.0 + RANDOM(), 101.0 + RANDOM(), t.event_time
+    FROM seed_time t CROSS JOIN seed_core c
+    ORDER BY t.event_time;
+
+    INSERT INTO node_coldtag_event (
+        node_coldtag_id, core_coldtag_id, temperature, humidity, core_coldtag_received_time, event_time
+    )
+    SELECT n.id, n.core_coldtag_id, 2.0 + RANDOM() * 8, 40.0 + RANDOM() * 40, t.event_time, t.event_time
+    FROM seed_time t CROSS JOIN seed_node n
+    ORDER BY t.event_time;
+
+    INSERT INTO node_coldtag_event_alert_liquid (
+        node_coldtag_id, core_coldtag_id, core_coldtag_received_time, event_time
+    )
+    SELECT node_coldtag_id, core_coldtag_id, core_coldtag_received_time, event_time
+    FROM node_coldtag_event WHERE node_coldtag_id IN (SELECT id FROM seed_node) AND humidity > 79.5
+    ORDER BY event_time;
+
+    INSERT INTO node_coldtag_event_alert_impact (
+        node_coldtag_id, core_coldtag_id, core_coldtag_received_time, event_time
+    )
+    SELECT node_coldtag_id, core_coldtag_id, core_coldtag_received_time, event_time
+    FROM node_coldtag_event WHERE node_coldtag_id IN (SELECT id FROM seed_node) AND humidity < 40.5
+    ORDER BY event_time;
+
+    INSERT INTO create_route_cycle (node_coldtag_id, temperature_alert_threshold, humidity_alert_threshold)
+    SELECT id, 8.0, 75.0 FROM seed_node;
+
+    INSERT INTO update_route_cycle (route_cycle_id, started, time)
+    SELECT rc.id, TRUE, NOW() - INTERVAL '{DAYS // 2} days'
+    FROM create_route_cycle rc JOIN seed_node n ON n.id = rc.node_coldtag_id
+    WHERE n.id % 2 = 0;
+"""  # noqa: S608
+
+ANALYZE = """
+    ANALYZE create_core_coldtag, create_node_coldtag, create_route_cycle, update_route_cycle,
+        core_coldtag_projection, node_coldtag_projection, route_cycle_projection,
+        core_coldtag_event, node_coldtag_event, node_coldtag_event_alert_liquid, node_coldtag_event_alert_impact,
+        route_cycle_alert_temperature, route_cycle_alert_humidity;
+"""
+
+
+class NullPipeline:
+    async def __aenter__(self) -> Self:
+        return self
+
+    async def __aexit__(self, *_: object) -> None:
+        return None
+
+    def setex(self, *_: Any) -> None:  # noqa: ANN401
+        return None
+
+    async def execute(self) -> list[None]:
+        return []
+
+
+class NullCache:
+    def pipeline(self, *_: Any, **__: Any) -> NullPipeline:  # noqa: ANN401
+        return NullPipeline()
+
+    async def get(self, *_: Any) -> None:  # noqa: ANN401
+        return None
+
+    async def mget(self, keys: list[Any], /) -> list[None]:
+        return [None] * len(keys)
+
+    async def set(self, *_: Any) -> None:  # noqa: ANN401
+        return None
+
+    async def mset(self, *_: Any) -> None:  # noqa: ANN401
+        return None
+
+    async def setex(self, *_: Any) -> None:  # noqa: ANN401
+        return None
+
+    async def delete(self, *_: Any) -> None:  # noqa: ANN401
+        return None
+
+
+# Stands in for a pooled connection, every statement is planned but none is executed
+class ExplainConnection:
+    def __init__(self, connection: asyncpg.Connection, plans: list[tuple[str, dict]], /) -> None:
+        self._connection = connection
+        self._plans = plans
+
+    async def _explain(self, query: str, *args: Any) -> None:  # noqa: ANN401
+        plan = await self._connection.fetchval(f"EXPLAIN (FORMAT JSON) {query}", *args)
+        self._plans.append((query, orjson.loads(plan)[0]["Plan"]))
+
+    async def fetch(self, query: str, *args: Any) -> list:  # noqa: ANN401
+        await self._explain(query, *args)
+        return []
+
+    async def fetchrow(self, query: str, *args: Any) -> None:  # noqa: ANN401
+        await self._explain(query, *args)
+
+    async def fetchval(self, query: str, *args: Any) -> None:  # noqa: ANN401
+        await self._explain(query, *args)
+
+    async def execute(self, query: str, *args: Any) -> str:  # noqa: ANN401
+        await self._explain(query, *args)
+        return "INSERT 0 0"
+
+    def transaction(self) -> contextlib.nullcontext:
+        return contextlib.nullcontext()
+
+
+class ExplainPool:
+    def __init__(self, connection: asyncpg.Connection, /) -> None:
+        self._connection = connection
+        self.plans: list[tuple[str, dict]] = []
+
+    @contextlib.asynccontextmanager
+    async def acquire(self) -> AsyncIterator[ExplainConnection]:
+        yield ExplainConnection(self._connection, self.plans)
+
+
+def _walk(plan: dict, /) -> Iterator[dict]:
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from _walk(child)
+
+
+# EXPLAIN names the scanned partition, monthly ones are suffixed _pYYYYMM next to the _default one
+PARTITION_SUFFIX = re.compile(r"_(?:default|p\d{6})$")
+
+
+def _sequential_scans(plan: dict, /) -> list[str]:
+    return [
+        node["Relation Name"]
+        for node in _walk(plan)
+        if node["Node Type"] == "Seq Scan" and PARTITION_SUFFIX.sub("", node.get("Relation Name", "")) in EVENT_TABLES
+    ]
+
+
+def _sorts(plan: dict, /) -> list[str]:
+    return [node["Node Type"] for node in _walk(plan) if node["Node Type"] in {"Sort", "Incremental Sort"}]
+
+
+# Pages without an owner filter must come out of the (event_time, id) indexes already in order,
+# a sort there means every page reads and sorts the whole time range
+ORDERED_CASES = frozenset(
+    {
+        "core.find_core_events_page_all",
+        "node.find_node_events_page_all",
+        "node.find_node_event_alert_impacts_page_all",
+        "node.find_node_event_alert_liquids_page_all",
+    }
+)
+
+
+def _cases(
+    core: CoreColdtagPersistence, node: NodeColdtagPersistence, route_cycle: RouteCyclePersistence, ids: dict[str, int]
+) -> dict[str, Callable[[], Awaitable[Any]]]:
+    now = datetime.now(tz=UTC)
+    since = now - timedelta(hours=1)
+    dispatch = now - timedelta(days=DAYS // 2)
+    start = now - timedelta(days=DAYS)
+
+    core_id = str(ids["core"])
+    node_id = str(ids["node"])
+    route_cycle_id = str(ids["route_cycle"])
+
+    # A page deep into the history, the keyset bounds should keep it an index range scan
+    page = EventPage(after=EventKey(dispatch, 2**31 - 1), before=None, limit=101)
+
+    return {
+        "core.count_cores": core.count_cores,
+        "core.find_cores": core.find_cores,
+        "core.find_core_by_id": lambda: core.find_core_by_id(core_id),
+        "core.find_core_by_mac_address": lambda: core.find_core_by_mac_address("FE:ED:00:00:00:01"),
+        "core.find_core_events_by_core_id": lambda: core.find_core_events_by_core_id(core_id),
+        "core.find_core_events_by_core_ids": lambda: core.find_core_events_by_core_ids([core_id]),
+        "core.find_core_events_all_by_time_range": lambda: core.find_core_events_all_by_time_range(since),
+        "core.find_latest_core_event_positions": core.find_latest_core_event_positions,
+        "core.find_core_event_by_closest_time": lambda: core.find_core_event_by_closest_time(core_id, time=dispatch),
+        "core.find_core_events_by_closest_times": (
+            lambda: core.find_core_events_by_closest_times(core_id, times=[since, dispatch])
+        ),
+        "core.find_core_events_page": lambda: core.find_core_events_page(core_id, page=page),
+        "core.find_core_events_page_all": lambda: core.find_core_events_page(None, page=page, a=start),
+        "core.create_core_events": lambda: core.create_core_events(
+            [CoreColdtagEventCreateSchema(int(core_id), 3.0, 101.0, now)]
+        ),
+        "node.count_nodes": node.count_nodes,
+        "node.find_nodes": node.find_nodes,
+        "node.find_nodes_available_for_route_cycle": node.find_nodes_available_for_route_cycle,
+        "node.find_node_by_id": lambda: node.find_node_by_id(node_id),
+        "node.find_node_by_mac_address": lambda: node.find_node_by_mac_address("FE:ED:00:01:00:01"),
+        "node.find_node_events_by_node_id": lambda: node.find_node_events_by_node_id(node_id),
+        "node.find_node_events_by_node_ids": lambda: node.find_node_events_by_node_ids([node_id]),
+        "node.find_node_events_all_by_time_range": lambda: node.find_node_events_all_by_time_range(since),
+        "node.find_node_events_by_time_range": lambda: node.find_node_events_by_time_range(node_id, dispatch),
+        "node.find_node_events_by_time_ranges": (
+            lambda: node.find_node_events_by_time_ranges([(node_id, dispatch, None)])
+        ),
+        "node.find_node_events_page": lambda: node.find_node_events_page(node_id, page=page),
+        "node.find_node_events_page_all": lambda: node.find_node_events_page(None, page=page, a=start),
+        "node.find_node_event_rollups_all_by_time_range": (
+            lambda: node.find_node_event_rollups_all_by_time_range(900, since)
+        ),
+        "node.find_node_event_rollups_by_time_range": (
+            lambda: node.find_node_event_rollups_by_time_range(node_id, 900, dispatch)
+        ),
+        "node.find_node_event_alert_impacts_by_node_id": lambda: node.find_node_event_alert_impacts_by_node_id(node_id),
+        "node.find_node_event_alert_impacts_by_node_ids": (
+            lambda: node.find_node_event_alert_impacts_by_node_ids([node_id])
+        ),
+        "node.find_node_event_alert_impacts_all_by_time_range": (
+            lambda: node.find_node_event_alert_impacts_all_by_time_range(since)
+        ),
+        "node.find_node_event_alert_impacts_by_time_range": (
+            lambda: node.find_node_event_alert_impacts_by_time_range(node_id, dispatch)
+        ),
+        "node.find_node_event_alert_impacts_by_time_ranges": (
+            lambda: node.find_node_event_alert_impacts_by_time_ranges([(node_id, dispatch, None)])
+        ),
+        "node.find_node_event_alert_impacts_page": lambda: node.find_node_event_alert_impacts_page(node_id, page=page),
+        "node.find_node_event_alert_impacts_page_all": (
+            lambda: node.find_node_event_alert_impacts_page(None, page=page, a=start)
+        ),
+        "node.find_node_event_alert_liquids_by_node_id": lambda: node.find_node_event_alert_liquids_by_node_id(node_id),
+        "node.find_node_event_alert_liquids_by_node_ids": (
+            lambda: node.find_node_event_alert_liquids_by_node_ids([node_id])
+        ),
+        "node.find_node_event_alert_liquids_all_by_time_range": (
+            lambda: node.find_node_event_alert_liquids_all_by_time_range(since)
+        ),
+        "node.find_node_event_alert_liquids_by_time_range": (
+            lambda: node.find_node_event_alert_liquids_by_time_range(node_id, dispatch)
+        ),
+        "node.find_node_event_alert_liquids_by_time_ranges": (
+            lambda: node.find_node_event_alert_liquids_by_time_ranges([(node_id, dispatch, None)])
+        ),
+        "node.find_node_event_alert_liquids_page": lambda: node.find_node_event_alert_liquids_page(node_id, page=page),
+        "node.find_node_event_alert_liquids_page_all": (
+            lambda: node.find_node_event_alert_liquids_page(None, page=page, a=start)
+        ),
+        "node.create_node_events": lambda: node.create_node_events(
+            [NodeColdtagEventCreateSchema(int(node_id), int(core_id), 4.0, 60.0, now, now, None, None)]
+        ),
+        "route_cycle.count_route_cycles": route_cycle.count_route_cycles,
+        "route_cycle.find_route_cycles": route_cycle.find_route_cycles,
+        "route_cycle.find_route_cycle_by_id": lambda: route_cycle.find_route_cycle_by_id(route_cycle_id),
+        "route_cycle.find_latest_route_cycle_by_node_id": (
+            lambda: route_cycle.find_latest_route_cycle_by_node_id(node_id)
+        ),
+        "route_cycle.find_active_route_cycle_thresholds": route_cycle.find_active_route_cycle_thresholds,
+        "route_cycle.find_alert_temperature_events_by_route_cycle_id": (
+            lambda: route_cycle.find_alert_temperature_events_by_route_cycle_id(route_cycle_id)
+        ),
+        "route_cycle.find_alert_humidity_events_by_route_cycle_id": (
+            lambda: route_cycle.find_alert_humidity_events_by_route_cycle_id(route_cycle_id)
+        ),
+        "route_cycle.find_alert_temperature_events_by_route_cycle_ids": (
+            lambda: route_cycle.find_alert_temperature_events_by_route_cycle_ids([route_cycle_id])
+        ),
+        "route_cycle.find_alert_humidity_events_by_route_cycle_ids": (
+            lambda: route_cycle.find_alert_humidity_events_by_route_cycle_ids([route_cycle_id])
+        ),
+        "route_cycle.find_alert_temperature_events_page": (
+            lambda: route_cycle.find_alert_temperature_events_page(route_cycle_id, page=page)
+        ),
+        "route_cycle.find_alert_humidity_events_page": (
+            lambda: route_cycle.find_alert_humidity_events_page(route_cycle_id, page=page)
+        ),
+        "route_cycle.rebuild_route_cycle_alerts": lambda: route_cycle.rebuild_route_cycle_alerts(route_cycle_id),
+    }
+
+
+async def main() -> int:
+    connection: asyncpg.Connection = await asyncpg.connect(os.getenv("SUPABASE_DB_URL"))
+    transaction = connection.transaction()
+    await transaction.start()
+
+    failures = 0
+
+    try:
+        await connection.execute(SEED)
+        await connection.execute(ANALYZE)
+
+        ids = dict(
+            await connection.fetchrow(
+                """
+                    SELECT
+                        (SELECT MIN(id) FROM create_core_coldtag WHERE mac_address LIKE 'FE:ED:00:00:%') AS core,
+                        (SELECT MIN(id) FROM create_node_coldtag WHERE mac_address LIKE 'FE:ED:00:01:%') AS node,
+                        (
+                            SELECT MIN(rc.id) FROM create_route_cycle rc
+                            JOIN create_node_coldtag nc ON nc.id = rc.node_coldtag_id
+                            WHERE nc.mac_address LIKE 'FE:ED:00:01:%'
+                        ) AS route_cycle
+                """
+            )
+        )
+
+        pool = ExplainPool(connection)
+        app = FastAPI()
+        app.extra["supabase"] = None
+        app.extra["redis"] = NullCache()
+
+        persistences = (
+            CoreColdtagPersistence(app, pool),  # type: ignore
+            NodeColdtagPersistence(app, pool),  # type: ignore
+            RouteCyclePersistence(app, pool),  # type: ignore
+        )
+
+        for name, case in _cases(*persistences, ids).items():
+            pool.plans.clear()
+
+            # Results are empty, a method may fail on them once its statements are planned
+            with contextlib.suppress(Exception):
+                await case()
+
+            if not pool.plans:
+                print(f"{name:<64} no statement planned")  # noqa: T201
+                failures += 1
+                continue
+
+            for _, plan in pool.plans:
+                scans = _sequential_scans(plan)
+                sorts = _sorts(plan) if name in ORDERED_CASES else []
+
+                problems = [f"Seq Scan on {', '.join(scans)}"] if scans else []
+                problems += [f"{sorts[0]} before the limit"] if sorts else []
+
+                status = "; ".join(problems) or "ok"
+                print(f"{name:<64} {plan['Total Cost']:>12.1f} {status}")  # noqa: T201
+                failures += bool(problems)
+
+    finally:
+        await transaction.rollback()
+        await connection.close()
+
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
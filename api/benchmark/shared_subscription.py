@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+import asyncio
+import contextlib
+import os
+import sys
+from collections import Counter
+from collections.abc import Callable
+from datetime import UTC, datetime, timedelta
+
+import orjson
+from aiomqtt import Client as MQTTClient
+from aiomqtt import ProtocolVersion
+from fastapi import FastAPI
+
+from src.listener import HOST, PORT, AppMQTT
+from src.listener.decoder import NodeTelemetry
+from src.listener.queue import IngestQueue, OverflowPolicy
+from src.listener.router import TopicRouter
+
+SUBSCRIBERS = 2
+
+MESSAGES = 1000
+
+NODES = 16
+
+# Time allowed for the group members to receive every published message
+TIMEOUT_SECONDS = 30
+
+
+class RecordingIngest:
+    def __init__(self, on_ingest: Callable[[], None], /) -> None:
+        self._on_ingest = on_ingest
+        self.received: list[tuple[str, datetime]] = []
+
+    async def ingest(self, telemetry: NodeTelemetry, /) -> None:
+        self.received.append((telemetry.node_coldtag_mac_address, telemetry.event_time))
+        self._on_ingest()
+
+
+def _subscriber(group: str, on_ingest: Callable[[], None], /) -> tuple[AppMQTT, RecordingIngest]:
+    recording = RecordingIngest(on_ingest)
+
+    app = FastAPI()
+    app.extra["telemetry_ingest"] = recording
+
+    router = TopicRouter()
+    mqtt = AppMQTT(
+        client=MQTTClient(hostname=HOST, port=PORT, protocol=ProtocolVersion.V5),
+        router=router,
+        queue=IngestQueue(router.dispatch, max_size=MESSAGES, policy=OverflowPolicy.BLOCK),
+        shared_subscription_group=group,
+        is_shutdown=asyncio.Event(),
+    )
+    mqtt.route_node_event(app)
+    return mqtt, recording
+
+
+def _messages() -> list[tuple[str, bytes]]:
+    start = datetime.now(tz=UTC).replace(microsecond=0)
+    messages = []
+
+    for i in range(MESSAGES):
+        mac_address = f"FE:ED:00:09:00:{i % NODES:02X}"
+        timestamp = (start + timedelta(seconds=i)).strftime("%Y-%m-%dT%H:%M:%SZ")
+        payload = {
+            "core_coldtag_mac_address": "FE:ED:00:09:FF:FF",
+            "temperature": 4.0,
+            "humidity": 60.0,
+            "core_coldtag_received_time": timestamp,
+            "event_time": timestamp,
+        }
+        messages.append((f"node_event/{mac_address}/telemetry", orjson.dumps(payload)))
+
+    return messages
+
+
+async def main() -> int:
+    # A fresh group per run so a previous run's queued messages are never delivered to this one
+    group = f"shared-subscription-check-{os.getpid()}"
+    is_complete = asyncio.Event()
+
+    def on_ingest() -> None:
+        if sum(len(recording.received) for _, recording in subscribers) >= MESSAGES:
+            is_complete.set()
+
+    subscribers = [_subscriber(group, on_ingest) for _ in range(SUBSCRIBERS)]
+
+    tasks: list[asyncio.Task] = []
+    for mqtt, _ in subscribers:
+        mqtt.queue.start()
+        tasks.append(await mqtt.connect())
+        tasks.append(await mqtt.subscribe())
+
+    # Subscriptions are sent from the subscribe tasks, give the broker time to register them
+    await asyncio.sleep(1)
+
+    messages = _messages()
+    async with MQTTClient(hostname=HOST, port=PORT, protocol=ProtocolVersion.V5) as publisher:
+        for topic, payload in messages:
+            await publisher.publish(topic, payload, qos=1)
+
+    with contextlib.suppress(TimeoutError):
+        await asyncio.wait_for(is_complete.wait(), timeout=TIMEOUT_SECONDS)
+
+    # Linger so a duplicate delivered after the last expected message is still counted
+    await asyncio.sleep(1)
+
+    for mqtt, _ in subscribers:
+        await mqtt.queue.close()
+        await mqtt.disconnect()
+
+    for task in tasks:
+        task.cancel()
+
+    counts = Counter(key for _, recording in subscribers for key in recording.received)
+    missing = MESSAGES - len(counts)
+    duplicated = sum(1 for count in counts.values() if count > 1)
+
+    for i, (_, recording) in enumerate(subscribers):
+        print(f"subscriber {i:<4} {len(recording.received):>8} messages")  # noqa: T201
+
+    print(f"{'published':<15} {MESSAGES:>8}")  # noqa: T201
+    print(f"{'missing':<15} {missing:>8}")  # noqa: T201
+    print(f"{'duplicated':<15} {duplicated:>8}")  # noqa: T201
+
+    # Every message ingested exactly once, and the group actually spread them over its members
+    spread = all(recording.received for _, recording in subscribers)
+    if not spread:
+        print("a subscriber received nothing, the subscription was not shared")  # noqa: T201
+
+    return 0 if missing == 0 and duplicated == 0 and spread else 1
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -1,7 +1,7 @@
 import os
 from collections.abc import AsyncGenerator
 from contextlib import asynccontextmanager
-from typing import Literal, cast
+from typing import TYPE_CHECKING, Literal, cast
 
 import asyncpg
 import redis.asyncio as aioredis
@@ -12,18 +12,31 @@ from strawberry.subscriptions import GRAPHQL_TRANSPORT_WS_PROTOCOL, GRAPHQL_WS_P
 from supabase import AsyncClientOptions
 from supabase import create_async_client as create_supabase_client
 
-from src.listener import create_mqtt_client
+from src.listener import IngestQueue, TelemetryIngest, start_ingestion, stop_ingestion
+from src.persistence import (
+    EVENT_PARTITION_MAINTENANCE_INTERVAL,
+    EVENT_PARTITION_PREMAKE_MONTHS,
+    EVENT_RETENTION_DAYS,
+)
 from src.persistence.core_coldtag import CoreColdtagPersistence
 from src.persistence.node_coldtag import NodeColdtagPersistence
+from src.persistence.partition import EventPartitionMaintenance
 from src.persistence.route_cycle import RouteCyclePersistence
 
 from .route import create_context, create_schema
+from .route.subscribe import LIVE_SUBSCRIPTION_QUEUE_SIZE, LiveHub
+
+if TYPE_CHECKING:
+    from aiomqtt import Client as MQTTClient
 
 ENV: Literal["development", "production"] = cast(
     "Literal['development', 'production']",
     os.getenv("ENV", "development"),
 )
 
+# Disable to leave MQTT ingestion to the standalone worker, `python -m src.listener`
+INGEST_ENABLED: bool = os.getenv("INGEST_ENABLED", "true").lower() == "true"
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
@@ -46,19 +59,30 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     app.extra["node_coldtag_persistence"] = NodeColdtagPersistence(app, supabase_database_pool)
     app.extra["route_cycle_persistence"] = RouteCyclePersistence(app, supabase_database_pool)
 
-    mqtt = await create_mqtt_client()
-    app.extra["mqtt"] = mqtt.client
-    await mqtt.connect()
-    await mqtt.subscribe_core_event(app)
-    await mqtt.subscribe_node_event(app)
-    await mqtt.subscribe_node_event_alert_impact(app)
-    await mqtt.subscribe_node_event_alert_liquid(app)
+    live_hub = LiveHub(app.extra["redis"], queue_size=LIVE_SUBSCRIPTION_QUEUE_SIZE)
+    app.extra["live_hub"] = live_hub
+
+    event_partition_maintenance = EventPartitionMaintenance(
+        supabase_database_pool,
+        retention_days=EVENT_RETENTION_DAYS,
+        premake_months=EVENT_PARTITION_PREMAKE_MONTHS,
+        interval=EVENT_PARTITION_MAINTENANCE_INTERVAL,
+    )
+    app.extra["event_partition_maintenance"] = event_partition_maintenance
+    event_partition_maintenance.start()
+
+    mqtt = await start_ingestion(app) if INGEST_ENABLED else None
 
     yield
 
+    if mqtt is not None:
+        await stop_ingestion(app, mqtt)
+
+    await event_partition_maintenance.close()
+    await live_hub.close()
+
     await app.extra["redis"].aclose(close_connection_pool=True)
     await supabase_database_pool.close()
-    await mqtt.disconnect()
 
 
 app = FastAPI(lifespan=lifespan)
@@ -87,3 +111,44 @@ app.include_router(
 )
 
 app.add_api_route(path="/health", endpoint=lambda: {"status": "healthy"})
+
+
+def metrics() -> dict[str, dict[str, int | float | str]]:
+    core_coldtag_persistence: CoreColdtagPersistence = app.extra["core_coldtag_persistence"]
+    node_coldtag_persistence: NodeColdtagPersistence = app.extra["node_coldtag_persistence"]
+    event_partition_maintenance: EventPartitionMaintenance = app.extra["event_partition_maintenance"]
+    live_hub: LiveHub = app.extra["live_hub"]
+
+    result: dict[str, dict[str, int | float | str]] = {
+        "core_coldtag_mac_address_cache": core_coldtag_persistence.mac_address_cache.metrics(),
+        "node_coldtag_mac_address_cache": node_coldtag_persistence.mac_address_cache.metrics(),
+        "event_partition_maintenance": event_partition_maintenance.metrics(),
+        "live_hub": live_hub.metrics(),
+    }
+
+    if INGEST_ENABLED:
+        ingest_queue: IngestQueue = app.extra["ingest_queue"]
+        telemetry_ingest: TelemetryIngest = app.extra["telemetry_ingest"]
+
+        mqtt: MQTTClient = app.extra["mqtt"]
+
+        # Messages still held by the client count towards the backlog, under the block policy they wait there
+        result["ingest_queue"] = {**ingest_queue.metrics(), "client_depth": len(mqtt.messages)}
+        result["ingest_lag"] = telemetry_ingest.metrics()
+        result["ingest_dedup"] = telemetry_ingest.dedup_metrics()
+        result["ingest_spool"] = telemetry_ingest.spool_metrics()
+        result["route_cycle_alert_engine"] = telemetry_ingest.alert_engine.metrics()
+
+        if telemetry_ingest.deadband is not None:
+            result["ingest_deadband"] = telemetry_ingest.deadband.metrics()
+
+        if telemetry_ingest.reorder is not None:
+            result["ingest_reorder"] = telemetry_ingest.reorder.metrics()
+
+        if telemetry_ingest.publisher is not None:
+            result["live_publisher"] = telemetry_ingest.publisher.metrics()
+
+    return result
+
+
+app.add_api_route(path="/metrics", endpoint=metrics)
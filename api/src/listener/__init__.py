@@ -1,31 +1,97 @@
 import asyncio
-import json
 import os
-import re
-from datetime import UTC, datetime
-from typing import TYPE_CHECKING
+from pathlib import Path
 
 from aiomqtt import Client as MQTTClient
-from aiomqtt import MqttError
+from aiomqtt import Message, MqttError, ProtocolVersion
 from fastapi import FastAPI
 from loguru import logger
 from pydantic import BaseModel, ConfigDict
 
-if TYPE_CHECKING:
-    from src.persistence.core_coldtag import CoreColdtagPersistence
-    from src.persistence.node_coldtag import NodeColdtagPersistence
-
+from .deadband import DeadbandFilter
+from .decoder import (
+    decode_core_telemetry,
+    decode_core_telemetry_binary,
+    decode_node_alert_impact,
+    decode_node_alert_liquid,
+    decode_node_telemetry,
+    decode_node_telemetry_batch,
+    decode_node_telemetry_binary,
+)
+from .ingest import TelemetryIngest
+from .queue import IngestQueue, OverflowPolicy
+from .router import TopicRouter
 
 HOST: str = os.getenv("MQTT_BROKER_HOST", "127.0.0.1")
 
 PORT: int = int(os.getenv("MQTT_BROKER_PORT", "1883"))
 
+# When set, subscribe through MQTT v5 shared subscriptions so that the broker
+# delivers each message to only one of the processes in the group. A node's readings
+# are then spread over the group, so the stages keeping per node state in process
+# (reordering and deadband) refuse to run with it. Duplicate filtering only catches
+# duplicates landing on the same process, the unique constraints drop the rest, and
+# threshold alerts only depend on the route cycle thresholds shared through the database
+SHARED_SUBSCRIPTION_GROUP: str | None = os.getenv("MQTT_SHARED_SUBSCRIPTION_GROUP") or None
+
+INGEST_BUFFER_MAX_SIZE: int = int(os.getenv("INGEST_BUFFER_MAX_SIZE", "500"))
+
+INGEST_BUFFER_MAX_AGE_MS: int = int(os.getenv("INGEST_BUFFER_MAX_AGE_MS", "1000"))
+
+INGEST_DEDUP_WINDOW: int = int(os.getenv("INGEST_DEDUP_WINDOW", "256"))
+
+# Set empty to disable spooling, failed batches are then dropped after being logged
+INGEST_SPOOL_DIRECTORY: Path | None = (
+    Path(os.getenv("INGEST_SPOOL_DIRECTORY", ".spool")) if os.getenv("INGEST_SPOOL_DIRECTORY", ".spool") else None
+)
+
+INGEST_SPOOL_MAX_SEGMENT_SIZE: int = int(os.getenv("INGEST_SPOOL_MAX_SEGMENT_SIZE", str(16 * 1024 * 1024)))
+
+INGEST_SPOOL_FSYNC_INTERVAL_MS: int = int(os.getenv("INGEST_SPOOL_FSYNC_INTERVAL_MS", "1000"))
+
+INGEST_SPOOL_REPLAY_INTERVAL_MS: int = int(os.getenv("INGEST_SPOOL_REPLAY_INTERVAL_MS", "10000"))
+
+# Replays of a segment failing for other than connection errors before it is moved to quarantine
+INGEST_SPOOL_REPLAY_MAX_ATTEMPTS: int = int(os.getenv("INGEST_SPOOL_REPLAY_MAX_ATTEMPTS", "3"))
+
+INGEST_DEADBAND_ENABLED: bool = os.getenv("INGEST_DEADBAND_ENABLED", "false").lower() == "true"
+
+INGEST_DEADBAND_TEMPERATURE_DELTA: float = float(os.getenv("INGEST_DEADBAND_TEMPERATURE_DELTA", "0.2"))
+
+INGEST_DEADBAND_HUMIDITY_DELTA: float = float(os.getenv("INGEST_DEADBAND_HUMIDITY_DELTA", "1.0"))
+
+INGEST_DEADBAND_MAX_INTERVAL_MS: int = int(os.getenv("INGEST_DEADBAND_MAX_INTERVAL_MS", "300000"))
+
+# Off by default, holding readings back delays storage, alerts and live delivery by up to this long
+INGEST_REORDER_LATENESS_MS: int = int(os.getenv("INGEST_REORDER_LATENESS_MS", "0"))
+
+# Publish stored telemetry and alerts to Redis for the live GraphQL subscriptions
+INGEST_LIVE_PUBLISH_ENABLED: bool = os.getenv("INGEST_LIVE_PUBLISH_ENABLED", "true").lower() == "true"
+
+ROUTE_CYCLE_ALERT_REFRESH_INTERVAL_MS: int = int(os.getenv("ROUTE_CYCLE_ALERT_REFRESH_INTERVAL_MS", "5000"))
+
+INGEST_QUEUE_MAX_SIZE: int = int(os.getenv("INGEST_QUEUE_MAX_SIZE", "10000"))
+
+# Messages the MQTT client holds before the ingest queue takes them, past that the client discards new ones
+INGEST_CLIENT_MAX_QUEUED_MESSAGES: int = int(os.getenv("INGEST_CLIENT_MAX_QUEUED_MESSAGES", "1000"))
+
+INGEST_QUEUE_OVERFLOW_POLICY: OverflowPolicy = OverflowPolicy(os.getenv("INGEST_QUEUE_OVERFLOW_POLICY", "block"))
+
+# Messages held in memory past a full queue under the spill policy before the oldest are dropped
+INGEST_QUEUE_SPILL_MAX_SIZE: int = int(os.getenv("INGEST_QUEUE_SPILL_MAX_SIZE", "100000"))
+
 
 class AppMQTT(BaseModel):
     model_config = ConfigDict(arbitrary_types_allowed=True)
 
     client: MQTTClient
 
+    router: TopicRouter
+
+    queue: IngestQueue
+
+    shared_subscription_group: str | None = None
+
     is_shutdown: asyncio.Event = asyncio.Event()
 
     async def connect(self) -> asyncio.Task:
@@ -53,198 +119,169 @@ class AppMQTT(BaseModel):
     async def disconnect(self) -> None:
         self.is_shutdown.set()
 
-    async def subscribe_core_event(self, app: FastAPI, /) -> asyncio.Task:
-        core_coldtag_persistence: CoreColdtagPersistence = app.extra["core_coldtag_persistence"]
-
+    async def subscribe(self) -> asyncio.Task:
         async def task() -> None:
             while True:
                 try:
-                    await self.client.subscribe("core_event/+/telemetry")
-                    async for message in self.client.messages:
-                        try:
-                            if not re.compile(r"^core_event/[^/]+/telemetry$").match(message.topic.value):
-                                continue
+                    for topic_filter in self.router.topic_filters:
+                        if self.shared_subscription_group is not None:
+                            await self.client.subscribe(f"$share/{self.shared_subscription_group}/{topic_filter}")
+                        else:
+                            await self.client.subscribe(topic_filter)
 
-                            topics = message.topic.value.split("/")
-                            payload = json.loads(
-                                message.payload.decode() if isinstance(message.payload, bytes) else str(message.payload)
-                            )
+                    async for message in self.client.messages:
+                        await self.queue.put(message)
 
-                            core_mac_address = topics[1]
-                            latitude = float(payload["latitude"])
-                            longitude = float(payload["longitude"])
-                            event_time = datetime.strptime(payload["event_time"], "%Y-%m-%dT%H:%M:%SZ").astimezone(UTC)
+                except MqttError as err:
+                    logger.exception(err)
+                    await asyncio.sleep(2)
 
-                            persisted_core = await core_coldtag_persistence.find_core_by_mac_address(core_mac_address)
+        return asyncio.create_task(task())
 
-                            assert persisted_core is not None
+    def route_core_event(self, app: FastAPI, /) -> None:
+        telemetry_ingest: TelemetryIngest = app.extra["telemetry_ingest"]
 
-                            await core_coldtag_persistence.create_core_event(
-                                persisted_core.id,
-                                latitude=latitude,
-                                longitude=longitude,
-                                time=event_time,
-                            )
+        async def handler(topics: list[str], message: Message) -> None:
+            await telemetry_ingest.ingest(decode_core_telemetry(topics[1], message.payload))
 
-                        except Exception as err:
-                            logger.exception(err)
-                            continue
+        async def handler_binary(topics: list[str], message: Message) -> None:
+            await telemetry_ingest.ingest(decode_core_telemetry_binary(topics[1], message.payload))
 
-                except MqttError as err:
-                    logger.exception(err)
-                    await asyncio.sleep(2)
+        self.router.add("core_event/+/telemetry", handler)
+        self.router.add("core_event/+/telemetry/bin", handler_binary)
 
-        return asyncio.create_task(task())
+    def route_node_event(self, app: FastAPI, /) -> None:
+        telemetry_ingest: TelemetryIngest = app.extra["telemetry_ingest"]
 
-    async def subscribe_node_event(self, app: FastAPI, /) -> asyncio.Task:
-        core_coldtag_persistence: CoreColdtagPersistence = app.extra["core_coldtag_persistence"]
-        node_coldtag_persistence: NodeColdtagPersistence = app.extra["node_coldtag_persistence"]
+        async def handler(topics: list[str], message: Message) -> None:
+            await telemetry_ingest.ingest(decode_node_telemetry(topics[1], message.payload))
 
-        async def task() -> None:
-            while True:
-                try:
-                    await self.client.subscribe("node_event/+/telemetry")
-                    async for message in self.client.messages:
-                        try:
-                            if not re.compile(r"^node_event/[^/]+/telemetry$").match(message.topic.value):
-                                continue
-
-                            topics = message.topic.value.split("/")
-                            payload = json.loads(
-                                message.payload.decode() if isinstance(message.payload, bytes) else str(message.payload)
-                            )
-
-                            node_mac_address = topics[1]
-                            core_mac_address = payload["core_coldtag_mac_address"]
-                            temperature = float(payload["temperature"])
-                            humidity = float(payload["humidity"])
-                            core_coldtag_received_time = datetime.strptime(
-                                payload["core_coldtag_received_time"], "%Y-%m-%dT%H:%M:%SZ"
-                            ).astimezone(UTC)
-                            event_time = datetime.strptime(payload["event_time"], "%Y-%m-%dT%H:%M:%SZ").astimezone(UTC)
-
-                            persisted_node = await node_coldtag_persistence.find_node_by_mac_address(node_mac_address)
-                            persisted_core = await core_coldtag_persistence.find_core_by_mac_address(core_mac_address)
-
-                            assert persisted_node is not None
-                            assert persisted_core is not None
-
-                            await node_coldtag_persistence.create_node_event(
-                                persisted_node.id,
-                                core_id=persisted_core.id,
-                                temperature=temperature,
-                                humidity=humidity,
-                                core_received_time=core_coldtag_received_time,
-                                time=event_time,
-                            )
-
-                        except Exception as err:
-                            logger.exception(err)
-                            continue
+        async def handler_binary(topics: list[str], message: Message) -> None:
+            await telemetry_ingest.ingest(decode_node_telemetry_binary(topics[1], message.payload))
 
-                except MqttError as err:
-                    logger.exception(err)
-                    await asyncio.sleep(2)
+        self.router.add("node_event/+/telemetry", handler)
+        self.router.add("node_event/+/telemetry/bin", handler_binary)
 
-        return asyncio.create_task(task())
+    def route_core_event_node_telemetry(self, app: FastAPI, /) -> None:
+        telemetry_ingest: TelemetryIngest = app.extra["telemetry_ingest"]
 
-    async def subscribe_node_event_alert_impact(self, app: FastAPI, /) -> asyncio.Task:
-        core_coldtag_persistence: CoreColdtagPersistence = app.extra["core_coldtag_persistence"]
-        node_coldtag_persistence: NodeColdtagPersistence = app.extra["node_coldtag_persistence"]
+        async def handler(topics: list[str], message: Message) -> None:
+            await telemetry_ingest.ingest(decode_node_telemetry_batch(topics[1], message.payload))
 
-        async def task() -> None:
-            while True:
-                try:
-                    await self.client.subscribe("node_event/+/alert/impact")
-                    async for message in self.client.messages:
-                        try:
-                            if not re.compile(r"^node_event/[^/]+/alert/impact$").match(message.topic.value):
-                                continue
-
-                            topics = message.topic.value.split("/")
-                            payload = json.loads(
-                                message.payload.decode() if isinstance(message.payload, bytes) else str(message.payload)
-                            )
-
-                            node_mac_address = topics[1]
-                            core_mac_address = payload["core_coldtag_mac_address"]
-                            core_coldtag_received_time = datetime.strptime(
-                                payload["core_coldtag_received_time"], "%Y-%m-%dT%H:%M:%SZ"
-                            ).astimezone(UTC)
-                            event_time = datetime.strptime(payload["event_time"], "%Y-%m-%dT%H:%M:%SZ").astimezone(UTC)
-
-                            persisted_node = await node_coldtag_persistence.find_node_by_mac_address(node_mac_address)
-                            persisted_core = await core_coldtag_persistence.find_core_by_mac_address(core_mac_address)
-
-                            assert persisted_node is not None
-                            assert persisted_core is not None
-
-                            await node_coldtag_persistence.create_node_event_alert_impact(
-                                persisted_node.id,
-                                core_id=persisted_core.id,
-                                core_received_time=core_coldtag_received_time,
-                                time=event_time,
-                            )
-
-                        except Exception as err:
-                            logger.exception(err)
-                            continue
+        self.router.add("core_event/+/node_telemetry", handler)
 
-                except MqttError as err:
-                    logger.exception(err)
-                    await asyncio.sleep(2)
+    def route_node_event_alert_impact(self, app: FastAPI, /) -> None:
+        telemetry_ingest: TelemetryIngest = app.extra["telemetry_ingest"]
 
-        return asyncio.create_task(task())
+        async def handler(topics: list[str], message: Message) -> None:
+            await telemetry_ingest.ingest(decode_node_alert_impact(topics[1], message.payload))
 
-    async def subscribe_node_event_alert_liquid(self, app: FastAPI, /) -> asyncio.Task:
-        core_coldtag_persistence: CoreColdtagPersistence = app.extra["core_coldtag_persistence"]
-        node_coldtag_persistence: NodeColdtagPersistence = app.extra["node_coldtag_persistence"]
+        self.router.add("node_event/+/alert/impact", handler)
 
-        async def task() -> None:
-            while True:
-                try:
-                    await self.client.subscribe("node_event/+/alert/liquid")
-                    async for message in self.client.messages:
-                        try:
-                            if not re.compile(r"^node_event/[^/]+/alert/liquid$").match(message.topic.value):
-                                continue
-
-                            topics = message.topic.value.split("/")
-                            payload = json.loads(
-                                message.payload.decode() if isinstance(message.payload, bytes) else str(message.payload)
-                            )
-
-                            node_mac_address = topics[1]
-                            core_mac_address = payload["core_coldtag_mac_address"]
-                            core_coldtag_received_time = datetime.strptime(
-                                payload["core_coldtag_received_time"], "%Y-%m-%dT%H:%M:%SZ"
-                            ).astimezone(UTC)
-                            event_time = datetime.strptime(payload["event_time"], "%Y-%m-%dT%H:%M:%SZ").astimezone(UTC)
-
-                            persisted_node = await node_coldtag_persistence.find_node_by_mac_address(node_mac_address)
-                            persisted_core = await core_coldtag_persistence.find_core_by_mac_address(core_mac_address)
-
-                            assert persisted_node is not None
-                            assert persisted_core is not None
-
-                            await node_coldtag_persistence.create_node_event_alert_liquid(
-                                persisted_node.id,
-                                core_id=persisted_core.id,
-                                core_received_time=core_coldtag_received_time,
-                                time=event_time,
-                            )
-
-                        except Exception as err:
-                            logger.exception(err)
-                            continue
+    def route_node_event_alert_liquid(self, app: FastAPI, /) -> None:
+        telemetry_ingest: TelemetryIngest = app.extra["telemetry_ingest"]
 
-                except MqttError as err:
-                    logger.exception(err)
-                    await asyncio.sleep(2)
+        async def handler(topics: list[str], message: Message) -> None:
+            await telemetry_ingest.ingest(decode_node_alert_liquid(topics[1], message.payload))
 
-        return asyncio.create_task(task())
+        self.router.add("node_event/+/alert/liquid", handler)
 
 
 async def create_mqtt_client() -> AppMQTT:
-    client = MQTTClient(hostname=HOST, port=PORT)
-    return AppMQTT(client=client)
+    client = MQTTClient(
+        hostname=HOST,
+        port=PORT,
+        protocol=ProtocolVersion.V5 if SHARED_SUBSCRIPTION_GROUP is not None else None,
+        max_queued_incoming_messages=INGEST_CLIENT_MAX_QUEUED_MESSAGES,
+    )
+    router = TopicRouter()
+    queue = IngestQueue(
+        router.dispatch,
+        max_size=INGEST_QUEUE_MAX_SIZE,
+        policy=INGEST_QUEUE_OVERFLOW_POLICY,
+        spill_max_size=INGEST_QUEUE_SPILL_MAX_SIZE,
+    )
+    return AppMQTT(client=client, router=router, queue=queue, shared_subscription_group=SHARED_SUBSCRIPTION_GROUP)
+
+
+async def create_telemetry_ingest(app: FastAPI, /) -> TelemetryIngest:
+    return TelemetryIngest(
+        app,
+        max_size=INGEST_BUFFER_MAX_SIZE,
+        max_age=INGEST_BUFFER_MAX_AGE_MS / 1000,
+        dedup_window=INGEST_DEDUP_WINDOW,
+        spool_directory=INGEST_SPOOL_DIRECTORY,
+        spool_max_segment_size=INGEST_SPOOL_MAX_SEGMENT_SIZE,
+        spool_fsync_interval=INGEST_SPOOL_FSYNC_INTERVAL_MS / 1000,
+        spool_replay_interval=INGEST_SPOOL_REPLAY_INTERVAL_MS / 1000,
+        spool_replay_max_attempts=INGEST_SPOOL_REPLAY_MAX_ATTEMPTS,
+        alert_refresh_interval=ROUTE_CYCLE_ALERT_REFRESH_INTERVAL_MS / 1000,
+        deadband=(
+            DeadbandFilter(
+                temperature_delta=INGEST_DEADBAND_TEMPERATURE_DELTA,
+                humidity_delta=INGEST_DEADBAND_HUMIDITY_DELTA,
+                max_interval=INGEST_DEADBAND_MAX_INTERVAL_MS / 1000,
+            )
+            if INGEST_DEADBAND_ENABLED
+            else None
+        ),
+        reorder_lateness=INGEST_REORDER_LATENESS_MS / 1000,
+        live_publish=INGEST_LIVE_PUBLISH_ENABLED,
+    )
+
+
+def check_shared_subscription() -> None:
+    if SHARED_SUBSCRIPTION_GROUP is None:
+        return
+
+    stages = [
+        name
+        for name, enabled in [
+            ("INGEST_REORDER_LATENESS_MS", INGEST_REORDER_LATENESS_MS > 0),
+            ("INGEST_DEADBAND_ENABLED", INGEST_DEADBAND_ENABLED),
+        ]
+        if enabled
+    ]
+    if stages:
+        msg = (
+            f"MQTT_SHARED_SUBSCRIPTION_GROUP cannot be combined with {', '.join(stages)}, "
+            "these stages keep per node state in process."
+        )
+        raise RuntimeError(msg)
+
+
+async def start_ingestion(app: FastAPI, /) -> AppMQTT:
+    check_shared_subscription()
+
+    await asyncio.gather(
+        app.extra["core_coldtag_persistence"].warm_mac_address_cache(),
+        app.extra["node_coldtag_persistence"].warm_mac_address_cache(),
+    )
+
+    telemetry_ingest = await create_telemetry_ingest(app)
+    app.extra["telemetry_ingest"] = telemetry_ingest
+    await telemetry_ingest.warm_core_positions()
+    await telemetry_ingest.alert_engine.refresh()
+    telemetry_ingest.start()
+
+    mqtt = await create_mqtt_client()
+    app.extra["mqtt"] = mqtt.client
+    app.extra["ingest_queue"] = mqtt.queue
+    mqtt.queue.start()
+    await mqtt.connect()
+    mqtt.route_core_event(app)
+    mqtt.route_node_event(app)
+    mqtt.route_core_event_node_telemetry(app)
+    mqtt.route_node_event_alert_impact(app)
+    mqtt.route_node_event_alert_liquid(app)
+    await mqtt.subscribe()
+
+    return mqtt
+
+
+async def stop_ingestion(app: FastAPI, mqtt: AppMQTT, /) -> None:
+    telemetry_ingest: TelemetryIngest = app.extra["telemetry_ingest"]
+
+    await mqtt.disconnect()
+    await mqtt.queue.close()
+    await telemetry_ingest.close()
@@ -0,0 +1,64 @@
+import asyncio
+import os
+import signal
+from typing import cast
+
+import asyncpg
+import redis.asyncio as aioredis
+from fastapi import FastAPI
+from supabase import AsyncClientOptions
+from supabase import create_async_client as create_supabase_client
+
+from src.persistence.core_coldtag import CoreColdtagPersistence
+from src.persistence.node_coldtag import NodeColdtagPersistence
+from src.persistence.route_cycle import RouteCyclePersistence
+
+from . import start_ingestion, stop_ingestion
+
+INGEST_DATABASE_POOL_MIN_SIZE: int = int(os.getenv("INGEST_DATABASE_POOL_MIN_SIZE", "2"))
+
+INGEST_DATABASE_POOL_MAX_SIZE: int = int(os.getenv("INGEST_DATABASE_POOL_MAX_SIZE", "4"))
+
+
+async def main() -> None:
+    # Used as a service registry only, the worker does not serve HTTP
+    app = FastAPI()
+
+    app.extra["supabase"] = await create_supabase_client(
+        supabase_url=cast("str", os.getenv("SUPABASE_URL")),
+        supabase_key=cast("str", os.getenv("SUPABASE_SECRET_KEY")),
+        options=AsyncClientOptions(storage_client_timeout=8000),
+    )
+    app.extra["supabase_database_pool"] = await asyncpg.create_pool(
+        os.getenv("SUPABASE_DB_URL"),
+        min_size=INGEST_DATABASE_POOL_MIN_SIZE,
+        max_size=INGEST_DATABASE_POOL_MAX_SIZE,
+    )
+    app.extra["redis"] = aioredis.from_url(
+        os.getenv("REDIS_URL"),
+        decode_responses=False,
+    )
+
+    supabase_database_pool: asyncpg.Pool = app.extra["supabase_database_pool"]
+
+    app.extra["core_coldtag_persistence"] = CoreColdtagPersistence(app, supabase_database_pool)
+    app.extra["node_coldtag_persistence"] = NodeColdtagPersistence(app, supabase_database_pool)
+    app.extra["route_cycle_persistence"] = RouteCyclePersistence(app, supabase_database_pool)
+
+    is_shutdown = asyncio.Event()
+
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, is_shutdown.set)
+
+    mqtt = await start_ingestion(app)
+
+    await is_shutdown.wait()
+
+    await stop_ingestion(app, mqtt)
+    await app.extra["redis"].aclose(close_connection_pool=True)
+    await supabase_database_pool.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
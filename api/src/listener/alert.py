@@ -0,0 +1,135 @@
+import asyncio
+from collections.abc import Awaitable, Callable
+
+from loguru import logger
+
+from src.persistence.node_coldtag import NodeColdtagEventCreateSchema
+from src.persistence.route_cycle import (
+    RouteCycleAlertHumidityCreateSchema,
+    RouteCycleAlertTemperatureCreateSchema,
+    RouteCycleThresholdSchema,
+)
+
+
+class ThresholdAlertEngine:
+    def __init__(
+        self,
+        find_thresholds: Callable[[], Awaitable[list[RouteCycleThresholdSchema]]],
+        rebuild: Callable[[str], Awaitable[None]],
+        /,
+        *,
+        refresh_interval: float,
+    ) -> None:
+        assert refresh_interval > 0
+
+        self._find_thresholds = find_thresholds
+        self._rebuild = rebuild
+        self._refresh_interval = refresh_interval
+
+        # Active route cycle per node, a node carries at most one at a time
+        self._thresholds: dict[int, RouteCycleThresholdSchema] = {}
+        self._refreshed = False
+        self._task: asyncio.Task | None = None
+
+        self._evaluated = 0
+        self._temperature_excursions = 0
+        self._humidity_excursions = 0
+
+    def __len__(self) -> int:
+        return len(self._thresholds)
+
+    async def refresh(self) -> None:
+        thresholds = {threshold.node_coldtag_id: threshold for threshold in await self._find_thresholds()}
+
+        # Readings that arrived between a route cycle change and this refresh were
+        # evaluated against stale thresholds, derive those cycles again from the events
+        changed = [
+            threshold
+            for node_id, threshold in thresholds.items()
+            if self._refreshed and self._thresholds.get(node_id) != threshold
+        ]
+        self._thresholds = thresholds
+        self._refreshed = True
+
+        for threshold in changed:
+            await self._rebuild(str(threshold.route_cycle_id))
+
+    def route_cycle_id(self, node_id: int, /) -> int | None:
+        threshold = self._thresholds.get(node_id)
+        return threshold.route_cycle_id if threshold is not None else None
+
+    def evaluate(
+        self, event: NodeColdtagEventCreateSchema, /
+    ) -> tuple[RouteCycleAlertTemperatureCreateSchema | None, RouteCycleAlertHumidityCreateSchema | None]:
+        threshold = self._thresholds.get(event.node_coldtag_id)
+        if threshold is None or event.event_time < threshold.dispatch_time:
+            return None, None
+
+        self._evaluated += 1
+
+        temperature = None
+        if (
+            threshold.temperature_alert_threshold is not None
+            and event.temperature is not None
+            and event.temperature >= threshold.temperature_alert_threshold
+        ):
+            self._temperature_excursions += 1
+            temperature = RouteCycleAlertTemperatureCreateSchema(
+                route_cycle_id=threshold.route_cycle_id,
+                node_coldtag_id=event.node_coldtag_id,
+                core_coldtag_id=event.core_coldtag_id,
+                temperature=event.temperature,
+                temperature_alert_threshold=threshold.temperature_alert_threshold,
+                latitude=event.latitude,
+                longitude=event.longitude,
+                core_coldtag_received_time=event.core_coldtag_received_time,
+                event_time=event.event_time,
+            )
+
+        humidity = None
+        if (
+            threshold.humidity_alert_threshold is not None
+            and event.humidity is not None
+            and event.humidity >= threshold.humidity_alert_threshold
+        ):
+            self._humidity_excursions += 1
+            humidity = RouteCycleAlertHumidityCreateSchema(
+                route_cycle_id=threshold.route_cycle_id,
+                node_coldtag_id=event.node_coldtag_id,
+                core_coldtag_id=event.core_coldtag_id,
+                humidity=event.humidity,
+                humidity_alert_threshold=threshold.humidity_alert_threshold,
+                latitude=event.latitude,
+                longitude=event.longitude,
+                core_coldtag_received_time=event.core_coldtag_received_time,
+                event_time=event.event_time,
+            )
+
+        return temperature, humidity
+
+    def start(self) -> asyncio.Task:
+        async def task() -> None:
+            while True:
+                await asyncio.sleep(self._refresh_interval)
+
+                try:
+                    await self.refresh()
+
+                except Exception as err:
+                    logger.exception(err)
+
+        self._task = asyncio.create_task(task())
+        return self._task
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def metrics(self) -> dict[str, int]:
+        return {
+            "active_route_cycles": len(self._thresholds),
+            "evaluated": self._evaluated,
+            "temperature_excursions": self._temperature_excursions,
+            "humidity_excursions": self._humidity_excursions,
+        }
@@ -0,0 +1,104 @@
+import asyncio
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from loguru import logger
+
+
+class IngestBuffer[T]:
+    def __init__(
+        self,
+        flush: Callable[[list[T]], Awaitable[Any]],
+        /,
+        *,
+        max_size: int,
+        max_age: float,
+        fallback: Callable[[list[T]], Awaitable[Any]] | None = None,
+    ) -> None:
+        assert max_size > 0
+        assert max_age > 0
+
+        self._flush = flush
+        self._fallback = fallback
+        self._max_size = max_size
+        self._max_age = max_age
+
+        self._items: list[T] = []
+        self._since = 0.0
+        self._pending = asyncio.Event()
+        self._lock = asyncio.Lock()
+        self._task: asyncio.Task | None = None
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    async def put(self, item: T, /) -> None:
+        if not self._items:
+            self._since = asyncio.get_running_loop().time()
+            self._pending.set()
+
+        self._items.append(item)
+
+        if len(self._items) >= self._max_size:
+            await self.flush()
+
+    async def put_many(self, items: list[T], /) -> None:
+        if not items:
+            return
+
+        if not self._items:
+            self._since = asyncio.get_running_loop().time()
+            self._pending.set()
+
+        self._items.extend(items)
+
+        if len(self._items) >= self._max_size:
+            await self.flush()
+
+    async def flush(self) -> None:
+        async with self._lock:
+            if not self._items:
+                return
+
+            items, self._items = self._items, []
+            self._pending.clear()
+
+            try:
+                await self._flush(items)
+
+            except Exception as err:
+                if self._fallback is None:
+                    logger.exception(err)
+                    return
+
+                logger.warning(f"Flush of {len(items)} items failed, falling back: {err!r}")
+
+                try:
+                    await self._fallback(items)
+
+                except Exception as err:
+                    logger.exception(err)
+
+    def start(self) -> asyncio.Task:
+        async def task() -> None:
+            loop = asyncio.get_running_loop()
+
+            while True:
+                await self._pending.wait()
+
+                delay = self._since + self._max_age - loop.time()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                    continue
+
+                await self.flush()
+
+        self._task = asyncio.create_task(task())
+        return self._task
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+        await self.flush()
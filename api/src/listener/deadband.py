@@ -0,0 +1,64 @@
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+from src.persistence.node_coldtag import NodeColdtagEventCreateSchema
+
+
+@dataclass(slots=True)
+class _Kept:
+    temperature: float | None
+    humidity: float | None
+    event_time: datetime
+
+
+def _moved(previous: float | None, current: float | None, delta: float, /) -> bool:
+    if previous is None or current is None:
+        return previous is not current
+
+    return abs(current - previous) >= delta
+
+
+class DeadbandFilter:
+    def __init__(self, *, temperature_delta: float, humidity_delta: float, max_interval: float) -> None:
+        assert temperature_delta >= 0
+        assert humidity_delta >= 0
+        assert max_interval > 0
+
+        self._temperature_delta = temperature_delta
+        self._humidity_delta = humidity_delta
+        self._max_interval = timedelta(seconds=max_interval)
+
+        # Last reading kept per node, later readings are compared against it rather than
+        # against their direct predecessor so that slow drifts still get through
+        self._kept: dict[int, _Kept] = {}
+
+        self.kept = 0
+        self.dropped = 0
+
+    def keep(self, event: NodeColdtagEventCreateSchema, /, *, excursion: bool) -> bool:
+        previous = self._kept.get(event.node_coldtag_id)
+
+        if not (
+            excursion
+            or previous is None
+            or event.event_time < previous.event_time
+            or event.event_time - previous.event_time >= self._max_interval
+            or _moved(previous.temperature, event.temperature, self._temperature_delta)
+            or _moved(previous.humidity, event.humidity, self._humidity_delta)
+        ):
+            self.dropped += 1
+            return False
+
+        if previous is None or event.event_time >= previous.event_time:
+            self._kept[event.node_coldtag_id] = _Kept(
+                temperature=event.temperature, humidity=event.humidity, event_time=event.event_time
+            )
+
+        self.kept += 1
+        return True
+
+    def metrics(self) -> dict[str, int]:
+        return {
+            "kept": self.kept,
+            "dropped": self.dropped,
+        }
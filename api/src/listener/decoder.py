@@ -0,0 +1,210 @@
+import struct
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from typing import Final
+
+import orjson
+from aiomqtt.types import PayloadType
+
+BINARY_PAYLOAD_VERSION: Final[int] = 1
+
+CORE_TELEMETRY_BINARY: Final[struct.Struct] = struct.Struct("<BddI")
+
+NODE_TELEMETRY_BINARY: Final[struct.Struct] = struct.Struct("<B6sffII")
+
+_CORE_TELEMETRY_BINARY_BODY: Final[struct.Struct] = struct.Struct("<ddI")
+
+_NODE_TELEMETRY_BINARY_BODY: Final[struct.Struct] = struct.Struct("<ffII")
+
+
+@dataclass(slots=True)
+class CoreTelemetry:
+    core_coldtag_mac_address: str
+    latitude: float
+    longitude: float
+    event_time: datetime
+
+
+@dataclass(slots=True)
+class NodeTelemetry:
+    node_coldtag_mac_address: str
+    core_coldtag_mac_address: str
+    temperature: float
+    humidity: float
+    core_coldtag_received_time: datetime
+    event_time: datetime
+
+
+@dataclass(slots=True)
+class NodeTelemetryBatch:
+    core_coldtag_mac_address: str
+    readings: list[NodeTelemetry]
+
+
+@dataclass(slots=True)
+class NodeAlert:
+    node_coldtag_mac_address: str
+    core_coldtag_mac_address: str
+    core_coldtag_received_time: datetime
+    event_time: datetime
+
+
+@dataclass(slots=True)
+class NodeAlertImpact(NodeAlert):
+    pass
+
+
+@dataclass(slots=True)
+class NodeAlertLiquid(NodeAlert):
+    pass
+
+
+def parse_timestamp(value: object, /) -> datetime:
+    if not (isinstance(value, str) and len(value) == 20 and value[10] == "T" and value[19] == "Z"):  # noqa: PLR2004
+        msg = f"Expected timestamp formatted as YYYY-MM-DDTHH:MM:SSZ, got {value!r}."
+        raise ValueError(msg)
+
+    return datetime.fromisoformat(value)
+
+
+def _parse_float(value: object, /) -> float:
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        msg = f"Expected number, got {value!r}."
+        raise TypeError(msg)
+
+    return float(value)
+
+
+def _parse_str(value: object, /) -> str:
+    if not isinstance(value, str):
+        msg = f"Expected string, got {value!r}."
+        raise TypeError(msg)
+
+    return value
+
+
+def _view(payload: PayloadType, /, layout: struct.Struct) -> memoryview:
+    if not isinstance(payload, (bytes, bytearray)):
+        msg = f"Expected binary payload, got {type(payload).__name__}."
+        raise TypeError(msg)
+
+    view = memoryview(payload)
+    if len(view) != layout.size:
+        msg = f"Expected {layout.size} bytes, got {len(view)}."
+        raise ValueError(msg)
+
+    if view[0] != BINARY_PAYLOAD_VERSION:
+        msg = f"Unsupported binary payload version {view[0]}."
+        raise ValueError(msg)
+
+    return view
+
+
+def _loads(payload: PayloadType, /) -> dict:
+    if not isinstance(payload, (bytes, bytearray, str)):
+        msg = f"Expected JSON payload, got {type(payload).__name__}."
+        raise TypeError(msg)
+
+    data = orjson.loads(payload)
+    if not isinstance(data, dict):
+        msg = f"Expected JSON object, got {type(data).__name__}."
+        raise TypeError(msg)
+
+    return data
+
+
+def _loads_array(payload: PayloadType, /) -> list:
+    if not isinstance(payload, (bytes, bytearray, str)):
+        msg = f"Expected JSON payload, got {type(payload).__name__}."
+        raise TypeError(msg)
+
+    data = orjson.loads(payload)
+    if not isinstance(data, list):
+        msg = f"Expected JSON array, got {type(data).__name__}."
+        raise TypeError(msg)
+
+    return data
+
+
+def decode_core_telemetry(core_mac_address: str, payload: PayloadType, /) -> CoreTelemetry:
+    data = _loads(payload)
+    return CoreTelemetry(
+        core_coldtag_mac_address=core_mac_address,
+        latitude=_parse_float(data["latitude"]),
+        longitude=_parse_float(data["longitude"]),
+        event_time=parse_timestamp(data["event_time"]),
+    )
+
+
+def decode_node_telemetry(node_mac_address: str, payload: PayloadType, /) -> NodeTelemetry:
+    data = _loads(payload)
+    return NodeTelemetry(
+        node_coldtag_mac_address=node_mac_address,
+        core_coldtag_mac_address=_parse_str(data["core_coldtag_mac_address"]),
+        temperature=_parse_float(data["temperature"]),
+        humidity=_parse_float(data["humidity"]),
+        core_coldtag_received_time=parse_timestamp(data["core_coldtag_received_time"]),
+        event_time=parse_timestamp(data["event_time"]),
+    )
+
+
+def decode_node_telemetry_batch(core_mac_address: str, payload: PayloadType, /) -> NodeTelemetryBatch:
+    data = _loads_array(payload)
+    return NodeTelemetryBatch(
+        core_coldtag_mac_address=core_mac_address,
+        readings=[
+            NodeTelemetry(
+                node_coldtag_mac_address=_parse_str(item["node_coldtag_mac_address"]),
+                core_coldtag_mac_address=core_mac_address,
+                temperature=_parse_float(item["temperature"]),
+                humidity=_parse_float(item["humidity"]),
+                core_coldtag_received_time=parse_timestamp(item["core_coldtag_received_time"]),
+                event_time=parse_timestamp(item["event_time"]),
+            )
+            for item in data
+        ],
+    )
+
+
+def decode_node_alert_impact(node_mac_address: str, payload: PayloadType, /) -> NodeAlertImpact:
+    data = _loads(payload)
+    return NodeAlertImpact(
+        node_coldtag_mac_address=node_mac_address,
+        core_coldtag_mac_address=_parse_str(data["core_coldtag_mac_address"]),
+        core_coldtag_received_time=parse_timestamp(data["core_coldtag_received_time"]),
+        event_time=parse_timestamp(data["event_time"]),
+    )
+
+
+def decode_node_alert_liquid(node_mac_address: str, payload: PayloadType, /) -> NodeAlertLiquid:
+    data = _loads(payload)
+    return NodeAlertLiquid(
+        node_coldtag_mac_address=node_mac_address,
+        core_coldtag_mac_address=_parse_str(data["core_coldtag_mac_address"]),
+        core_coldtag_received_time=parse_timestamp(data["core_coldtag_received_time"]),
+        event_time=parse_timestamp(data["event_time"]),
+    )
+
+
+def decode_core_telemetry_binary(core_mac_address: str, payload: PayloadType, /) -> CoreTelemetry:
+    view = _view(payload, layout=CORE_TELEMETRY_BINARY)
+    latitude, longitude, event_time = _CORE_TELEMETRY_BINARY_BODY.unpack_from(view, 1)
+    return CoreTelemetry(
+        core_coldtag_mac_address=core_mac_address,
+        latitude=latitude,
+        longitude=longitude,
+        event_time=datetime.fromtimestamp(event_time, tz=UTC),
+    )
+
+
+def decode_node_telemetry_binary(node_mac_address: str, payload: PayloadType, /) -> NodeTelemetry:
+    view = _view(payload, layout=NODE_TELEMETRY_BINARY)
+    temperature, humidity, core_coldtag_received_time, event_time = _NODE_TELEMETRY_BINARY_BODY.unpack_from(view, 7)
+    return NodeTelemetry(
+        node_coldtag_mac_address=node_mac_address,
+        core_coldtag_mac_address=view[1:7].hex(":"),
+        temperature=temperature,
+        humidity=humidity,
+        core_coldtag_received_time=datetime.fromtimestamp(core_coldtag_received_time, tz=UTC),
+        event_time=datetime.fromtimestamp(event_time, tz=UTC),
+    )
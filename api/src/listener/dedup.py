@@ -0,0 +1,39 @@
+from collections import deque
+from datetime import datetime
+
+
+class DuplicateFilter:
+    def __init__(self, *, window: int) -> None:
+        assert window > 0
+
+        self._window = window
+        self._recent: dict[int, tuple[deque[datetime], set[datetime]]] = {}
+
+        # Caught in memory, and caught by the unique constraint on insert
+        self.duplicates = 0
+        self.conflicts = 0
+
+    def is_duplicate(self, device_id: int, event_time: datetime, /) -> bool:
+        recent = self._recent.get(device_id)
+        if recent is None:
+            recent = self._recent[device_id] = (deque(), set())
+
+        order, keys = recent
+        if event_time in keys:
+            self.duplicates += 1
+            return True
+
+        order.append(event_time)
+        keys.add(event_time)
+
+        if len(order) > self._window:
+            keys.discard(order.popleft())
+
+        return False
+
+    def metrics(self) -> dict[str, int]:
+        return {
+            "devices": len(self._recent),
+            "duplicates": self.duplicates,
+            "conflicts": self.conflicts,
+        }
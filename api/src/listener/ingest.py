@@ -0,0 +1,535 @@
+import asyncio
+import time
+from collections.abc import Awaitable, Callable, Sequence
+from datetime import datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from fastapi import FastAPI
+from loguru import logger
+
+from src.persistence.core_coldtag import CoreColdtagEventCreateSchema
+from src.persistence.node_coldtag import (
+    NodeColdtagEventAlertImpactCreateSchema,
+    NodeColdtagEventAlertLiquidCreateSchema,
+    NodeColdtagEventCreateSchema,
+)
+from src.persistence.route_cycle import RouteCycleAlertHumidityCreateSchema, RouteCycleAlertTemperatureCreateSchema
+
+from .alert import ThresholdAlertEngine
+from .buffer import IngestBuffer
+from .deadband import DeadbandFilter
+from .decoder import (
+    CoreTelemetry,
+    NodeAlert,
+    NodeAlertImpact,
+    NodeAlertLiquid,
+    NodeTelemetry,
+    NodeTelemetryBatch,
+)
+from .dedup import DuplicateFilter
+from .position import CorePositionTable
+from .publish import LivePublisher
+from .reorder import ReorderBuffer
+from .spool import Spool
+
+if TYPE_CHECKING:
+    from src.persistence.core_coldtag import CoreColdtagPersistence
+    from src.persistence.node_coldtag import NodeColdtagPersistence
+    from src.persistence.route_cycle import RouteCyclePersistence
+
+
+class LagMeter:
+    def __init__(self) -> None:
+        self._count = 0
+        self._total = 0.0
+        self._last = 0.0
+        self._max = 0.0
+
+    def observe(self, since: datetime, /) -> None:
+        lag = time.time() - since.timestamp()
+
+        self._count += 1
+        self._total += lag
+        self._last = lag
+        self._max = max(self._max, lag)
+
+    def metrics(self) -> dict[str, int | float]:
+        return {
+            "count": self._count,
+            "last": self._last,
+            "max": self._max,
+            "average": self._total / self._count if self._count else 0.0,
+        }
+
+
+def _count_conflicts[T](
+    create: Callable[[Sequence[T]], Awaitable[int]], dedup: DuplicateFilter, /
+) -> Callable[[list[T]], Awaitable[int]]:
+    async def flush(items: list[T]) -> int:
+        count = await create(items)
+        dedup.conflicts += len(items) - count
+        return count
+
+    return flush
+
+
+def _publish_after[T](
+    create: Callable[[list[T]], Awaitable[int]], publish: Callable[[list[T]], Awaitable[None]] | None, /
+) -> Callable[[list[T]], Awaitable[int]]:
+    if publish is None:
+        return create
+
+    async def flush(items: list[T]) -> int:
+        count = await create(items)
+        await publish(items)
+        return count
+
+    return flush
+
+
+class TelemetryIngest:
+    def __init__(
+        self,
+        app: FastAPI,
+        /,
+        *,
+        max_size: int,
+        max_age: float,
+        dedup_window: int,
+        spool_directory: Path | None = None,
+        spool_max_segment_size: int = 0,
+        spool_fsync_interval: float = 0,
+        spool_replay_interval: float = 0,
+        spool_replay_max_attempts: int = 1,
+        alert_refresh_interval: float,
+        deadband: DeadbandFilter | None = None,
+        reorder_lateness: float = 0,
+        live_publish: bool = False,
+    ) -> None:
+        core_coldtag_persistence: CoreColdtagPersistence = app.extra["core_coldtag_persistence"]
+        node_coldtag_persistence: NodeColdtagPersistence = app.extra["node_coldtag_persistence"]
+        route_cycle_persistence: RouteCyclePersistence = app.extra["route_cycle_persistence"]
+
+        self._core_coldtag_persistence = core_coldtag_persistence
+        self._node_coldtag_persistence = node_coldtag_persistence
+
+        self.alert_engine = ThresholdAlertEngine(
+            route_cycle_persistence.find_active_route_cycle_thresholds,
+            route_cycle_persistence.rebuild_route_cycle_alerts,
+            refresh_interval=alert_refresh_interval,
+        )
+
+        # Stored batches are also published to Redis for the GraphQL subscriptions of every API worker
+        self.publisher = (
+            LivePublisher(app.extra["redis"], route_cycle_id=self.alert_engine.route_cycle_id) if live_publish else None
+        )
+
+        self.core_events_dedup = DuplicateFilter(window=dedup_window)
+        self.node_events_dedup = DuplicateFilter(window=dedup_window)
+        self.node_event_alert_liquids_dedup = DuplicateFilter(window=dedup_window)
+        self.node_event_alert_impacts_dedup = DuplicateFilter(window=dedup_window)
+
+        def create_spool[T: tuple](name: str, schema: type[T], /) -> Spool[T] | None:
+            if spool_directory is None:
+                return None
+
+            return Spool(
+                spool_directory / name,
+                schema=schema,
+                max_segment_size=spool_max_segment_size,
+                fsync_interval=spool_fsync_interval,
+                replay_interval=spool_replay_interval,
+                replay_batch_size=max_size,
+                replay_max_attempts=spool_replay_max_attempts,
+            )
+
+        self.core_events_spool = create_spool("core_events", CoreColdtagEventCreateSchema)
+        self.node_events_spool = create_spool("node_events", NodeColdtagEventCreateSchema)
+        self.node_event_alert_liquids_spool = create_spool(
+            "node_event_alert_liquids", NodeColdtagEventAlertLiquidCreateSchema
+        )
+        self.node_event_alert_impacts_spool = create_spool(
+            "node_event_alert_impacts", NodeColdtagEventAlertImpactCreateSchema
+        )
+        self.route_cycle_alert_temperatures_spool = create_spool(
+            "route_cycle_alert_temperatures", RouteCycleAlertTemperatureCreateSchema
+        )
+        self.route_cycle_alert_humidities_spool = create_spool(
+            "route_cycle_alert_humidities", RouteCycleAlertHumidityCreateSchema
+        )
+
+        publisher = self.publisher
+
+        create_core_events = _count_conflicts(core_coldtag_persistence.create_core_events, self.core_events_dedup)
+        create_node_events = _publish_after(
+            _count_conflicts(node_coldtag_persistence.create_node_events, self.node_events_dedup),
+            publisher.publish_node_events if publisher else None,
+        )
+        create_node_event_alert_liquids = _publish_after(
+            _count_conflicts(
+                node_coldtag_persistence.create_node_event_alert_liquids, self.node_event_alert_liquids_dedup
+            ),
+            publisher.publish_node_event_alert_liquids if publisher else None,
+        )
+        create_node_event_alert_impacts = _publish_after(
+            _count_conflicts(
+                node_coldtag_persistence.create_node_event_alert_impacts, self.node_event_alert_impacts_dedup
+            ),
+            publisher.publish_node_event_alert_impacts if publisher else None,
+        )
+        create_route_cycle_alert_temperatures = _publish_after(
+            route_cycle_persistence.create_route_cycle_alert_temperatures,
+            publisher.publish_route_cycle_alert_temperatures if publisher else None,
+        )
+        create_route_cycle_alert_humidities = _publish_after(
+            route_cycle_persistence.create_route_cycle_alert_humidities,
+            publisher.publish_route_cycle_alert_humidities if publisher else None,
+        )
+
+        self.core_events: IngestBuffer[CoreColdtagEventCreateSchema] = IngestBuffer(
+            create_core_events,
+            max_size=max_size,
+            max_age=max_age,
+            fallback=self.core_events_spool.append if self.core_events_spool else None,
+        )
+        self.node_events: IngestBuffer[NodeColdtagEventCreateSchema] = IngestBuffer(
+            create_node_events,
+            max_size=max_size,
+            max_age=max_age,
+            fallback=self.node_events_spool.append if self.node_events_spool else None,
+        )
+        self.node_event_alert_liquids: IngestBuffer[NodeColdtagEventAlertLiquidCreateSchema] = IngestBuffer(
+            create_node_event_alert_liquids,
+            max_size=max_size,
+            max_age=max_age,
+            fallback=self.node_event_alert_liquids_spool.append if self.node_event_alert_liquids_spool else None,
+        )
+        self.node_event_alert_impacts: IngestBuffer[NodeColdtagEventAlertImpactCreateSchema] = IngestBuffer(
+            create_node_event_alert_impacts,
+            max_size=max_size,
+            max_age=max_age,
+            fallback=self.node_event_alert_impacts_spool.append if self.node_event_alert_impacts_spool else None,
+        )
+        self.route_cycle_alert_temperatures: IngestBuffer[RouteCycleAlertTemperatureCreateSchema] = IngestBuffer(
+            create_route_cycle_alert_temperatures,
+            max_size=max_size,
+            max_age=max_age,
+            fallback=(
+                self.route_cycle_alert_temperatures_spool.append if self.route_cycle_alert_temperatures_spool else None
+            ),
+        )
+        self.route_cycle_alert_humidities: IngestBuffer[RouteCycleAlertHumidityCreateSchema] = IngestBuffer(
+            create_route_cycle_alert_humidities,
+            max_size=max_size,
+            max_age=max_age,
+            fallback=(
+                self.route_cycle_alert_humidities_spool.append if self.route_cycle_alert_humidities_spool else None
+            ),
+        )
+
+        # Spools paired with the write path that replays them
+        self._spools: dict[str, tuple[Spool, Callable[[list[Any]], Awaitable[int]]]] = {
+            name: (spool, create)
+            for name, spool, create in [
+                ("core_events", self.core_events_spool, create_core_events),
+                ("node_events", self.node_events_spool, create_node_events),
+                ("node_event_alert_liquids", self.node_event_alert_liquids_spool, create_node_event_alert_liquids),
+                ("node_event_alert_impacts", self.node_event_alert_impacts_spool, create_node_event_alert_impacts),
+                (
+                    "route_cycle_alert_temperatures",
+                    self.route_cycle_alert_temperatures_spool,
+                    create_route_cycle_alert_temperatures,
+                ),
+                (
+                    "route_cycle_alert_humidities",
+                    self.route_cycle_alert_humidities_spool,
+                    create_route_cycle_alert_humidities,
+                ),
+            ]
+            if spool is not None
+        }
+
+        # Optional compression of node telemetry, excursions are always kept
+        self.deadband = deadband
+
+        # Optional per node reordering on event_time ahead of alerting and compression,
+        # readings later than the watermark skip the stateful stages and are corrected in place
+        self.reorder = (
+            ReorderBuffer(
+                self._put_node_events,
+                self._correct_node_events,
+                lateness=reorder_lateness,
+                interval=max_age,
+            )
+            if reorder_lateness > 0
+            else None
+        )
+
+        # Last known fix per core, attached to node readings as they arrive
+        self.core_positions = CorePositionTable()
+
+        # Lag from the device reading and from the core relaying it, up to the point it enters a write buffer
+        self.event_lag = LagMeter()
+        self.received_lag = LagMeter()
+
+    @property
+    def buffers(self) -> list[IngestBuffer]:
+        return [
+            self.core_events,
+            self.node_events,
+            self.node_event_alert_liquids,
+            self.node_event_alert_impacts,
+            self.route_cycle_alert_temperatures,
+            self.route_cycle_alert_humidities,
+        ]
+
+    def _observe(self, record: CoreTelemetry | NodeTelemetry | NodeAlert, /) -> None:
+        self.event_lag.observe(record.event_time)
+        if not isinstance(record, CoreTelemetry):
+            self.received_lag.observe(record.core_coldtag_received_time)
+
+    async def ingest(self, record: CoreTelemetry | NodeTelemetry | NodeTelemetryBatch | NodeAlert, /) -> None:
+        match record:
+            case CoreTelemetry():
+                self._observe(record)
+                await self._ingest_core_telemetry(record)
+            case NodeTelemetry():
+                self._observe(record)
+                await self._ingest_node_telemetry(record)
+            case NodeTelemetryBatch():
+                for reading in record.readings:
+                    self._observe(reading)
+                await self._ingest_node_telemetry_batch(record)
+            case NodeAlertImpact() | NodeAlertLiquid():
+                self._observe(record)
+                await self._ingest_node_alert(record)
+
+    async def _ingest_core_telemetry(self, record: CoreTelemetry, /) -> None:
+        core_id = await self._core_coldtag_persistence.find_core_id_by_mac_address(record.core_coldtag_mac_address)
+
+        assert core_id is not None, f"Unknown core coldtag {record.core_coldtag_mac_address}."
+
+        if self.core_events_dedup.is_duplicate(core_id, record.event_time):
+            return
+
+        self.core_positions.update(core_id, record.latitude, record.longitude, record.event_time)
+
+        await self.core_events.put(
+            CoreColdtagEventCreateSchema(
+                core_coldtag_id=core_id,
+                latitude=record.latitude,
+                longitude=record.longitude,
+                event_time=record.event_time,
+            )
+        )
+
+    async def _ingest_node_telemetry(self, record: NodeTelemetry, /) -> None:
+        node_id = await self._node_coldtag_persistence.find_node_id_by_mac_address(record.node_coldtag_mac_address)
+        core_id = await self._core_coldtag_persistence.find_core_id_by_mac_address(record.core_coldtag_mac_address)
+
+        assert node_id is not None, f"Unknown node coldtag {record.node_coldtag_mac_address}."
+        assert core_id is not None, f"Unknown core coldtag {record.core_coldtag_mac_address}."
+
+        if self.node_events_dedup.is_duplicate(node_id, record.event_time):
+            return
+
+        position = self.core_positions.get(core_id)
+
+        event = NodeColdtagEventCreateSchema(
+            node_coldtag_id=node_id,
+            core_coldtag_id=core_id,
+            temperature=record.temperature,
+            humidity=record.humidity,
+            core_coldtag_received_time=record.core_coldtag_received_time,
+            event_time=record.event_time,
+            latitude=position.latitude if position else None,
+            longitude=position.longitude if position else None,
+        )
+
+        await self._order_node_events([event])
+
+    async def _ingest_node_telemetry_batch(self, record: NodeTelemetryBatch, /) -> None:
+        core_id = await self._core_coldtag_persistence.find_core_id_by_mac_address(record.core_coldtag_mac_address)
+
+        assert core_id is not None, f"Unknown core coldtag {record.core_coldtag_mac_address}."
+
+        position = self.core_positions.get(core_id)
+
+        mac_addresses = list({reading.node_coldtag_mac_address for reading in record.readings})
+        node_ids = dict(
+            zip(
+                mac_addresses,
+                await asyncio.gather(
+                    *[
+                        self._node_coldtag_persistence.find_node_id_by_mac_address(mac_address)
+                        for mac_address in mac_addresses
+                    ]
+                ),
+                strict=True,
+            )
+        )
+
+        events: list[NodeColdtagEventCreateSchema] = []
+        for reading in record.readings:
+            node_id = node_ids[reading.node_coldtag_mac_address]
+            if node_id is None:
+                logger.warning(f"Unknown node coldtag {reading.node_coldtag_mac_address}, reading skipped.")
+                continue
+
+            if self.node_events_dedup.is_duplicate(node_id, reading.event_time):
+                continue
+
+            events.append(
+                NodeColdtagEventCreateSchema(
+                    node_coldtag_id=node_id,
+                    core_coldtag_id=core_id,
+                    temperature=reading.temperature,
+                    humidity=reading.humidity,
+                    core_coldtag_received_time=reading.core_coldtag_received_time,
+                    event_time=reading.event_time,
+                    latitude=position.latitude if position else None,
+                    longitude=position.longitude if position else None,
+                )
+            )
+
+        await self._order_node_events(events)
+
+    async def _order_node_events(self, events: list[NodeColdtagEventCreateSchema], /) -> None:
+        if self.reorder is None:
+            await self._put_node_events(events)
+            return
+
+        await self.reorder.put_many(events)
+
+    async def _put_node_events(self, events: list[NodeColdtagEventCreateSchema], /) -> None:
+        kept: list[NodeColdtagEventCreateSchema] = []
+        temperatures: list[RouteCycleAlertTemperatureCreateSchema] = []
+        humidities: list[RouteCycleAlertHumidityCreateSchema] = []
+
+        for event in events:
+            temperature, humidity = self.alert_engine.evaluate(event)
+            if temperature is not None:
+                temperatures.append(temperature)
+            if humidity is not None:
+                humidities.append(humidity)
+
+            excursion = temperature is not None or humidity is not None
+            if self.deadband is None or self.deadband.keep(event, excursion=excursion):
+                kept.append(event)
+
+        await self.node_events.put_many(kept)
+        await self.route_cycle_alert_temperatures.put_many(temperatures)
+        await self.route_cycle_alert_humidities.put_many(humidities)
+
+    async def _correct_node_events(self, events: list[NodeColdtagEventCreateSchema], /) -> None:
+        # Alert evaluation is per reading and still holds, the deadband state has already
+        # moved past these readings so they are all kept
+        temperatures: list[RouteCycleAlertTemperatureCreateSchema] = []
+        humidities: list[RouteCycleAlertHumidityCreateSchema] = []
+
+        for event in events:
+            temperature, humidity = self.alert_engine.evaluate(event)
+            if temperature is not None:
+                temperatures.append(temperature)
+            if humidity is not None:
+                humidities.append(humidity)
+
+        logger.debug(f"Corrected {len(events)} late node events.")
+
+        await self.node_events.put_many(events)
+        await self.route_cycle_alert_temperatures.put_many(temperatures)
+        await self.route_cycle_alert_humidities.put_many(humidities)
+
+    async def _ingest_node_alert(self, record: NodeAlertImpact | NodeAlertLiquid, /) -> None:
+        node_id = await self._node_coldtag_persistence.find_node_id_by_mac_address(record.node_coldtag_mac_address)
+        core_id = await self._core_coldtag_persistence.find_core_id_by_mac_address(record.core_coldtag_mac_address)
+
+        assert node_id is not None, f"Unknown node coldtag {record.node_coldtag_mac_address}."
+        assert core_id is not None, f"Unknown core coldtag {record.core_coldtag_mac_address}."
+
+        position = self.core_positions.get(core_id)
+
+        if isinstance(record, NodeAlertImpact):
+            if self.node_event_alert_impacts_dedup.is_duplicate(node_id, record.event_time):
+                return
+
+            await self.node_event_alert_impacts.put(
+                NodeColdtagEventAlertImpactCreateSchema(
+                    node_coldtag_id=node_id,
+                    core_coldtag_id=core_id,
+                    core_coldtag_received_time=record.core_coldtag_received_time,
+                    event_time=record.event_time,
+                    latitude=position.latitude if position else None,
+                    longitude=position.longitude if position else None,
+                )
+            )
+        else:
+            if self.node_event_alert_liquids_dedup.is_duplicate(node_id, record.event_time):
+                return
+
+            await self.node_event_alert_liquids.put(
+                NodeColdtagEventAlertLiquidCreateSchema(
+                    node_coldtag_id=node_id,
+                    core_coldtag_id=core_id,
+                    core_coldtag_received_time=record.core_coldtag_received_time,
+                    event_time=record.event_time,
+                    latitude=position.latitude if position else None,
+                    longitude=position.longitude if position else None,
+                )
+            )
+
+    def dedup_metrics(self) -> dict[str, int]:
+        return {
+            **{f"core_events_{key}": value for key, value in self.core_events_dedup.metrics().items()},
+            **{f"node_events_{key}": value for key, value in self.node_events_dedup.metrics().items()},
+            **{
+                f"node_event_alert_liquids_{key}": value
+                for key, value in self.node_event_alert_liquids_dedup.metrics().items()
+            },
+            **{
+                f"node_event_alert_impacts_{key}": value
+                for key, value in self.node_event_alert_impacts_dedup.metrics().items()
+            },
+        }
+
+    def metrics(self) -> dict[str, int | float]:
+        return {
+            **{f"event_time_{key}": value for key, value in self.event_lag.metrics().items()},
+            **{f"core_coldtag_received_time_{key}": value for key, value in self.received_lag.metrics().items()},
+        }
+
+    def spool_metrics(self) -> dict[str, int | float]:
+        return {
+            f"{name}_{key}": value
+            for name, (spool, _) in self._spools.items()
+            for key, value in spool.metrics().items()
+        }
+
+    async def warm_core_positions(self) -> int:
+        positions = await self._core_coldtag_persistence.find_latest_core_event_positions()
+        for position in positions:
+            self.core_positions.update(
+                position.core_coldtag_id, position.latitude, position.longitude, position.event_time
+            )
+
+        return len(positions)
+
+    def start(self) -> list[asyncio.Task]:
+        return [
+            self.alert_engine.start(),
+            *([self.reorder.start()] if self.reorder is not None else []),
+            *[buffer.start() for buffer in self.buffers],
+            *[
+                task
+                for spool, flush in self._spools.values()
+                for task in spool.start(flush, probe=self._node_coldtag_persistence.ping)
+            ],
+        ]
+
+    async def close(self) -> None:
+        await self.alert_engine.close()
+        if self.reorder is not None:
+            await self.reorder.close()
+        await asyncio.gather(*[buffer.close() for buffer in self.buffers])
+        await asyncio.gather(*[spool.close() for spool, _ in self._spools.values()])
@@ -0,0 +1,31 @@
+from dataclasses import dataclass
+from datetime import datetime
+
+
+@dataclass(slots=True)
+class CorePosition:
+    latitude: float
+    longitude: float
+    event_time: datetime
+
+
+class CorePositionTable:
+    def __init__(self) -> None:
+        self._positions: dict[int, CorePosition] = {}
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+    def get(self, core_id: int, /) -> CorePosition | None:
+        return self._positions.get(core_id)
+
+    def update(self, core_id: int, /, latitude: float | None, longitude: float | None, event_time: datetime) -> None:
+        if latitude is None or longitude is None:
+            return
+
+        # Out of order fixes must not move the core back to where it was
+        position = self._positions.get(core_id)
+        if position is not None and position.event_time >= event_time:
+            return
+
+        self._positions[core_id] = CorePosition(latitude=latitude, longitude=longitude, event_time=event_time)
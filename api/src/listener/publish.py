@@ -0,0 +1,148 @@
+from collections.abc import Callable, Sequence
+from typing import TYPE_CHECKING, Any, Final, Literal
+
+import orjson
+from loguru import logger
+
+from src.persistence.node_coldtag import (
+    NodeColdtagEventAlertImpactCreateSchema,
+    NodeColdtagEventAlertLiquidCreateSchema,
+    NodeColdtagEventCreateSchema,
+)
+from src.persistence.route_cycle import (
+    RouteCycleAlertHumidityCreateSchema,
+    RouteCycleAlertTemperatureCreateSchema,
+)
+
+if TYPE_CHECKING:
+    from redis.asyncio import Redis
+
+ALERTS_CHANNEL: Final[str] = "live:alerts"
+
+
+def node_coldtag_telemetry_channel(node_id: int | str, /) -> str:
+    return f"live:node_coldtag_telemetry:{node_id}"
+
+
+def route_cycle_alerts_channel(route_cycle_id: int | str, /) -> str:
+    return f"live:route_cycle_alerts:{route_cycle_id}"
+
+
+class LivePublisher:
+    def __init__(self, redis: "Redis", /, *, route_cycle_id: Callable[[int], int | None]) -> None:
+        self._redis = redis
+
+        # Liquid and impact alerts only carry the node, they belong to its active route cycle if any
+        self._route_cycle_id = route_cycle_id
+
+        self.published = 0
+        self.failures = 0
+
+    async def _publish(self, messages: dict[str, list[dict[str, Any]]], /) -> None:
+        if not messages:
+            return
+
+        # One message per channel for the whole batch, sent in a single round trip
+        try:
+            async with self._redis.pipeline(transaction=False) as pipe:
+                for channel, items in messages.items():
+                    pipe.publish(channel, orjson.dumps(items))
+
+                await pipe.execute()
+
+        # Live delivery is best effort, the batch is already stored by the time it is published
+        except Exception as err:
+            self.failures += 1
+            logger.exception(err)
+            return
+
+        self.published += len(messages)
+
+    async def _publish_alerts(self, alerts: Sequence[dict[str, Any]], /) -> None:
+        messages: dict[str, list[dict[str, Any]]] = {}
+
+        for alert in alerts:
+            messages.setdefault(ALERTS_CHANNEL, []).append(alert)
+            if alert["route_cycle_id"] is not None:
+                messages.setdefault(route_cycle_alerts_channel(alert["route_cycle_id"]), []).append(alert)
+
+        await self._publish(messages)
+
+    async def publish_node_events(self, events: list[NodeColdtagEventCreateSchema], /) -> None:
+        messages: dict[str, list[dict[str, Any]]] = {}
+
+        for event in events:
+            messages.setdefault(node_coldtag_telemetry_channel(event.node_coldtag_id), []).append(event._asdict())
+
+        await self._publish(messages)
+
+    async def publish_node_event_alert_liquids(self, events: list[NodeColdtagEventAlertLiquidCreateSchema], /) -> None:
+        await self._publish_alerts([self._node_alert("liquid", event) for event in events])
+
+    async def publish_node_event_alert_impacts(self, events: list[NodeColdtagEventAlertImpactCreateSchema], /) -> None:
+        await self._publish_alerts([self._node_alert("impact", event) for event in events])
+
+    async def publish_route_cycle_alert_temperatures(
+        self, alerts: list[RouteCycleAlertTemperatureCreateSchema], /
+    ) -> None:
+        await self._publish_alerts(
+            [
+                {
+                    "kind": "temperature",
+                    "route_cycle_id": alert.route_cycle_id,
+                    "node_coldtag_id": alert.node_coldtag_id,
+                    "core_coldtag_id": alert.core_coldtag_id,
+                    "value": alert.temperature,
+                    "threshold": alert.temperature_alert_threshold,
+                    "latitude": alert.latitude,
+                    "longitude": alert.longitude,
+                    "core_coldtag_received_time": alert.core_coldtag_received_time,
+                    "event_time": alert.event_time,
+                }
+                for alert in alerts
+            ]
+        )
+
+    async def publish_route_cycle_alert_humidities(self, alerts: list[RouteCycleAlertHumidityCreateSchema], /) -> None:
+        await self._publish_alerts(
+            [
+                {
+                    "kind": "humidity",
+                    "route_cycle_id": alert.route_cycle_id,
+                    "node_coldtag_id": alert.node_coldtag_id,
+                    "core_coldtag_id": alert.core_coldtag_id,
+                    "value": alert.humidity,
+                    "threshold": alert.humidity_alert_threshold,
+                    "latitude": alert.latitude,
+                    "longitude": alert.longitude,
+                    "core_coldtag_received_time": alert.core_coldtag_received_time,
+                    "event_time": alert.event_time,
+                }
+                for alert in alerts
+            ]
+        )
+
+    def _node_alert(
+        self,
+        kind: Literal["liquid", "impact"],
+        event: NodeColdtagEventAlertLiquidCreateSchema | NodeColdtagEventAlertImpactCreateSchema,
+        /,
+    ) -> dict[str, Any]:
+        return {
+            "kind": kind,
+            "route_cycle_id": self._route_cycle_id(event.node_coldtag_id),
+            "node_coldtag_id": event.node_coldtag_id,
+            "core_coldtag_id": event.core_coldtag_id,
+            "value": None,
+            "threshold": None,
+            "latitude": event.latitude,
+            "longitude": event.longitude,
+            "core_coldtag_received_time": event.core_coldtag_received_time,
+            "event_time": event.event_time,
+        }
+
+    def metrics(self) -> dict[str, int]:
+        return {
+            "published": self.published,
+            "failures": self.failures,
+        }
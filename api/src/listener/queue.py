@@ -0,0 +1,131 @@
+import asyncio
+import contextlib
+from collections import deque
+from collections.abc import Awaitable, Callable
+from enum import StrEnum
+from typing import Any
+
+from aiomqtt import Message
+from loguru import logger
+
+
+class OverflowPolicy(StrEnum):
+    BLOCK = "block"
+    DROP_OLDEST = "drop_oldest"
+    SPILL = "spill"
+
+
+class IngestQueue:
+    def __init__(
+        self,
+        handle: Callable[[Message], Awaitable[Any]],
+        /,
+        *,
+        max_size: int,
+        policy: OverflowPolicy,
+        spill_max_size: int = 0,
+    ) -> None:
+        assert max_size > 0
+        assert policy is not OverflowPolicy.SPILL or spill_max_size > 0
+
+        self._handle = handle
+        self._policy = policy
+
+        self._queue: asyncio.Queue[Message] = asyncio.Queue(maxsize=max_size)
+        # Spilled messages are capped too, past that the oldest spilled message is dropped
+        self._overflow: deque[Message] = deque(maxlen=spill_max_size or None)
+        self._task: asyncio.Task | None = None
+        self._is_processing = False
+        self._is_closing = False
+
+        self._received = 0
+        self._processed = 0
+        self._dropped = 0
+        self._spilled = 0
+
+    def __len__(self) -> int:
+        return self._queue.qsize() + len(self._overflow)
+
+    async def put(self, message: Message, /) -> None:
+        self._received += 1
+
+        if not self._queue.full():
+            self._queue.put_nowait(message)
+            return
+
+        match self._policy:
+            case OverflowPolicy.BLOCK:
+                await self._queue.put(message)
+
+            case OverflowPolicy.DROP_OLDEST:
+                self._queue.get_nowait()
+                self._queue.task_done()
+                self._queue.put_nowait(message)
+                self._dropped += 1
+
+            case OverflowPolicy.SPILL:
+                if len(self._overflow) == self._overflow.maxlen:
+                    self._dropped += 1
+
+                self._overflow.append(message)
+                self._spilled += 1
+
+    async def _process(self, message: Message, /) -> None:
+        try:
+            await self._handle(message)
+
+        except Exception as err:
+            logger.exception(err)
+
+        self._processed += 1
+
+    def _refill(self) -> None:
+        while self._overflow and not self._queue.full():
+            self._queue.put_nowait(self._overflow.popleft())
+
+    def start(self) -> asyncio.Task:
+        async def task() -> None:
+            while not self._is_closing:
+                message = await self._queue.get()
+                self._refill()
+
+                self._is_processing = True
+                try:
+                    await self._process(message)
+
+                finally:
+                    self._is_processing = False
+                    self._queue.task_done()
+
+        self._task = asyncio.create_task(task())
+        return self._task
+
+    async def close(self) -> None:
+        if self._task is not None:
+            # A message being handled is finished first, the task is only cancelled while waiting for the next one
+            self._is_closing = True
+            if not self._is_processing:
+                self._task.cancel()
+
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+
+            self._task = None
+
+        while not self._queue.empty():
+            await self._process(self._queue.get_nowait())
+            self._queue.task_done()
+            self._refill()
+
+    def metrics(self) -> dict[str, int | str]:
+        return {
+            "policy": self._policy.value,
+            "max_size": self._queue.maxsize,
+            "depth": self._queue.qsize(),
+            "overflow": len(self._overflow),
+            "overflow_max_size": self._overflow.maxlen or 0,
+            "received": self._received,
+            "processed": self._processed,
+            "dropped": self._dropped,
+            "spilled": self._spilled,
+        }
@@ -0,0 +1,146 @@
+import asyncio
+import heapq
+import itertools
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any
+
+from loguru import logger
+
+from src.persistence.node_coldtag import NodeColdtagEventCreateSchema
+
+type _Entry = tuple[datetime, int, float, NodeColdtagEventCreateSchema]
+
+
+@dataclass(slots=True)
+class _Node:
+    held: list[_Entry] = field(default_factory=list)
+    latest: datetime | None = None
+    emitted: datetime | None = None
+
+
+class ReorderBuffer:
+    def __init__(
+        self,
+        emit: Callable[[list[NodeColdtagEventCreateSchema]], Awaitable[Any]],
+        correct: Callable[[list[NodeColdtagEventCreateSchema]], Awaitable[Any]],
+        /,
+        *,
+        lateness: float,
+        interval: float,
+    ) -> None:
+        assert lateness > 0
+        assert interval > 0
+
+        self._emit = emit
+        self._correct = correct
+        self._lateness = lateness
+        self._watermark = timedelta(seconds=lateness)
+        self._interval = interval
+
+        # Readings are held per node until the newest reading of that node is more than
+        # the lateness ahead of them, or until they have been held that long on the wall clock
+        self._nodes: dict[int, _Node] = {}
+        self._sequence = itertools.count()
+        self._lock = asyncio.Lock()
+        self._task: asyncio.Task | None = None
+
+        self.emitted = 0
+        self.corrected = 0
+
+    def __len__(self) -> int:
+        return sum(len(node.held) for node in self._nodes.values())
+
+    def _pop(
+        self, node: _Node, /, *, until: datetime | None, arrived: float | None
+    ) -> list[NodeColdtagEventCreateSchema]:
+        events: list[NodeColdtagEventCreateSchema] = []
+
+        while node.held:
+            event_time, _, arrival, event = node.held[0]
+            if not ((until is not None and event_time <= until) or (arrived is not None and arrival <= arrived)):
+                break
+
+            heapq.heappop(node.held)
+            node.emitted = event_time
+            events.append(event)
+
+        return events
+
+    async def _release(
+        self, ready: list[NodeColdtagEventCreateSchema], late: list[NodeColdtagEventCreateSchema], /
+    ) -> None:
+        if late:
+            self.corrected += len(late)
+            await self._correct(late)
+
+        if ready:
+            self.emitted += len(ready)
+            await self._emit(ready)
+
+    async def put_many(self, events: list[NodeColdtagEventCreateSchema], /) -> None:
+        if not events:
+            return
+
+        arrival = asyncio.get_running_loop().time()
+
+        async with self._lock:
+            touched: dict[int, _Node] = {}
+            late: list[NodeColdtagEventCreateSchema] = []
+
+            for event in events:
+                node = self._nodes.setdefault(event.node_coldtag_id, _Node())
+
+                # Behind what has already been emitted for this node, ordering can no longer be kept
+                if node.emitted is not None and event.event_time <= node.emitted:
+                    late.append(event)
+                    continue
+
+                heapq.heappush(node.held, (event.event_time, next(self._sequence), arrival, event))
+                node.latest = event.event_time if node.latest is None else max(node.latest, event.event_time)
+                touched[event.node_coldtag_id] = node
+
+            ready = [
+                event
+                for node in touched.values()
+                for event in self._pop(node, until=node.latest - self._watermark, arrived=None)
+            ]
+
+            await self._release(ready, late)
+
+    async def release(self, *, force: bool = False) -> None:
+        arrived = float("inf") if force else asyncio.get_running_loop().time() - self._lateness
+
+        async with self._lock:
+            ready = [event for node in self._nodes.values() for event in self._pop(node, until=None, arrived=arrived)]
+
+            await self._release(ready, [])
+
+    def start(self) -> asyncio.Task:
+        async def task() -> None:
+            while True:
+                await asyncio.sleep(self._interval)
+
+                try:
+                    await self.release()
+
+                except Exception as err:
+                    logger.exception(err)
+
+        self._task = asyncio.create_task(task())
+        return self._task
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+        await self.release(force=True)
+
+    def metrics(self) -> dict[str, int]:
+        return {
+            "held": len(self),
+            "emitted": self.emitted,
+            "corrected": self.corrected,
+        }
@@ -0,0 +1,51 @@
+from collections.abc import Awaitable, Callable
+
+from aiomqtt import Message
+
+Handler = Callable[[list[str], Message], Awaitable[None]]
+
+
+class TopicRouter:
+    def __init__(self) -> None:
+        self._routes: dict[tuple[int, ...], dict[tuple[str, ...], Handler]] = {}
+        self._topic_filters: list[str] = []
+
+    @property
+    def topic_filters(self) -> list[str]:
+        return list(self._topic_filters)
+
+    def add(self, topic_filter: str, handler: Handler, /) -> None:
+        levels = topic_filter.split("/")
+        assert "#" not in levels, "Multi-level wildcard is not supported."
+
+        wildcards = tuple(i for i, level in enumerate(levels) if level == "+")
+        routes = self._routes.setdefault(wildcards, {})
+        assert tuple(levels) not in routes, f"Duplicated route {topic_filter}."
+
+        routes[tuple(levels)] = handler
+        self._topic_filters.append(topic_filter)
+
+    def resolve(self, topic: str, /) -> tuple[Handler, list[str]] | None:
+        topics = topic.split("/")
+
+        for wildcards, routes in self._routes.items():
+            levels = topics.copy()
+            for i in wildcards:
+                if i >= len(levels):
+                    break
+                levels[i] = "+"
+            else:
+                handler = routes.get(tuple(levels))
+                if handler is not None:
+                    return handler, topics
+
+        return None
+
+    async def dispatch(self, message: Message, /) -> bool:
+        resolved = self.resolve(message.topic.value)
+        if resolved is None:
+            return False
+
+        handler, topics = resolved
+        await handler(topics, message)
+        return True
@@ -0,0 +1,231 @@
+import asyncio
+import os
+import time
+from collections.abc import Awaitable, Callable
+from datetime import datetime
+from pathlib import Path
+from typing import IO, Any, get_type_hints
+
+import asyncpg
+import orjson
+from loguru import logger
+
+# Failures that say nothing about the records themselves, replay is retried as is once the database is back
+CONNECTION_ERRORS: tuple[type[BaseException], ...] = (
+    OSError,
+    TimeoutError,
+    asyncpg.InterfaceError,
+    asyncpg.PostgresConnectionError,
+    asyncpg.InsufficientResourcesError,
+    asyncpg.OperatorInterventionError,
+)
+
+
+# Append-only, segmented log of records that could not be written to the database
+class Spool[T: tuple]:
+    def __init__(
+        self,
+        directory: Path,
+        /,
+        *,
+        schema: type[T],
+        max_segment_size: int,
+        fsync_interval: float,
+        replay_interval: float,
+        replay_batch_size: int,
+        replay_max_attempts: int,
+    ) -> None:
+        assert max_segment_size > 0
+        assert fsync_interval > 0
+        assert replay_interval > 0
+        assert replay_batch_size > 0
+        assert replay_max_attempts > 0
+
+        self._directory = directory
+        self._schema = schema
+        self._max_segment_size = max_segment_size
+        self._fsync_interval = fsync_interval
+        self._replay_interval = replay_interval
+        self._replay_batch_size = replay_batch_size
+        self._replay_max_attempts = replay_max_attempts
+
+        # Segments the database keeps rejecting are moved aside so they cannot block the ones after them
+        self._quarantine_directory = directory / "quarantine"
+        self._attempts: dict[Path, int] = {}
+
+        self._datetime_fields = [i for i, hint in enumerate(get_type_hints(schema).values()) if hint is datetime]
+
+        self._segment: IO[bytes] | None = None
+        self._segment_size = 0
+        self._dirty = False
+        self._lock = asyncio.Lock()
+        self._tasks: list[asyncio.Task] = []
+
+        self._spooled = 0
+        self._replayed = 0
+        self._replay_rate = 0.0
+        self._replay_failures = 0
+        self._quarantined = 0
+
+        self._directory.mkdir(parents=True, exist_ok=True)
+
+    def _segments(self) -> list[Path]:
+        return sorted(self._directory.glob("*.jsonl"))
+
+    def _encode(self, item: T, /) -> bytes:
+        return orjson.dumps(list(item)) + b"\n"
+
+    def _decode(self, line: bytes, /) -> T:
+        values = orjson.loads(line)
+        for i in self._datetime_fields:
+            values[i] = datetime.fromisoformat(values[i])
+
+        return self._schema(*values)
+
+    def _open_segment(self) -> IO[bytes]:
+        if self._segment is None:
+            path = self._directory / f"{time.time_ns():020d}.jsonl"
+            self._segment = path.open("ab")
+            self._segment_size = 0
+
+        return self._segment
+
+    def _close_segment(self) -> None:
+        if self._segment is None:
+            return
+
+        self._segment.flush()
+        os.fsync(self._segment.fileno())
+        self._segment.close()
+
+        self._segment = None
+        self._dirty = False
+
+    async def append(self, items: list[T], /) -> None:
+        async with self._lock:
+            segment = self._open_segment()
+
+            data = b"".join(self._encode(item) for item in items)
+            segment.write(data)
+
+            self._segment_size += len(data)
+            self._spooled += len(items)
+            self._dirty = True
+
+            if self._segment_size >= self._max_segment_size:
+                await asyncio.to_thread(self._close_segment)
+
+        logger.warning(f"Spooled {len(items)} {self._schema.__name__} to {self._directory}.")
+
+    async def _sync(self) -> None:
+        async with self._lock:
+            if self._segment is None or not self._dirty:
+                return
+
+            self._segment.flush()
+            await asyncio.to_thread(os.fsync, self._segment.fileno())
+            self._dirty = False
+
+    async def replay(self, flush: Callable[[list[T]], Awaitable[Any]], /) -> int:
+        # Seal the active segment so that new failures go to a fresh one while this replays
+        async with self._lock:
+            await asyncio.to_thread(self._close_segment)
+            segments = self._segments()
+
+        count = 0
+        started = time.monotonic()
+
+        for path in segments:
+            try:
+                lines = (await asyncio.to_thread(path.read_bytes)).splitlines()
+                items = [self._decode(line) for line in lines if line]
+
+                for i in range(0, len(items), self._replay_batch_size):
+                    await flush(items[i : i + self._replay_batch_size])
+
+            except CONNECTION_ERRORS:
+                raise
+
+            except Exception as err:
+                self._replay_failures += 1
+                self._attempts[path] = self._attempts.get(path, 0) + 1
+                if self._attempts[path] < self._replay_max_attempts:
+                    raise
+
+                await asyncio.to_thread(self._quarantine, path)
+                logger.error(f"Quarantined {path} after {self._attempts.pop(path)} failed replays: {err!r}")
+                continue
+
+            # A partially replayed segment is replayed again in full, duplicates are
+            # dropped by the unique constraints on the event tables
+            path.unlink()
+            self._attempts.pop(path, None)
+            count += len(items)
+
+        if count:
+            self._replayed += count
+            self._replay_rate = count / max(time.monotonic() - started, 1e-9)
+            logger.info(f"Replayed {count} {self._schema.__name__} from {self._directory}.")
+
+        return count
+
+    def _quarantine(self, path: Path, /) -> None:
+        self._quarantine_directory.mkdir(exist_ok=True)
+        path.rename(self._quarantine_directory / path.name)
+        self._quarantined += 1
+
+    def start(
+        self, flush: Callable[[list[T]], Awaitable[Any]], /, *, probe: Callable[[], Awaitable[Any]]
+    ) -> list[asyncio.Task]:
+        async def sync_task() -> None:
+            while True:
+                await asyncio.sleep(self._fsync_interval)
+                await self._sync()
+
+        async def replay_task() -> None:
+            while True:
+                await asyncio.sleep(self._replay_interval)
+
+                if self._segment is None and not self._segments():
+                    continue
+
+                # Sealing while the database is still down would only leave a trail of tiny segments
+                try:
+                    await probe()
+
+                except Exception as err:
+                    logger.debug(f"Replay of {self._directory} deferred, database unreachable: {err!r}")
+                    continue
+
+                try:
+                    await self.replay(flush)
+
+                except CONNECTION_ERRORS as err:
+                    logger.warning(f"Replay of {self._directory} interrupted: {err!r}")
+
+                except Exception as err:
+                    logger.warning(f"Replay of {self._directory} failed: {err!r}")
+
+        self._tasks = [asyncio.create_task(sync_task()), asyncio.create_task(replay_task())]
+        return self._tasks
+
+    async def close(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        self._tasks = []
+
+        async with self._lock:
+            await asyncio.to_thread(self._close_segment)
+
+    def metrics(self) -> dict[str, int | float]:
+        segments = self._segments()
+
+        return {
+            "segments": len(segments),
+            "bytes": sum(path.stat().st_size for path in segments),
+            "spooled": self._spooled,
+            "replayed": self._replayed,
+            "replay_rate": self._replay_rate,
+            "replay_failures": self._replay_failures,
+            "quarantined": self._quarantined,
+        }
@@ -1,7 +1,11 @@
+import os
+import time
 from collections.abc import Awaitable, Callable
-from typing import TYPE_CHECKING, Any, Final, Literal, TypeVar
+from datetime import datetime
+from typing import TYPE_CHECKING, Any, Final, Literal, NamedTuple, TypeVar
 
 import asyncpg
+import orjson
 from fastapi import FastAPI
 
 if TYPE_CHECKING:
@@ -16,13 +20,51 @@ class MissingType:
 
 MISSING: Final[MissingType] = MissingType()
 
+MAC_ADDRESS_CACHE_TTL: float = float(os.getenv("MAC_ADDRESS_CACHE_TTL", "300"))
+
+# Unknown addresses are only remembered briefly, a tag registered by another process must show up quickly
+MAC_ADDRESS_CACHE_MISS_TTL: float = float(os.getenv("MAC_ADDRESS_CACHE_MISS_TTL", "5"))
+
+BATCH_LOADER_MAX_BATCH_SIZE: int = int(os.getenv("BATCH_LOADER_MAX_BATCH_SIZE", "1000"))
+
+EVENT_TABLES: Final[tuple[str, ...]] = (
+    "core_coldtag_event",
+    "node_coldtag_event",
+    "node_coldtag_event_alert_liquid",
+    "node_coldtag_event_alert_impact",
+    "route_cycle_alert_temperature",
+    "route_cycle_alert_humidity",
+)
+
+EVENT_PARTITION_MAINTENANCE_INTERVAL: float = float(os.getenv("EVENT_PARTITION_MAINTENANCE_INTERVAL", "3600"))
+
+EVENT_PARTITION_PREMAKE_MONTHS: int = int(os.getenv("EVENT_PARTITION_PREMAKE_MONTHS", "2"))
+
+# Days of events kept per table, e.g. NODE_COLDTAG_EVENT_RETENTION_DAYS, 0 keeps every partition
+EVENT_RETENTION_DAYS: dict[str, int] = {
+    table: int(os.getenv(f"{table.upper()}_RETENTION_DAYS", "0")) for table in EVENT_TABLES
+}
+
 T = TypeVar("T")
 
 
+class EventKey(NamedTuple):
+    event_time: datetime
+    id: int
+
+
+class EventPage(NamedTuple):
+    # Events are listed newest first on (event_time, id), a backward page walks towards the newest
+    after: EventKey | None
+    before: EventKey | None
+    limit: int
+    backward: bool = False
+
+
 class InsertConstructor:
     def __init__(self, initial: list[Any] | None = None, /) -> None:
         self._pairs: dict[str, Any] = {}
-        self._values: list[Any] = initial if initial else []
+        self._values: list[Any] = initial or []
         self._initial = len(self._values)
 
     def add(self, key: str, value: Any, /) -> None:  # noqa: ANN401
@@ -43,7 +85,7 @@ class InsertConstructor:
 class UpdateConstructor:
     def __init__(self, initial: list[Any] | None = None, /) -> None:
         self._pairs: dict[str, Any] = {}
-        self._values: list[Any] = initial if initial else []
+        self._values: list[Any] = initial or []
         self._initial = len(self._values)
 
     def add(self, key: str, value: Any, /) -> None:  # noqa: ANN401
@@ -59,6 +101,45 @@ class UpdateConstructor:
         return tuple(self._values)
 
 
+def normalize_mac_address(address: str, /) -> str:
+    # Lookups match addresses exactly, every address is stored and looked up as upper case hex split by colons
+    return address.replace("-", ":").upper()
+
+
+class MacAddressCache:
+    def __init__(self, /, ttl: float, miss_ttl: float) -> None:
+        self._ttl = ttl
+        self._miss_ttl = miss_ttl
+        self._entries: dict[str, tuple[int | None, float]] = {}
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, mac_address: str, /) -> int | MissingType | None:
+        entry = self._entries.get(normalize_mac_address(mac_address))
+        if entry is None or entry[1] < time.monotonic():
+            self._misses += 1
+            return MISSING
+
+        self._hits += 1
+        return entry[0]
+
+    def set(self, mac_address: str, coldtag_id: int | None, /) -> None:
+        ttl = self._miss_ttl if coldtag_id is None else self._ttl
+        self._entries[normalize_mac_address(mac_address)] = (coldtag_id, time.monotonic() + ttl)
+
+    def update(self, entries: dict[str, int], /) -> None:
+        expires = time.monotonic() + self._ttl
+        self._entries.update(
+            {normalize_mac_address(mac_address): (coldtag_id, expires) for mac_address, coldtag_id in entries.items()}
+        )
+
+    def invalidate(self, mac_address: str, /) -> None:
+        self._entries.pop(normalize_mac_address(mac_address), None)
+
+    def metrics(self) -> dict[str, int]:
+        return {"size": len(self._entries), "hits": self._hits, "misses": self._misses}
+
+
 class BasePersistence:
     def __init__(self, app: FastAPI, /, pool: asyncpg.Pool) -> None:
         self._app = app
@@ -70,3 +151,140 @@ class BasePersistence:
     async def _commit(self, command: Callable[[asyncpg.Connection], Awaitable[T]], /) -> T:
         async with self._pool.acquire() as client, client.transaction():
             return await command(client)
+
+    async def ping(self) -> None:
+        async with self._pool.acquire() as client:
+            await client.fetchval("SELECT 1")
+
+    async def _find_event_rows_by_owner_ids(
+        self, table: str, owner_column: str, cache_prefix: str, owner_ids: list[int], /
+    ) -> dict[int, list[dict[str, Any]]]:
+        # Shares the per owner cache entries of the single owner lookups, newest first like them
+        cached = await self._redis.mget([f"{cache_prefix}:{owner_id}" for owner_id in owner_ids])
+
+        rows_by_owner: dict[int, list[dict[str, Any]]] = {
+            owner_id: orjson.loads(value) for owner_id, value in zip(owner_ids, cached, strict=True) if value
+        }
+        missing = list(dict.fromkeys(owner_id for owner_id in owner_ids if owner_id not in rows_by_owner))
+        if not missing:
+            return rows_by_owner
+
+        async def __query(client: asyncpg.Connection) -> dict[int, list[dict[str, Any]]]:
+            rows = await client.fetch(
+                f"""
+                    SELECT * FROM {table}
+                    WHERE {owner_column} = ANY($1::int[])
+                    ORDER BY {owner_column}, event_time DESC
+                """,  # noqa: S608
+                missing,
+            )
+
+            found: dict[int, list[dict[str, Any]]] = {owner_id: [] for owner_id in missing}
+            for row in rows:
+                found[row[owner_column]].append(dict(row))
+
+            return found
+
+        found = await self._commit(__query)
+        await self._redis.mset({f"{cache_prefix}:{owner_id}": orjson.dumps(rows) for owner_id, rows in found.items()})
+
+        rows_by_owner.update(found)
+        return rows_by_owner
+
+    async def _find_event_rows_by_node_time_ranges(
+        self, table: str, cache_prefix: str, ranges: list[tuple[int, datetime, datetime | None]], /
+    ) -> list[list[dict[str, Any]]]:
+        # Shares the per range cache entries of the single node time range lookups
+        cache_keys = [
+            f"{cache_prefix}:{node_id}:{a.timestamp()}:{b.timestamp() if b is not None else None}"
+            for node_id, a, b in ranges
+        ]
+        cached = await self._redis.mget(cache_keys)
+
+        rows_by_range: list[list[dict[str, Any]] | None] = [orjson.loads(value) if value else None for value in cached]
+        missing = [i for i, rows in enumerate(rows_by_range) if rows is None]
+
+        async def __query(client: asyncpg.Connection) -> dict[int, list[dict[str, Any]]]:
+            # One index range scan per range, the ordinality maps each row back to its range
+            rows = await client.fetch(
+                f"""
+                    SELECT r.i AS range_ordinality, e.*
+                    FROM UNNEST($1::int[], $2::timestamptz[], $3::timestamptz[]) WITH ORDINALITY AS r (node_id, a, b, i)
+                    CROSS JOIN LATERAL (
+                        SELECT * FROM {table}
+                        WHERE node_coldtag_id = r.node_id
+                        AND event_time >= r.a
+                        AND event_time <= COALESCE(r.b, 'infinity')
+                    ) e
+                """,  # noqa: S608
+                [ranges[i][0] for i in missing],
+                [ranges[i][1] for i in missing],
+                [ranges[i][2] for i in missing],
+            )
+
+            found: dict[int, list[dict[str, Any]]] = {i: [] for i in missing}
+            for row in rows:
+                data = dict(row)
+                found[missing[data.pop("range_ordinality") - 1]].append(data)
+
+            return found
+
+        if missing:
+            found = await self._commit(__query)
+
+            async with self._redis.pipeline(transaction=False) as pipe:
+                for i, rows in found.items():
+                    pipe.setex(cache_keys[i], 10, orjson.dumps(rows))
+
+                await pipe.execute()
+
+            for i, rows in found.items():
+                rows_by_range[i] = rows
+
+        return [rows or [] for rows in rows_by_range]
+
+    @staticmethod
+    async def _fetch_event_page(
+        client: asyncpg.Connection,
+        table: str,
+        owner: tuple[str, int] | None,
+        /,
+        *,
+        page: EventPage,
+        a: datetime | None = None,
+        b: datetime | None = None,
+    ) -> list[asyncpg.Record]:
+        values: list[Any] = [a, b]
+        conditions = [
+            "event_time >= COALESCE($1::timestamptz, '-infinity')",
+            "event_time <= COALESCE($2::timestamptz, 'infinity')",
+        ]
+
+        if owner is not None:
+            values.append(owner[1])
+            conditions.append(f"{owner[0]} = ${len(values)}")
+
+        # Keyset bounds, the plain event_time comparison gives the planner an index range to scan
+        if page.after is not None:
+            values.extend(page.after)
+            conditions.append(f"event_time <= ${len(values) - 1}")
+            conditions.append(f"(event_time < ${len(values) - 1} OR id < ${len(values)})")
+
+        if page.before is not None:
+            values.extend(page.before)
+            conditions.append(f"event_time >= ${len(values) - 1}")
+            conditions.append(f"(event_time > ${len(values) - 1} OR id > ${len(values)})")
+
+        direction = "ASC" if page.backward else "DESC"
+        values.append(page.limit)
+
+        rows = await client.fetch(
+            f"""
+                SELECT * FROM {table}
+                WHERE {" AND ".join(conditions)}
+                ORDER BY event_time {direction}, id {direction}
+                LIMIT ${len(values)}
+            """,  # noqa: S608
+            *values,
+        )
+        return rows[::-1] if page.backward else rows
@@ -1,7 +1,8 @@
 import asyncio
 import re
+from collections.abc import Sequence
 from datetime import datetime
-from typing import cast
+from typing import Any, cast
 
 import orjson
 from asyncpg import Connection as PgConnection
@@ -9,18 +10,30 @@ from asyncpg import Pool as PgPool
 from asyncpg import Record as PgRecord
 from fastapi import FastAPI
 
-from src.persistence import MISSING, BasePersistence, InsertConstructor, MissingType
+from src.persistence import (
+    MAC_ADDRESS_CACHE_MISS_TTL,
+    MAC_ADDRESS_CACHE_TTL,
+    MISSING,
+    BasePersistence,
+    EventPage,
+    InsertConstructor,
+    MacAddressCache,
+    MissingType,
+    normalize_mac_address,
+)
 
 from .model import (
     PersistedCoreColdtag,
     PersistedCoreColdtagEvent,
 )
 from .schema import (
+    CoreColdtagEventCreateSchema,
     CoreColdtagEventSchema,
     CoreColdtagSchema,
 )
 
 __all__ = [
+    "CoreColdtagEventCreateSchema",
     "CoreColdtagEventSchema",
     "CoreColdtagSchema",
     "PersistedCoreColdtag",
@@ -32,10 +45,33 @@ def _is_valid_mac_address(address: str, /) -> bool:
     return bool(re.fullmatch(r"^([0-9A-Fa-f]{2}[:-]){5}([0-9A-Fa-f]{2})$", address))
 
 
+def _count_inserted(status: str, /) -> int:
+    return int(status.rsplit(" ", 1)[-1])
+
+
 class CoreColdtagPersistence(BasePersistence):
     def __init__(self, app: FastAPI, pool: PgPool) -> None:
         super().__init__(app, pool=pool)
 
+        self._mac_address_cache = MacAddressCache(ttl=MAC_ADDRESS_CACHE_TTL, miss_ttl=MAC_ADDRESS_CACHE_MISS_TTL)
+
+    @property
+    def mac_address_cache(self) -> MacAddressCache:
+        return self._mac_address_cache
+
+    async def warm_mac_address_cache(self) -> int:
+        async def __query(client: PgConnection) -> dict[str, int]:
+            rows = await client.fetch(
+                """
+                SELECT id, mac_address FROM create_core_coldtag
+                """
+            )
+            return {row["mac_address"]: row["id"] for row in rows}
+
+        entries = await self._commit(__query)
+        self._mac_address_cache.update(entries)
+        return len(entries)
+
     async def is_core_exists_by_id(self, core_id: str, /) -> bool:
         async def __query(client: PgConnection) -> bool:
             row = await client.fetchval(
@@ -50,6 +86,8 @@ class CoreColdtagPersistence(BasePersistence):
         return await self._commit(__query)
 
     async def is_core_exists_by_mac_address(self, mac_address: str, /) -> bool:
+        mac_address = normalize_mac_address(mac_address)
+
         async def __query(client: PgConnection) -> bool:
             row = await client.fetchval(
                 """
@@ -121,7 +159,52 @@ class CoreColdtagPersistence(BasePersistence):
 
         return await PersistedCoreColdtag.construct_model(self._app, schema)
 
+    async def _find_core_schemas_by_ids(self, coldtag_ids: list[int], /) -> list[CoreColdtagSchema | None]:
+        cached = await self._redis.mget([f"core_coldtag_by_id:{coldtag_id}" for coldtag_id in coldtag_ids])
+
+        schemas: dict[int, CoreColdtagSchema] = {
+            coldtag_id: CoreColdtagSchema(**orjson.loads(value))
+            for coldtag_id, value in zip(coldtag_ids, cached, strict=True)
+            if value
+        }
+        missing = [coldtag_id for coldtag_id in coldtag_ids if coldtag_id not in schemas]
+
+        async def __query(client: PgConnection) -> dict[int, CoreColdtagSchema]:
+            rows = await client.fetch(
+                """
+                    SELECT * FROM core_coldtag
+                    WHERE id = ANY($1::int[])
+                """,
+                missing,
+            )
+            if rows:
+                await self._redis.mset({f"core_coldtag_by_id:{row['id']}": orjson.dumps(dict(row)) for row in rows})
+
+            return {row["id"]: CoreColdtagSchema(**row) for row in rows}
+
+        if missing:
+            schemas.update(await self._commit(__query))
+
+        return [schemas.get(coldtag_id) for coldtag_id in coldtag_ids]
+
+    async def find_cores_by_ids(self, coldtag_ids: Sequence[str], /) -> list[PersistedCoreColdtag | None]:
+        if not coldtag_ids:
+            return []
+
+        targets = list(dict.fromkeys(int(coldtag_id) for coldtag_id in coldtag_ids))
+        schemas = dict(zip(targets, await self._find_core_schemas_by_ids(targets), strict=True))
+
+        async def __construct(coldtag_id: str) -> PersistedCoreColdtag | None:
+            schema = schemas[int(coldtag_id)]
+            if schema is None:
+                return None
+
+            return await PersistedCoreColdtag.construct_model(self._app, schema)
+
+        return list(await asyncio.gather(*[__construct(coldtag_id) for coldtag_id in coldtag_ids]))
+
     async def find_core_by_mac_address(self, mac_address: str, /) -> PersistedCoreColdtag | None:
+        mac_address = normalize_mac_address(mac_address)
         cache_key = f"core_coldtag_by_mac_address:{mac_address}"
         cached = await self._redis.get(cache_key)
 
@@ -148,6 +231,25 @@ class CoreColdtagPersistence(BasePersistence):
 
         return await PersistedCoreColdtag.construct_model(self._app, schema)
 
+    async def find_core_id_by_mac_address(self, mac_address: str, /) -> int | None:
+        mac_address = normalize_mac_address(mac_address)
+        cached = self._mac_address_cache.get(mac_address)
+        if not isinstance(cached, MissingType):
+            return cached
+
+        async def __query(client: PgConnection) -> int | None:
+            return await client.fetchval(
+                """
+                SELECT id FROM create_core_coldtag
+                WHERE mac_address = $1
+                """,
+                mac_address,
+            )
+
+        coldtag_id = await self._commit(__query)
+        self._mac_address_cache.set(mac_address, coldtag_id)
+        return coldtag_id
+
     async def find_core_events_by_core_id(self, core_id: str, /) -> list[PersistedCoreColdtagEvent]:
         cache_key = f"core_coldtag_events_by_core_id:{core_id}"
         cached = await self._redis.get(cache_key)
@@ -157,6 +259,7 @@ class CoreColdtagPersistence(BasePersistence):
                 """
                     SELECT * FROM core_coldtag_event
                     WHERE core_coldtag_id = $1
+                    ORDER BY event_time DESC
                 """,
                 int(core_id),
             )
@@ -171,6 +274,26 @@ class CoreColdtagPersistence(BasePersistence):
             await asyncio.gather(*[PersistedCoreColdtagEvent.construct_model(self._app, schema) for schema in schemas]),
         )
 
+    async def find_core_events_by_core_ids(self, core_ids: Sequence[str], /) -> list[list[PersistedCoreColdtagEvent]]:
+        rows_by_owner = await self._find_event_rows_by_owner_ids(
+            "core_coldtag_event",
+            "core_coldtag_id",
+            "core_coldtag_events_by_core_id",
+            [int(core_id) for core_id in core_ids],
+        )
+        return [
+            cast(
+                "list[PersistedCoreColdtagEvent]",
+                await asyncio.gather(
+                    *[
+                        PersistedCoreColdtagEvent.construct_model(self._app, CoreColdtagEventSchema(**row))
+                        for row in rows_by_owner[int(core_id)]
+                    ]
+                ),
+            )
+            for core_id in core_ids
+        ]
+
     async def find_core_events_all_by_time_range(
         self, /, a: datetime, b: datetime | None = None
     ) -> list[PersistedCoreColdtagEvent]:
@@ -182,7 +305,7 @@ class CoreColdtagPersistence(BasePersistence):
                 """
                     SELECT * FROM core_coldtag_event
                     WHERE event_time >= $1
-                    AND ($2::timestamptz IS NULL OR event_time <= $2)
+                    AND event_time <= COALESCE($2::timestamptz, 'infinity')
                 """,
                 a,
                 b,
@@ -198,6 +321,45 @@ class CoreColdtagPersistence(BasePersistence):
             await asyncio.gather(*[PersistedCoreColdtagEvent.construct_model(self._app, schema) for schema in schemas]),
         )
 
+    async def find_core_events_page(
+        self, core_id: str | None, /, page: EventPage, a: datetime | None = None, b: datetime | None = None
+    ) -> list[PersistedCoreColdtagEvent]:
+        async def __query(client: PgConnection) -> list[CoreColdtagEventSchema]:
+            rows = await self._fetch_event_page(
+                client,
+                "core_coldtag_event",
+                ("core_coldtag_id", int(core_id)) if core_id is not None else None,
+                page=page,
+                a=a,
+                b=b,
+            )
+            return [CoreColdtagEventSchema(**row) for row in rows]
+
+        schemas = await self._commit(__query)
+        return cast(
+            "list[PersistedCoreColdtagEvent]",
+            await asyncio.gather(*[PersistedCoreColdtagEvent.construct_model(self._app, schema) for schema in schemas]),
+        )
+
+    async def find_latest_core_event_positions(self) -> list[CoreColdtagEventCreateSchema]:
+        async def __query(client: PgConnection) -> list[CoreColdtagEventCreateSchema]:
+            rows = await client.fetch(
+                """
+                    SELECT cce.core_coldtag_id, cce.latitude, cce.longitude, cce.event_time
+                    FROM create_core_coldtag ccc
+                    CROSS JOIN LATERAL (
+                        SELECT * FROM core_coldtag_event
+                        WHERE core_coldtag_id = ccc.id
+                        AND latitude IS NOT NULL AND longitude IS NOT NULL
+                        ORDER BY event_time DESC
+                        LIMIT 1
+                    ) cce
+                """
+            )
+            return [CoreColdtagEventCreateSchema(*row) for row in rows]
+
+        return await self._commit(__query)
+
     async def find_core_event_by_closest_time(
         self, core_id: str, /, time: datetime
     ) -> PersistedCoreColdtagEvent | None:
@@ -205,13 +367,27 @@ class CoreColdtagPersistence(BasePersistence):
         cached = await self._redis.get(cache_key)
 
         async def __query(client: PgConnection) -> CoreColdtagEventSchema | None:
+            # Latest at or before and earliest at or after, each one probe of (core_coldtag_id, event_time)
             row = cast(
                 "PgRecord",
                 await client.fetchrow(
                     """
-                        SELECT * FROM core_coldtag_event
-                        WHERE core_coldtag_id = $1
-                        ORDER BY ABS(EXTRACT(EPOCH FROM (event_time - $2))) ASC
+                        SELECT * FROM (
+                            (
+                                SELECT * FROM core_coldtag_event
+                                WHERE core_coldtag_id = $1 AND event_time <= $2
+                                ORDER BY event_time DESC
+                                LIMIT 1
+                            )
+                            UNION ALL
+                            (
+                                SELECT * FROM core_coldtag_event
+                                WHERE core_coldtag_id = $1 AND event_time >= $2
+                                ORDER BY event_time ASC
+                                LIMIT 1
+                            )
+                        ) AS candidate
+                        ORDER BY ABS(EXTRACT(EPOCH FROM (event_time - $2))) ASC, event_time ASC
                         LIMIT 1
                     """,
                     int(core_id),
@@ -230,8 +406,88 @@ class CoreColdtagPersistence(BasePersistence):
 
         return await PersistedCoreColdtagEvent.construct_model(self._app, schema)
 
+    async def find_core_events_by_closest_times(
+        self, core_id: str, /, times: Sequence[datetime]
+    ) -> list[PersistedCoreColdtagEvent | None]:
+        if not times:
+            return []
+
+        targets = list(dict.fromkeys(times))
+        cache_keys = [f"core_coldtag_events_by_closest_time:{core_id}:{time.timestamp()}" for time in targets]
+        cached = await self._redis.mget(cache_keys)
+
+        schemas: dict[datetime, CoreColdtagEventSchema | None] = {
+            time: CoreColdtagEventSchema(**orjson.loads(value))
+            for time, value in zip(targets, cached, strict=True)
+            if value
+        }
+        missing = [time for time in targets if time not in schemas]
+
+        async def __query(client: PgConnection) -> dict[datetime, dict[str, Any]]:
+            rows = await client.fetch(
+                """
+                    SELECT target.ord, closest.*
+                    FROM UNNEST($2::timestamptz[]) WITH ORDINALITY AS target(time, ord)
+                    LEFT JOIN LATERAL (
+                        SELECT * FROM (
+                            (
+                                SELECT * FROM core_coldtag_event
+                                WHERE core_coldtag_id = $1 AND event_time <= target.time
+                                ORDER BY event_time DESC
+                                LIMIT 1
+                            )
+                            UNION ALL
+                            (
+                                SELECT * FROM core_coldtag_event
+                                WHERE core_coldtag_id = $1 AND event_time >= target.time
+                                ORDER BY event_time ASC
+                                LIMIT 1
+                            )
+                        ) AS candidate
+                        ORDER BY
+                            ABS(EXTRACT(EPOCH FROM (candidate.event_time - target.time))) ASC,
+                            candidate.event_time ASC
+                        LIMIT 1
+                    ) AS closest ON TRUE
+                    ORDER BY target.ord
+                """,
+                int(core_id),
+                missing,
+            )
+
+            found: dict[datetime, dict[str, Any]] = {}
+            for row in rows:
+                data = {key: value for key, value in row.items() if key != "ord"}
+                if data["id"] is not None:
+                    found[missing[row["ord"] - 1]] = data
+
+            return found
+
+        if missing:
+            found = await self._commit(__query)
+
+            # Cached once the connection is back in the pool, in a single round trip
+            if found:
+                async with self._redis.pipeline(transaction=False) as pipe:
+                    for time, data in found.items():
+                        pipe.setex(
+                            f"core_coldtag_events_by_closest_time:{core_id}:{time.timestamp()}", 10, orjson.dumps(data)
+                        )
+
+                    await pipe.execute()
+
+            schemas.update({time: CoreColdtagEventSchema(**data) for time, data in found.items()})
+
+        persisted = {
+            time: await PersistedCoreColdtagEvent.construct_model(self._app, schema)
+            for time, schema in schemas.items()
+            if schema is not None
+        }
+        return [persisted.get(time) for time in times]
+
     async def create_core(self, *, mac_address: str, identifier: str | None = None) -> PersistedCoreColdtag:
         assert _is_valid_mac_address(mac_address), "Invalid MAC Address."
+        mac_address = normalize_mac_address(mac_address)
 
         async def __query(client: PgConnection) -> CoreColdtagSchema:
             core_id = cast(
@@ -265,6 +521,8 @@ class CoreColdtagPersistence(BasePersistence):
             return CoreColdtagSchema(**row)
 
         schema = await self._commit(__query)
+        self._mac_address_cache.set(schema.mac_address, schema.id)
+
         return await PersistedCoreColdtag.construct_model(self._app, schema)
 
     async def update_core(
@@ -307,6 +565,7 @@ class CoreColdtagPersistence(BasePersistence):
 
         cache_keys = [f"core_coldtag_by_id:{core_id}", f"core_coldtag_by_mac_address:{persisted_core.mac_address}"]
         await self._redis.delete(*cache_keys)
+        self._mac_address_cache.invalidate(persisted_core.mac_address)
 
         updated_persisted_core = await self.find_core_by_id(core_id)
         assert updated_persisted_core is not None
@@ -353,3 +612,35 @@ class CoreColdtagPersistence(BasePersistence):
         await self._redis.delete(*cache_keys)
 
         return await PersistedCoreColdtagEvent.construct_model(self._app, schema)
+
+    async def create_core_events(self, events: Sequence[CoreColdtagEventCreateSchema], /) -> int:
+        if not events:
+            return 0
+
+        async def __query(client: PgConnection) -> int:
+            status = await client.execute(
+                """
+                INSERT INTO core_coldtag_event (
+                    core_coldtag_id,
+                    latitude,
+                    longitude,
+                    event_time
+                )
+                SELECT * FROM UNNEST(
+                    $1::int[],
+                    $2::float8[],
+                    $3::float8[],
+                    $4::timestamptz[]
+                )
+                ON CONFLICT DO NOTHING
+                """,
+                *map(list, zip(*events, strict=True)),
+            )
+            return _count_inserted(status)
+
+        count = await self._commit(__query)
+
+        cache_keys = [f"core_coldtag_events_by_core_id:{core_id}" for core_id in {e.core_coldtag_id for e in events}]
+        await self._redis.delete(*cache_keys)
+
+        return count
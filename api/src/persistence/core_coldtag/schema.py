@@ -1,4 +1,5 @@
 from datetime import datetime
+from typing import NamedTuple
 
 from pydantic import BaseModel
 
@@ -19,3 +20,10 @@ class CoreColdtagSchema(BaseModel):
     deleted: bool | None
     created_time: datetime
     updated_time: datetime
+
+
+class CoreColdtagEventCreateSchema(NamedTuple):
+    core_coldtag_id: int
+    latitude: float | None
+    longitude: float | None
+    event_time: datetime
@@ -1,5 +1,6 @@
 import asyncio
 import re
+from collections.abc import Sequence
 from datetime import datetime
 from typing import cast
 
@@ -9,30 +10,52 @@ from asyncpg import Pool as PgPool
 from asyncpg import Record as PgRecord
 from fastapi import FastAPI
 
-from src.persistence import MISSING, BasePersistence, InsertConstructor, MissingType
+from src.persistence import (
+    MAC_ADDRESS_CACHE_MISS_TTL,
+    MAC_ADDRESS_CACHE_TTL,
+    MISSING,
+    BasePersistence,
+    EventPage,
+    InsertConstructor,
+    MacAddressCache,
+    MissingType,
+    normalize_mac_address,
+)
 
 from .model import (
     PersistedNodeColdtag,
     PersistedNodeColdtagEvent,
     PersistedNodeColdtagEventAlertImpact,
     PersistedNodeColdtagEventAlertLiquid,
+    PersistedNodeColdtagEventRollup,
 )
 from .schema import (
+    NodeColdtagEventAlertImpactCreateSchema,
     NodeColdtagEventAlertImpactSchema,
+    NodeColdtagEventAlertLiquidCreateSchema,
     NodeColdtagEventAlertLiquidSchema,
+    NodeColdtagEventCreateSchema,
+    NodeColdtagEventRollupSchema,
     NodeColdtagEventSchema,
     NodeColdtagSchema,
 )
 
 __all__ = [
+    "ROLLUP_RESOLUTIONS",
+    "NodeColdtagEventAlertImpactCreateSchema",
     "NodeColdtagEventAlertImpactSchema",
+    "NodeColdtagEventAlertLiquidCreateSchema",
     "NodeColdtagEventAlertLiquidSchema",
+    "NodeColdtagEventCreateSchema",
+    "NodeColdtagEventRollupSchema",
     "NodeColdtagEventSchema",
     "NodeColdtagSchema",
     "PersistedNodeColdtag",
     "PersistedNodeColdtagEvent",
     "PersistedNodeColdtagEventAlertImpact",
     "PersistedNodeColdtagEventAlertLiquid",
+    "PersistedNodeColdtagEventRollup",
+    "select_rollup_resolution",
 ]
 
 
@@ -40,10 +63,45 @@ def _is_valid_mac_address(address: str, /) -> bool:
     return bool(re.fullmatch(r"^([0-9A-Fa-f]{2}[:-]){5}([0-9A-Fa-f]{2})$", address))
 
 
+# Bucket widths in seconds maintained by the rollup trigger on node_coldtag_event
+ROLLUP_RESOLUTIONS: tuple[int, ...] = (60, 900, 3600)
+
+
+def select_rollup_resolution(a: datetime, b: datetime | None = None, /, *, max_points: int) -> int:
+    # Finest rollup that keeps the range within the point budget, the coarsest one past that
+    span = ((b or datetime.now(tz=a.tzinfo)) - a).total_seconds()
+    return next(
+        (resolution for resolution in ROLLUP_RESOLUTIONS if span / resolution <= max_points), ROLLUP_RESOLUTIONS[-1]
+    )
+
+
+def _count_inserted(status: str, /) -> int:
+    return int(status.rsplit(" ", 1)[-1])
+
+
 class NodeColdtagPersistence(BasePersistence):
     def __init__(self, app: FastAPI, pool: PgPool) -> None:
         super().__init__(app, pool=pool)
 
+        self._mac_address_cache = MacAddressCache(ttl=MAC_ADDRESS_CACHE_TTL, miss_ttl=MAC_ADDRESS_CACHE_MISS_TTL)
+
+    @property
+    def mac_address_cache(self) -> MacAddressCache:
+        return self._mac_address_cache
+
+    async def warm_mac_address_cache(self) -> int:
+        async def __query(client: PgConnection) -> dict[str, int]:
+            rows = await client.fetch(
+                """
+                SELECT id, mac_address FROM create_node_coldtag
+                """
+            )
+            return {row["mac_address"]: row["id"] for row in rows}
+
+        entries = await self._commit(__query)
+        self._mac_address_cache.update(entries)
+        return len(entries)
+
     async def is_node_exists_by_id(self, node_id: str, /) -> bool:
         async def __query(client: PgConnection) -> bool:
             row = await client.fetchval(
@@ -58,6 +116,8 @@ class NodeColdtagPersistence(BasePersistence):
         return await self._commit(__query)
 
     async def is_node_exists_by_mac_address(self, mac_address: str, /) -> bool:
+        mac_address = normalize_mac_address(mac_address)
+
         async def __query(client: PgConnection) -> bool:
             row = await client.fetchval(
                 """
@@ -176,7 +236,52 @@ class NodeColdtagPersistence(BasePersistence):
 
         return await PersistedNodeColdtag.construct_model(self._app, schema)
 
+    async def _find_node_schemas_by_ids(self, coldtag_ids: list[int], /) -> list[NodeColdtagSchema | None]:
+        cached = await self._redis.mget([f"node_coldtag_by_id:{coldtag_id}" for coldtag_id in coldtag_ids])
+
+        schemas: dict[int, NodeColdtagSchema] = {
+            coldtag_id: NodeColdtagSchema(**orjson.loads(value))
+            for coldtag_id, value in zip(coldtag_ids, cached, strict=True)
+            if value
+        }
+        missing = [coldtag_id for coldtag_id in coldtag_ids if coldtag_id not in schemas]
+
+        async def __query(client: PgConnection) -> dict[int, NodeColdtagSchema]:
+            rows = await client.fetch(
+                """
+                    SELECT * FROM node_coldtag
+                    WHERE id = ANY($1::int[])
+                """,
+                missing,
+            )
+            if rows:
+                await self._redis.mset({f"node_coldtag_by_id:{row['id']}": orjson.dumps(dict(row)) for row in rows})
+
+            return {row["id"]: NodeColdtagSchema(**row) for row in rows}
+
+        if missing:
+            schemas.update(await self._commit(__query))
+
+        return [schemas.get(coldtag_id) for coldtag_id in coldtag_ids]
+
+    async def find_nodes_by_ids(self, coldtag_ids: Sequence[str], /) -> list[PersistedNodeColdtag | None]:
+        if not coldtag_ids:
+            return []
+
+        targets = list(dict.fromkeys(int(coldtag_id) for coldtag_id in coldtag_ids))
+        schemas = dict(zip(targets, await self._find_node_schemas_by_ids(targets), strict=True))
+
+        async def __construct(coldtag_id: str) -> PersistedNodeColdtag | None:
+            schema = schemas[int(coldtag_id)]
+            if schema is None:
+                return None
+
+            return await PersistedNodeColdtag.construct_model(self._app, schema)
+
+        return list(await asyncio.gather(*[__construct(coldtag_id) for coldtag_id in coldtag_ids]))
+
     async def find_node_by_mac_address(self, mac_address: str, /) -> PersistedNodeColdtag | None:
+        mac_address = normalize_mac_address(mac_address)
         cache_key = f"node_coldtag_by_mac_address:{mac_address}"
         cached = await self._redis.get(cache_key)
 
@@ -203,6 +308,25 @@ class NodeColdtagPersistence(BasePersistence):
 
         return await PersistedNodeColdtag.construct_model(self._app, schema)
 
+    async def find_node_id_by_mac_address(self, mac_address: str, /) -> int | None:
+        mac_address = normalize_mac_address(mac_address)
+        cached = self._mac_address_cache.get(mac_address)
+        if not isinstance(cached, MissingType):
+            return cached
+
+        async def __query(client: PgConnection) -> int | None:
+            return await client.fetchval(
+                """
+                SELECT id FROM create_node_coldtag
+                WHERE mac_address = $1
+                """,
+                mac_address,
+            )
+
+        coldtag_id = await self._commit(__query)
+        self._mac_address_cache.set(mac_address, coldtag_id)
+        return coldtag_id
+
     async def find_node_events_by_node_id(self, node_id: str, /) -> list[PersistedNodeColdtagEvent]:
         cache_key = f"node_coldtag_events_by_node_id:{node_id}"
         cached = await self._redis.get(cache_key)
@@ -212,6 +336,7 @@ class NodeColdtagPersistence(BasePersistence):
                 """
                     SELECT * FROM node_coldtag_event
                     WHERE node_coldtag_id = $1
+                    ORDER BY event_time DESC
                 """,
                 int(node_id),
             )
@@ -226,6 +351,26 @@ class NodeColdtagPersistence(BasePersistence):
             await asyncio.gather(*[PersistedNodeColdtagEvent.construct_model(self._app, schema) for schema in schemas]),
         )
 
+    async def find_node_events_by_node_ids(self, node_ids: Sequence[str], /) -> list[list[PersistedNodeColdtagEvent]]:
+        rows_by_owner = await self._find_event_rows_by_owner_ids(
+            "node_coldtag_event",
+            "node_coldtag_id",
+            "node_coldtag_events_by_node_id",
+            [int(node_id) for node_id in node_ids],
+        )
+        return [
+            cast(
+                "list[PersistedNodeColdtagEvent]",
+                await asyncio.gather(
+                    *[
+                        PersistedNodeColdtagEvent.construct_model(self._app, NodeColdtagEventSchema(**row))
+                        for row in rows_by_owner[int(node_id)]
+                    ]
+                ),
+            )
+            for node_id in node_ids
+        ]
+
     async def find_node_events_all_by_time_range(
         self, /, a: datetime, b: datetime | None = None
     ) -> list[PersistedNodeColdtagEvent]:
@@ -237,7 +382,7 @@ class NodeColdtagPersistence(BasePersistence):
                 """
                     SELECT * FROM node_coldtag_event
                     WHERE event_time >= $1
-                    AND ($2::timestamptz IS NULL OR event_time <= $2)
+                    AND event_time <= COALESCE($2::timestamptz, 'infinity')
                 """,
                 a,
                 b,
@@ -265,7 +410,7 @@ class NodeColdtagPersistence(BasePersistence):
                     SELECT * FROM node_coldtag_event
                     WHERE node_coldtag_id = $1
                     AND event_time >= $2
-                    AND ($3::timestamptz IS NULL OR event_time <= $3)
+                    AND event_time <= COALESCE($3::timestamptz, 'infinity')
                     """,
                 int(node_id),
                 dispatch_time,
@@ -282,6 +427,101 @@ class NodeColdtagPersistence(BasePersistence):
             await asyncio.gather(*[PersistedNodeColdtagEvent.construct_model(self._app, schema) for schema in schemas]),
         )
 
+    async def find_node_events_by_time_ranges(
+        self, ranges: Sequence[tuple[str, datetime, datetime | None]], /
+    ) -> list[list[PersistedNodeColdtagEvent]]:
+        rows_by_range = await self._find_event_rows_by_node_time_ranges(
+            "node_coldtag_event",
+            "node_coldtag_events_by_time_range",
+            [(int(node_id), dispatch_time, completion_time) for node_id, dispatch_time, completion_time in ranges],
+        )
+        return [
+            cast(
+                "list[PersistedNodeColdtagEvent]",
+                await asyncio.gather(
+                    *[
+                        PersistedNodeColdtagEvent.construct_model(self._app, NodeColdtagEventSchema(**row))
+                        for row in rows
+                    ]
+                ),
+            )
+            for rows in rows_by_range
+        ]
+
+    async def find_node_events_page(
+        self, node_id: str | None, /, page: EventPage, a: datetime | None = None, b: datetime | None = None
+    ) -> list[PersistedNodeColdtagEvent]:
+        async def __query(client: PgConnection) -> list[NodeColdtagEventSchema]:
+            rows = await self._fetch_event_page(
+                client,
+                "node_coldtag_event",
+                ("node_coldtag_id", int(node_id)) if node_id is not None else None,
+                page=page,
+                a=a,
+                b=b,
+            )
+            return [NodeColdtagEventSchema(**row) for row in rows]
+
+        schemas = await self._commit(__query)
+        return cast(
+            "list[PersistedNodeColdtagEvent]",
+            await asyncio.gather(*[PersistedNodeColdtagEvent.construct_model(self._app, schema) for schema in schemas]),
+        )
+
+    async def find_node_event_rollups_all_by_time_range(
+        self, /, resolution: int, a: datetime, b: datetime | None = None
+    ) -> list[PersistedNodeColdtagEventRollup]:
+        async def __query(client: PgConnection) -> list[NodeColdtagEventRollupSchema]:
+            rows = await client.fetch(
+                """
+                    SELECT * FROM node_coldtag_event_rollup
+                    WHERE resolution = $1
+                    AND bucket_time > $2 - MAKE_INTERVAL(secs => $1)
+                    AND bucket_time <= COALESCE($3::timestamptz, 'infinity')
+                    ORDER BY bucket_time
+                """,
+                resolution,
+                a,
+                b,
+            )
+            return [NodeColdtagEventRollupSchema(**row) for row in rows]
+
+        schemas = await self._commit(__query)
+        return cast(
+            "list[PersistedNodeColdtagEventRollup]",
+            await asyncio.gather(
+                *[PersistedNodeColdtagEventRollup.construct_model(self._app, schema) for schema in schemas]
+            ),
+        )
+
+    async def find_node_event_rollups_by_time_range(
+        self, node_id: str, /, resolution: int, dispatch_time: datetime, completion_time: datetime | None = None
+    ) -> list[PersistedNodeColdtagEventRollup]:
+        async def __query(client: PgConnection) -> list[NodeColdtagEventRollupSchema]:
+            rows = await client.fetch(
+                """
+                    SELECT * FROM node_coldtag_event_rollup
+                    WHERE node_coldtag_id = $1
+                    AND resolution = $2
+                    AND bucket_time > $3 - MAKE_INTERVAL(secs => $2)
+                    AND bucket_time <= COALESCE($4::timestamptz, 'infinity')
+                    ORDER BY bucket_time
+                """,
+                int(node_id),
+                resolution,
+                dispatch_time,
+                completion_time,
+            )
+            return [NodeColdtagEventRollupSchema(**row) for row in rows]
+
+        schemas = await self._commit(__query)
+        return cast(
+            "list[PersistedNodeColdtagEventRollup]",
+            await asyncio.gather(
+                *[PersistedNodeColdtagEventRollup.construct_model(self._app, schema) for schema in schemas]
+            ),
+        )
+
     async def find_node_event_alert_impacts_by_node_id(
         self, node_id: str, /
     ) -> list[PersistedNodeColdtagEventAlertImpact]:
@@ -293,6 +533,7 @@ class NodeColdtagPersistence(BasePersistence):
                 """
                     SELECT * FROM node_coldtag_event_alert_impact
                     WHERE node_coldtag_id = $1
+                    ORDER BY event_time DESC
                 """,
                 int(node_id),
             )
@@ -311,6 +552,30 @@ class NodeColdtagPersistence(BasePersistence):
             ),
         )
 
+    async def find_node_event_alert_impacts_by_node_ids(
+        self, node_ids: Sequence[str], /
+    ) -> list[list[PersistedNodeColdtagEventAlertImpact]]:
+        rows_by_owner = await self._find_event_rows_by_owner_ids(
+            "node_coldtag_event_alert_impact",
+            "node_coldtag_id",
+            "node_coldtag_event_alert_impacts_by_node_id",
+            [int(node_id) for node_id in node_ids],
+        )
+        return [
+            cast(
+                "list[PersistedNodeColdtagEventAlertImpact]",
+                await asyncio.gather(
+                    *[
+                        PersistedNodeColdtagEventAlertImpact.construct_model(
+                            self._app, NodeColdtagEventAlertImpactSchema(**row)
+                        )
+                        for row in rows_by_owner[int(node_id)]
+                    ]
+                ),
+            )
+            for node_id in node_ids
+        ]
+
     async def find_node_event_alert_impacts_all_by_time_range(
         self, /, a: datetime, b: datetime | None = None
     ) -> list[PersistedNodeColdtagEventAlertImpact]:
@@ -322,7 +587,7 @@ class NodeColdtagPersistence(BasePersistence):
                 """
                     SELECT * FROM node_coldtag_event_alert_impact
                     WHERE event_time >= $1
-                    AND ($2::timestamptz IS NULL OR event_time <= $2)
+                    AND event_time <= COALESCE($2::timestamptz, 'infinity')
                 """,
                 a,
                 b,
@@ -354,7 +619,7 @@ class NodeColdtagPersistence(BasePersistence):
                     SELECT * FROM node_coldtag_event_alert_impact
                     WHERE node_coldtag_id = $1
                     AND event_time >= $2
-                    AND ($3::timestamptz IS NULL OR event_time <= $3)
+                    AND event_time <= COALESCE($3::timestamptz, 'infinity')
                     """,
                 int(node_id),
                 dispatch_time,
@@ -375,6 +640,51 @@ class NodeColdtagPersistence(BasePersistence):
             ),
         )
 
+    async def find_node_event_alert_impacts_by_time_ranges(
+        self, ranges: Sequence[tuple[str, datetime, datetime | None]], /
+    ) -> list[list[PersistedNodeColdtagEventAlertImpact]]:
+        rows_by_range = await self._find_event_rows_by_node_time_ranges(
+            "node_coldtag_event_alert_impact",
+            "node_coldtag_event_alert_impacts_by_time_range",
+            [(int(node_id), dispatch_time, completion_time) for node_id, dispatch_time, completion_time in ranges],
+        )
+        return [
+            cast(
+                "list[PersistedNodeColdtagEventAlertImpact]",
+                await asyncio.gather(
+                    *[
+                        PersistedNodeColdtagEventAlertImpact.construct_model(
+                            self._app, NodeColdtagEventAlertImpactSchema(**row)
+                        )
+                        for row in rows
+                    ]
+                ),
+            )
+            for rows in rows_by_range
+        ]
+
+    async def find_node_event_alert_impacts_page(
+        self, node_id: str | None, /, page: EventPage, a: datetime | None = None, b: datetime | None = None
+    ) -> list[PersistedNodeColdtagEventAlertImpact]:
+        async def __query(client: PgConnection) -> list[NodeColdtagEventAlertImpactSchema]:
+            rows = await self._fetch_event_page(
+                client,
+                "node_coldtag_event_alert_impact",
+                ("node_coldtag_id", int(node_id)) if node_id is not None else None,
+                page=page,
+                a=a,
+                b=b,
+            )
+            return [NodeColdtagEventAlertImpactSchema(**row) for row in rows]
+
+        schemas = await self._commit(__query)
+        return cast(
+            "list[PersistedNodeColdtagEventAlertImpact]",
+            await asyncio.gather(
+                *[PersistedNodeColdtagEventAlertImpact.construct_model(self._app, schema) for schema in schemas]
+            ),
+        )
+
     async def find_node_event_alert_liquids_by_node_id(
         self, node_id: str, /
     ) -> list[PersistedNodeColdtagEventAlertLiquid]:
@@ -386,6 +696,7 @@ class NodeColdtagPersistence(BasePersistence):
                 """
                     SELECT * FROM node_coldtag_event_alert_liquid
                     WHERE node_coldtag_id = $1
+                    ORDER BY event_time DESC
                 """,
                 int(node_id),
             )
@@ -404,6 +715,30 @@ class NodeColdtagPersistence(BasePersistence):
             ),
         )
 
+    async def find_node_event_alert_liquids_by_node_ids(
+        self, node_ids: Sequence[str], /
+    ) -> list[list[PersistedNodeColdtagEventAlertLiquid]]:
+        rows_by_owner = await self._find_event_rows_by_owner_ids(
+            "node_coldtag_event_alert_liquid",
+            "node_coldtag_id",
+            "node_coldtag_event_alert_liquids_by_node_id",
+            [int(node_id) for node_id in node_ids],
+        )
+        return [
+            cast(
+                "list[PersistedNodeColdtagEventAlertLiquid]",
+                await asyncio.gather(
+                    *[
+                        PersistedNodeColdtagEventAlertLiquid.construct_model(
+                            self._app, NodeColdtagEventAlertLiquidSchema(**row)
+                        )
+                        for row in rows_by_owner[int(node_id)]
+                    ]
+                ),
+            )
+            for node_id in node_ids
+        ]
+
     async def find_node_event_alert_liquids_all_by_time_range(
         self, /, a: datetime, b: datetime | None = None
     ) -> list[PersistedNodeColdtagEventAlertLiquid]:
@@ -415,7 +750,7 @@ class NodeColdtagPersistence(BasePersistence):
                 """
                     SELECT * FROM node_coldtag_event_alert_liquid
                     WHERE event_time >= $1
-                    AND ($2::timestamptz IS NULL OR event_time <= $2)
+                    AND event_time <= COALESCE($2::timestamptz, 'infinity')
                 """,
                 a,
                 b,
@@ -447,7 +782,7 @@ class NodeColdtagPersistence(BasePersistence):
                     SELECT * FROM node_coldtag_event_alert_liquid
                     WHERE node_coldtag_id = $1
                     AND event_time >= $2
-                    AND ($3::timestamptz IS NULL OR event_time <= $3)
+                    AND event_time <= COALESCE($3::timestamptz, 'infinity')
                     """,
                 int(node_id),
                 dispatch_time,
@@ -468,8 +803,54 @@ class NodeColdtagPersistence(BasePersistence):
             ),
         )
 
+    async def find_node_event_alert_liquids_by_time_ranges(
+        self, ranges: Sequence[tuple[str, datetime, datetime | None]], /
+    ) -> list[list[PersistedNodeColdtagEventAlertLiquid]]:
+        rows_by_range = await self._find_event_rows_by_node_time_ranges(
+            "node_coldtag_event_alert_liquid",
+            "node_coldtag_event_alert_liquids_by_time_range",
+            [(int(node_id), dispatch_time, completion_time) for node_id, dispatch_time, completion_time in ranges],
+        )
+        return [
+            cast(
+                "list[PersistedNodeColdtagEventAlertLiquid]",
+                await asyncio.gather(
+                    *[
+                        PersistedNodeColdtagEventAlertLiquid.construct_model(
+                            self._app, NodeColdtagEventAlertLiquidSchema(**row)
+                        )
+                        for row in rows
+                    ]
+                ),
+            )
+            for rows in rows_by_range
+        ]
+
+    async def find_node_event_alert_liquids_page(
+        self, node_id: str | None, /, page: EventPage, a: datetime | None = None, b: datetime | None = None
+    ) -> list[PersistedNodeColdtagEventAlertLiquid]:
+        async def __query(client: PgConnection) -> list[NodeColdtagEventAlertLiquidSchema]:
+            rows = await self._fetch_event_page(
+                client,
+                "node_coldtag_event_alert_liquid",
+                ("node_coldtag_id", int(node_id)) if node_id is not None else None,
+                page=page,
+                a=a,
+                b=b,
+            )
+            return [NodeColdtagEventAlertLiquidSchema(**row) for row in rows]
+
+        schemas = await self._commit(__query)
+        return cast(
+            "list[PersistedNodeColdtagEventAlertLiquid]",
+            await asyncio.gather(
+                *[PersistedNodeColdtagEventAlertLiquid.construct_model(self._app, schema) for schema in schemas]
+            ),
+        )
+
     async def create_node(self, *, mac_address: str, identifier: str | None = None) -> PersistedNodeColdtag:
         assert _is_valid_mac_address(mac_address), "Invalid MAC Address."
+        mac_address = normalize_mac_address(mac_address)
 
         async def __query(client: PgConnection) -> NodeColdtagSchema:
             node_id = cast(
@@ -503,6 +884,8 @@ class NodeColdtagPersistence(BasePersistence):
             return NodeColdtagSchema(**row)
 
         schema = await self._commit(__query)
+        self._mac_address_cache.set(schema.mac_address, schema.id)
+
         return await PersistedNodeColdtag.construct_model(self._app, schema)
 
     async def update_node(
@@ -548,6 +931,7 @@ class NodeColdtagPersistence(BasePersistence):
 
         cache_keys = [f"node_coldtag_by_id:{node_id}", f"node_coldtag_by_mac_address:{persisted_node.mac_address}"]
         await self._redis.delete(*cache_keys)
+        self._mac_address_cache.invalidate(persisted_node.mac_address)
 
         updated_persisted_node = await self.find_node_by_id(node_id)
         assert updated_persisted_node is not None
@@ -603,6 +987,46 @@ class NodeColdtagPersistence(BasePersistence):
 
         return await PersistedNodeColdtagEvent.construct_model(self._app, schema)
 
+    async def create_node_events(self, events: Sequence[NodeColdtagEventCreateSchema], /) -> int:
+        if not events:
+            return 0
+
+        async def __query(client: PgConnection) -> int:
+            status = await client.execute(
+                """
+                INSERT INTO node_coldtag_event (
+                    node_coldtag_id,
+                    core_coldtag_id,
+                    temperature,
+                    humidity,
+                    core_coldtag_received_time,
+                    event_time,
+                    latitude,
+                    longitude
+                )
+                SELECT * FROM UNNEST(
+                    $1::int[],
+                    $2::int[],
+                    $3::float8[],
+                    $4::float8[],
+                    $5::timestamptz[],
+                    $6::timestamptz[],
+                    $7::float8[],
+                    $8::float8[]
+                )
+                ON CONFLICT DO NOTHING
+                """,
+                *map(list, zip(*events, strict=True)),
+            )
+            return _count_inserted(status)
+
+        count = await self._commit(__query)
+
+        cache_keys = [f"node_coldtag_events_by_node_id:{node_id}" for node_id in {e.node_coldtag_id for e in events}]
+        await self._redis.delete(*cache_keys)
+
+        return count
+
     async def create_node_event_alert_liquid(
         self,
         node_id: str,
@@ -645,6 +1069,46 @@ class NodeColdtagPersistence(BasePersistence):
 
         return await PersistedNodeColdtagEventAlertLiquid.construct_model(self._app, schema)
 
+    async def create_node_event_alert_liquids(
+        self, events: Sequence[NodeColdtagEventAlertLiquidCreateSchema], /
+    ) -> int:
+        if not events:
+            return 0
+
+        async def __query(client: PgConnection) -> int:
+            status = await client.execute(
+                """
+                INSERT INTO node_coldtag_event_alert_liquid (
+                    node_coldtag_id,
+                    core_coldtag_id,
+                    core_coldtag_received_time,
+                    event_time,
+                    latitude,
+                    longitude
+                )
+                SELECT * FROM UNNEST(
+                    $1::int[],
+                    $2::int[],
+                    $3::timestamptz[],
+                    $4::timestamptz[],
+                    $5::float8[],
+                    $6::float8[]
+                )
+                ON CONFLICT DO NOTHING
+                """,
+                *map(list, zip(*events, strict=True)),
+            )
+            return _count_inserted(status)
+
+        count = await self._commit(__query)
+
+        cache_keys = [
+            f"node_coldtag_event_alert_liquids_by_node_id:{node_id}" for node_id in {e.node_coldtag_id for e in events}
+        ]
+        await self._redis.delete(*cache_keys)
+
+        return count
+
     async def create_node_event_alert_impact(
         self,
         node_id: str,
@@ -686,3 +1150,43 @@ class NodeColdtagPersistence(BasePersistence):
         await self._redis.delete(*cache_keys)
 
         return await PersistedNodeColdtagEventAlertImpact.construct_model(self._app, schema)
+
+    async def create_node_event_alert_impacts(
+        self, events: Sequence[NodeColdtagEventAlertImpactCreateSchema], /
+    ) -> int:
+        if not events:
+            return 0
+
+        async def __query(client: PgConnection) -> int:
+            status = await client.execute(
+                """
+                INSERT INTO node_coldtag_event_alert_impact (
+                    node_coldtag_id,
+                    core_coldtag_id,
+                    core_coldtag_received_time,
+                    event_time,
+                    latitude,
+                    longitude
+                )
+                SELECT * FROM UNNEST(
+                    $1::int[],
+                    $2::int[],
+                    $3::timestamptz[],
+                    $4::timestamptz[],
+                    $5::float8[],
+                    $6::float8[]
+                )
+                ON CONFLICT DO NOTHING
+                """,
+                *map(list, zip(*events, strict=True)),
+            )
+            return _count_inserted(status)
+
+        count = await self._commit(__query)
+
+        cache_keys = [
+            f"node_coldtag_event_alert_impacts_by_node_id:{node_id}" for node_id in {e.node_coldtag_id for e in events}
+        ]
+        await self._redis.delete(*cache_keys)
+
+        return count
@@ -1,56 +1,41 @@
-import asyncio
-from collections.abc import Awaitable
 from datetime import datetime
-from typing import TYPE_CHECKING
 
 from fastapi import FastAPI
 from pydantic import BaseModel, ConfigDict
 
-from src.persistence.core_coldtag import CoreColdtagPersistence, PersistedCoreColdtag
-
 from .schema import (
     NodeColdtagEventAlertImpactSchema,
     NodeColdtagEventAlertLiquidSchema,
+    NodeColdtagEventRollupSchema,
     NodeColdtagEventSchema,
     NodeColdtagSchema,
 )
 
-if TYPE_CHECKING:
-    from src.persistence.node_coldtag import NodeColdtagPersistence
-
 
 class PersistedNodeColdtagEvent(BaseModel):
     model_config = ConfigDict(arbitrary_types_allowed=True)
 
     id: str
-    node_coldtag: Awaitable["PersistedNodeColdtag"]
-    core_coldtag: Awaitable[PersistedCoreColdtag]
+    node_coldtag_id: str
+    core_coldtag_id: str
     temperature: float | None
     humidity: float | None
+    latitude: float | None
+    longitude: float | None
     core_coldtag_received_time: datetime
     event_time: datetime
     time: datetime
 
     @staticmethod
     async def construct_model(app: FastAPI, data: NodeColdtagEventSchema, /) -> "PersistedNodeColdtagEvent":
-        async def __node_coldtag() -> PersistedNodeColdtag:
-            node_coldtag_persistence: NodeColdtagPersistence = app.extra["node_coldtag_persistence"]
-            persisted_node_coldtag = await node_coldtag_persistence.find_node_by_id(str(data.node_coldtag_id))
-            assert persisted_node_coldtag is not None
-            return persisted_node_coldtag
-
-        async def __core_coldtag() -> PersistedCoreColdtag:
-            core_coldtag_persistence: CoreColdtagPersistence = app.extra["core_coldtag_persistence"]
-            persisted_core_coldtag = await core_coldtag_persistence.find_core_by_id(str(data.core_coldtag_id))
-            assert persisted_core_coldtag is not None
-            return persisted_core_coldtag
-
         return PersistedNodeColdtagEvent(
             id=str(data.id),
-            node_coldtag=__node_coldtag(),
-            core_coldtag=asyncio.create_task(__core_coldtag()),
+            node_coldtag_id=str(data.node_coldtag_id),
+            core_coldtag_id=str(data.core_coldtag_id),
             temperature=data.temperature,
             humidity=data.humidity,
+            latitude=data.latitude,
+            longitude=data.longitude,
             core_coldtag_received_time=data.core_coldtag_received_time,
             event_time=data.event_time,
             time=data.time,
@@ -61,8 +46,10 @@ class PersistedNodeColdtagEventAlertLiquid(BaseModel):
     model_config = ConfigDict(arbitrary_types_allowed=True)
 
     id: str
-    node_coldtag: Awaitable["PersistedNodeColdtag"]
-    core_coldtag: Awaitable[PersistedCoreColdtag]
+    node_coldtag_id: str
+    core_coldtag_id: str
+    latitude: float | None
+    longitude: float | None
     core_coldtag_received_time: datetime
     event_time: datetime
     time: datetime
@@ -71,22 +58,12 @@ class PersistedNodeColdtagEventAlertLiquid(BaseModel):
     async def construct_model(
         app: FastAPI, data: NodeColdtagEventAlertLiquidSchema, /
     ) -> "PersistedNodeColdtagEventAlertLiquid":
-        async def __node_coldtag() -> PersistedNodeColdtag:
-            node_coldtag_persistence: NodeColdtagPersistence = app.extra["node_coldtag_persistence"]
-            persisted_node_coldtag = await node_coldtag_persistence.find_node_by_id(str(data.node_coldtag_id))
-            assert persisted_node_coldtag is not None
-            return persisted_node_coldtag
-
-        async def __core_coldtag() -> PersistedCoreColdtag:
-            core_coldtag_persistence: CoreColdtagPersistence = app.extra["core_coldtag_persistence"]
-            persisted_core_coldtag = await core_coldtag_persistence.find_core_by_id(str(data.core_coldtag_id))
-            assert persisted_core_coldtag is not None
-            return persisted_core_coldtag
-
         return PersistedNodeColdtagEventAlertLiquid(
             id=str(data.id),
-            node_coldtag=__node_coldtag(),
-            core_coldtag=asyncio.create_task(__core_coldtag()),
+            node_coldtag_id=str(data.node_coldtag_id),
+            core_coldtag_id=str(data.core_coldtag_id),
+            latitude=data.latitude,
+            longitude=data.longitude,
             core_coldtag_received_time=data.core_coldtag_received_time,
             event_time=data.event_time,
             time=data.time,
@@ -97,8 +74,10 @@ class PersistedNodeColdtagEventAlertImpact(BaseModel):
     model_config = ConfigDict(arbitrary_types_allowed=True)
 
     id: str
-    node_coldtag: Awaitable["PersistedNodeColdtag"]
-    core_coldtag: Awaitable[PersistedCoreColdtag]
+    node_coldtag_id: str
+    core_coldtag_id: str
+    latitude: float | None
+    longitude: float | None
     core_coldtag_received_time: datetime
     event_time: datetime
     time: datetime
@@ -107,65 +86,76 @@ class PersistedNodeColdtagEventAlertImpact(BaseModel):
     async def construct_model(
         app: FastAPI, data: NodeColdtagEventAlertImpactSchema, /
     ) -> "PersistedNodeColdtagEventAlertImpact":
-        async def __node_coldtag() -> PersistedNodeColdtag:
-            node_coldtag_persistence: NodeColdtagPersistence = app.extra["node_coldtag_persistence"]
-            persisted_node_coldtag = await node_coldtag_persistence.find_node_by_id(str(data.node_coldtag_id))
-            assert persisted_node_coldtag is not None
-            return persisted_node_coldtag
-
-        async def __core_coldtag() -> PersistedCoreColdtag:
-            core_coldtag_persistence: CoreColdtagPersistence = app.extra["core_coldtag_persistence"]
-            persisted_core_coldtag = await core_coldtag_persistence.find_core_by_id(str(data.core_coldtag_id))
-            assert persisted_core_coldtag is not None
-            return persisted_core_coldtag
-
         return PersistedNodeColdtagEventAlertImpact(
             id=str(data.id),
-            node_coldtag=__node_coldtag(),
-            core_coldtag=asyncio.create_task(__core_coldtag()),
+            node_coldtag_id=str(data.node_coldtag_id),
+            core_coldtag_id=str(data.core_coldtag_id),
+            latitude=data.latitude,
+            longitude=data.longitude,
             core_coldtag_received_time=data.core_coldtag_received_time,
             event_time=data.event_time,
             time=data.time,
         )
 
 
+class PersistedNodeColdtagEventRollup(BaseModel):
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    node_coldtag_id: str
+    resolution: int
+    bucket_time: datetime
+    count: int
+    temperature_min: float | None
+    temperature_max: float | None
+    temperature_average: float | None
+    temperature_first: float | None
+    temperature_last: float | None
+    humidity_min: float | None
+    humidity_max: float | None
+    humidity_average: float | None
+    humidity_first: float | None
+    humidity_last: float | None
+    first_event_time: datetime
+    last_event_time: datetime
+
+    @staticmethod
+    async def construct_model(app: FastAPI, data: NodeColdtagEventRollupSchema, /) -> "PersistedNodeColdtagEventRollup":
+        return PersistedNodeColdtagEventRollup(
+            node_coldtag_id=str(data.node_coldtag_id),
+            resolution=data.resolution,
+            bucket_time=data.bucket_time,
+            count=data.count,
+            temperature_min=data.temperature_min,
+            temperature_max=data.temperature_max,
+            temperature_average=data.temperature_sum / data.temperature_count if data.temperature_count else None,
+            temperature_first=data.temperature_first,
+            temperature_last=data.temperature_last,
+            humidity_min=data.humidity_min,
+            humidity_max=data.humidity_max,
+            humidity_average=data.humidity_sum / data.humidity_count if data.humidity_count else None,
+            humidity_first=data.humidity_first,
+            humidity_last=data.humidity_last,
+            first_event_time=data.first_event_time,
+            last_event_time=data.last_event_time,
+        )
+
+
 class PersistedNodeColdtag(BaseModel):
     model_config = ConfigDict(arbitrary_types_allowed=True)
 
     id: str
     mac_address: str
     identifier: str | None
-    telemetry_events: Awaitable[list["PersistedNodeColdtagEvent"]]
-    alert_liquid_events: Awaitable[list["PersistedNodeColdtagEventAlertLiquid"]]
-    alert_impact_events: Awaitable[list["PersistedNodeColdtagEventAlertImpact"]]
     deleted: bool
     created_time: datetime
     updated_time: datetime
 
     @staticmethod
     async def construct_model(app: FastAPI, data: NodeColdtagSchema, /) -> "PersistedNodeColdtag":
-        async def __telemetry_events() -> list["PersistedNodeColdtagEvent"]:
-            node_coldtag_persistence: NodeColdtagPersistence = app.extra["node_coldtag_persistence"]
-            events = await node_coldtag_persistence.find_node_events_by_node_id(str(data.id))
-            return sorted(events, key=lambda x: x.event_time, reverse=True)
-
-        async def __alert_liquid_events() -> list["PersistedNodeColdtagEventAlertLiquid"]:
-            node_coldtag_persistence: NodeColdtagPersistence = app.extra["node_coldtag_persistence"]
-            liquids = await node_coldtag_persistence.find_node_event_alert_liquids_by_node_id(str(data.id))
-            return sorted(liquids, key=lambda x: x.event_time, reverse=True)
-
-        async def __alert_impact_events() -> list["PersistedNodeColdtagEventAlertImpact"]:
-            node_coldtag_persistence: NodeColdtagPersistence = app.extra["node_coldtag_persistence"]
-            impacts = await node_coldtag_persistence.find_node_event_alert_impacts_by_node_id(str(data.id))
-            return sorted(impacts, key=lambda x: x.event_time, reverse=True)
-
         return PersistedNodeColdtag(
             id=str(data.id),
             mac_address=data.mac_address,
             identifier=data.identifier,
-            telemetry_events=__telemetry_events(),
-            alert_liquid_events=__alert_liquid_events(),
-            alert_impact_events=__alert_impact_events(),
             deleted=bool(data.deleted),
             created_time=data.created_time,
             updated_time=data.updated_time,
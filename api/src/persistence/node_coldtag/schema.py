@@ -1,4 +1,5 @@
 from datetime import datetime
+from typing import NamedTuple
 
 from pydantic import BaseModel
 
@@ -9,6 +10,8 @@ class NodeColdtagEventSchema(BaseModel):
     core_coldtag_id: int
     temperature: float | None
     humidity: float | None
+    latitude: float | None = None
+    longitude: float | None = None
     core_coldtag_received_time: datetime
     event_time: datetime
     time: datetime
@@ -18,6 +21,8 @@ class NodeColdtagEventAlertLiquidSchema(BaseModel):
     id: int
     node_coldtag_id: int
     core_coldtag_id: int
+    latitude: float | None = None
+    longitude: float | None = None
     core_coldtag_received_time: datetime
     event_time: datetime
     time: datetime
@@ -27,11 +32,34 @@ class NodeColdtagEventAlertImpactSchema(BaseModel):
     id: int
     node_coldtag_id: int
     core_coldtag_id: int
+    latitude: float | None = None
+    longitude: float | None = None
     core_coldtag_received_time: datetime
     event_time: datetime
     time: datetime
 
 
+class NodeColdtagEventRollupSchema(BaseModel):
+    node_coldtag_id: int
+    resolution: int
+    bucket_time: datetime
+    count: int
+    temperature_count: int
+    temperature_sum: float
+    temperature_min: float | None
+    temperature_max: float | None
+    temperature_first: float | None
+    temperature_last: float | None
+    humidity_count: int
+    humidity_sum: float
+    humidity_min: float | None
+    humidity_max: float | None
+    humidity_first: float | None
+    humidity_last: float | None
+    first_event_time: datetime
+    last_event_time: datetime
+
+
 class NodeColdtagSchema(BaseModel):
     id: int
     mac_address: str
@@ -39,3 +67,32 @@ class NodeColdtagSchema(BaseModel):
     deleted: bool | None
     created_time: datetime
     updated_time: datetime
+
+
+class NodeColdtagEventCreateSchema(NamedTuple):
+    node_coldtag_id: int
+    core_coldtag_id: int
+    temperature: float | None
+    humidity: float | None
+    core_coldtag_received_time: datetime
+    event_time: datetime
+    latitude: float | None
+    longitude: float | None
+
+
+class NodeColdtagEventAlertLiquidCreateSchema(NamedTuple):
+    node_coldtag_id: int
+    core_coldtag_id: int
+    core_coldtag_received_time: datetime
+    event_time: datetime
+    latitude: float | None
+    longitude: float | None
+
+
+class NodeColdtagEventAlertImpactCreateSchema(NamedTuple):
+    node_coldtag_id: int
+    core_coldtag_id: int
+    core_coldtag_received_time: datetime
+    event_time: datetime
+    latitude: float | None
+    longitude: float | None
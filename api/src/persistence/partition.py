@@ -0,0 +1,95 @@
+import asyncio
+
+import asyncpg
+from loguru import logger
+
+
+# Keeps monthly event_time partitions created ahead of time and drops those past retention
+class EventPartitionMaintenance:
+    def __init__(
+        self,
+        pool: asyncpg.Pool,
+        /,
+        *,
+        retention_days: dict[str, int],
+        premake_months: int,
+        interval: float,
+    ) -> None:
+        assert all(days >= 0 for days in retention_days.values())
+        assert premake_months >= 0
+        assert interval > 0
+
+        self._pool = pool
+        self._retention_days = retention_days
+        self._premake_months = premake_months
+        self._interval = interval
+
+        self._task: asyncio.Task | None = None
+
+        self._created = 0
+        self._dropped = 0
+        self._failures = 0
+
+    async def _maintain(self, client: asyncpg.Connection, table: str, /) -> None:
+        # Replicas run this concurrently, one table is maintained by one of them at a time
+        await client.execute("SELECT PG_ADVISORY_XACT_LOCK(HASHTEXT($1))", f"event_partition:{table}")
+
+        rows = await client.fetch(
+            """
+                SELECT create_event_partition($1::regclass, m) AS name
+                FROM GENERATE_SERIES(
+                    DATE_TRUNC('month', NOW()),
+                    DATE_TRUNC('month', NOW()) + MAKE_INTERVAL(months => $2),
+                    INTERVAL '1 month'
+                ) m
+            """,
+            table,
+            self._premake_months,
+        )
+        created = [row["name"] for row in rows if row["name"] is not None]
+
+        dropped = []
+        if self._retention_days[table]:
+            rows = await client.fetch(
+                "SELECT drop_event_partitions($1::regclass, MAKE_INTERVAL(days => $2)) AS name",
+                table,
+                self._retention_days[table],
+            )
+            dropped = [row["name"] for row in rows]
+
+        self._created += len(created)
+        self._dropped += len(dropped)
+
+        if created or dropped:
+            logger.info(f"Partitions of {table} created {created} and dropped {dropped}.")
+
+    async def run(self) -> None:
+        for table in self._retention_days:
+            try:
+                async with self._pool.acquire() as client, client.transaction():
+                    await self._maintain(client, table)
+
+            except Exception as err:
+                self._failures += 1
+                logger.warning(f"Partition maintenance of {table} failed: {err!r}")
+
+    def start(self) -> asyncio.Task:
+        async def task() -> None:
+            while True:
+                await self.run()
+                await asyncio.sleep(self._interval)
+
+        self._task = asyncio.create_task(task())
+        return self._task
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def metrics(self) -> dict[str, int]:
+        return {
+            "created": self._created,
+            "dropped": self._dropped,
+            "failures": self._failures,
+        }
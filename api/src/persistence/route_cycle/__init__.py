@@ -1,5 +1,7 @@
 import asyncio
 import re
+from collections.abc import Sequence
+from datetime import datetime
 from typing import cast
 
 from asyncpg import Connection as PgConnection
@@ -7,21 +9,145 @@ from asyncpg import Pool as PgPool
 from asyncpg import Record as PgRecord
 from fastapi import FastAPI, HTTPException, status
 
-from src.persistence import MISSING, BasePersistence, InsertConstructor, MissingType
+from src.persistence import MISSING, BasePersistence, EventPage, InsertConstructor, MissingType
 
 from .model import (
     PersistedRouteCycle,
+    PersistedRouteCycleAlertHumidityEvent,
+    PersistedRouteCycleAlertTemperatureEvent,
 )
 from .schema import (
+    RouteCycleAlertHumidityCreateSchema,
+    RouteCycleAlertHumiditySchema,
+    RouteCycleAlertTemperatureCreateSchema,
+    RouteCycleAlertTemperatureSchema,
     RouteCycleSchema,
+    RouteCycleThresholdSchema,
 )
 
 __all__ = [
     "PersistedRouteCycle",
+    "PersistedRouteCycleAlertHumidityEvent",
+    "PersistedRouteCycleAlertTemperatureEvent",
+    "RouteCycleAlertHumidityCreateSchema",
+    "RouteCycleAlertHumiditySchema",
+    "RouteCycleAlertTemperatureCreateSchema",
+    "RouteCycleAlertTemperatureSchema",
     "RouteCycleSchema",
+    "RouteCycleThresholdSchema",
 ]
 
 
+def _count_inserted(status: str, /) -> int:
+    return int(status.rsplit(" ", 1)[-1])
+
+
+async def _rebuild_route_cycle_alerts(client: PgConnection, route_cycle_id: int, /) -> None:
+    await client.execute(
+        """
+        DELETE FROM route_cycle_alert_temperature
+        WHERE route_cycle_id = $1
+        """,
+        route_cycle_id,
+    )
+    await client.execute(
+        """
+        DELETE FROM route_cycle_alert_humidity
+        WHERE route_cycle_id = $1
+        """,
+        route_cycle_id,
+    )
+    await client.execute(
+        """
+        INSERT INTO route_cycle_alert_temperature (
+            route_cycle_id,
+            node_coldtag_id,
+            core_coldtag_id,
+            temperature,
+            temperature_alert_threshold,
+            latitude,
+            longitude,
+            core_coldtag_received_time,
+            event_time
+        )
+        SELECT
+            rc.id,
+            nce.node_coldtag_id,
+            nce.core_coldtag_id,
+            nce.temperature,
+            rc.temperature_alert_threshold,
+            nce.latitude,
+            nce.longitude,
+            nce.core_coldtag_received_time,
+            nce.event_time
+        FROM route_cycle rc
+        JOIN node_coldtag_event nce ON nce.node_coldtag_id = rc.node_coldtag_id
+        WHERE rc.id = $1
+        AND rc.dispatch_time IS NOT NULL
+        AND rc.temperature_alert_threshold IS NOT NULL
+        AND nce.event_time >= rc.dispatch_time
+        AND nce.event_time <= COALESCE(rc.completion_time, 'infinity')
+        AND nce.temperature >= rc.temperature_alert_threshold
+        ON CONFLICT DO NOTHING
+        """,
+        route_cycle_id,
+    )
+    await client.execute(
+        """
+        INSERT INTO route_cycle_alert_humidity (
+            route_cycle_id,
+            node_coldtag_id,
+            core_coldtag_id,
+            humidity,
+            humidity_alert_threshold,
+            latitude,
+            longitude,
+            core_coldtag_received_time,
+            event_time
+        )
+        SELECT
+            rc.id,
+            nce.node_coldtag_id,
+            nce.core_coldtag_id,
+            nce.humidity,
+            rc.humidity_alert_threshold,
+            nce.latitude,
+            nce.longitude,
+            nce.core_coldtag_received_time,
+            nce.event_time
+        FROM route_cycle rc
+        JOIN node_coldtag_event nce ON nce.node_coldtag_id = rc.node_coldtag_id
+        WHERE rc.id = $1
+        AND rc.dispatch_time IS NOT NULL
+        AND rc.humidity_alert_threshold IS NOT NULL
+        AND nce.event_time >= rc.dispatch_time
+        AND nce.event_time <= COALESCE(rc.completion_time, 'infinity')
+        AND nce.humidity >= rc.humidity_alert_threshold
+        ON CONFLICT DO NOTHING
+        """,
+        route_cycle_id,
+    )
+
+
+async def _fetch_alert_rows_by_route_cycle_ids(
+    client: PgConnection, table: str, route_cycle_ids: list[int], /
+) -> dict[int, list[PgRecord]]:
+    rows = await client.fetch(
+        f"""
+        SELECT * FROM {table}
+        WHERE route_cycle_id = ANY($1::int[])
+        ORDER BY route_cycle_id, event_time
+        """,  # noqa: S608
+        route_cycle_ids,
+    )
+
+    found: dict[int, list[PgRecord]] = {route_cycle_id: [] for route_cycle_id in route_cycle_ids}
+    for row in rows:
+        found[row["route_cycle_id"]].append(row)
+
+    return found
+
+
 def _is_valid_mac_address(address: str, /) -> bool:
     return bool(re.fullmatch(r"^([0-9A-Fa-f]{2}[:-]){5}([0-9A-Fa-f]{2})$", address))
 
@@ -108,6 +234,244 @@ class RouteCyclePersistence(BasePersistence):
 
         return await PersistedRouteCycle.construct_model(self._app, schema)
 
+    async def find_active_route_cycle_thresholds(self) -> list[RouteCycleThresholdSchema]:
+        async def __query(client: PgConnection) -> list[RouteCycleThresholdSchema]:
+            rows = await client.fetch(
+                """
+                    SELECT id, node_coldtag_id, temperature_alert_threshold, humidity_alert_threshold, dispatch_time
+                    FROM route_cycle
+                    WHERE dispatch_time IS NOT NULL
+                    AND completion_time IS NULL
+                    """
+            )
+            return [RouteCycleThresholdSchema(*row) for row in rows]
+
+        return await self._commit(__query)
+
+    async def find_alert_temperature_events_by_route_cycle_id(
+        self, route_cycle_id: str, /
+    ) -> list[PersistedRouteCycleAlertTemperatureEvent]:
+        async def __query(client: PgConnection) -> list[RouteCycleAlertTemperatureSchema]:
+            rows = await client.fetch(
+                """
+                    SELECT * FROM route_cycle_alert_temperature
+                    WHERE route_cycle_id = $1
+                    ORDER BY event_time
+                    """,
+                int(route_cycle_id),
+            )
+            return [RouteCycleAlertTemperatureSchema(**row) for row in rows]
+
+        schemas = await self._commit(__query)
+        return cast(
+            "list[PersistedRouteCycleAlertTemperatureEvent]",
+            await asyncio.gather(
+                *[PersistedRouteCycleAlertTemperatureEvent.construct_model(self._app, schema) for schema in schemas]
+            ),
+        )
+
+    async def find_alert_temperature_events_by_route_cycle_ids(
+        self, route_cycle_ids: Sequence[str], /
+    ) -> list[list[PersistedRouteCycleAlertTemperatureEvent]]:
+        targets = list(dict.fromkeys(int(route_cycle_id) for route_cycle_id in route_cycle_ids))
+
+        async def __query(client: PgConnection) -> dict[int, list[RouteCycleAlertTemperatureSchema]]:
+            found = await _fetch_alert_rows_by_route_cycle_ids(client, "route_cycle_alert_temperature", targets)
+            return {
+                route_cycle_id: [RouteCycleAlertTemperatureSchema(**row) for row in rows]
+                for route_cycle_id, rows in found.items()
+            }
+
+        schemas = await self._commit(__query)
+        return [
+            cast(
+                "list[PersistedRouteCycleAlertTemperatureEvent]",
+                await asyncio.gather(
+                    *[
+                        PersistedRouteCycleAlertTemperatureEvent.construct_model(self._app, schema)
+                        for schema in schemas[int(route_cycle_id)]
+                    ]
+                ),
+            )
+            for route_cycle_id in route_cycle_ids
+        ]
+
+    async def find_alert_temperature_events_page(
+        self, route_cycle_id: str | None, /, page: EventPage, a: datetime | None = None, b: datetime | None = None
+    ) -> list[PersistedRouteCycleAlertTemperatureEvent]:
+        async def __query(client: PgConnection) -> list[RouteCycleAlertTemperatureSchema]:
+            rows = await self._fetch_event_page(
+                client,
+                "route_cycle_alert_temperature",
+                ("route_cycle_id", int(route_cycle_id)) if route_cycle_id is not None else None,
+                page=page,
+                a=a,
+                b=b,
+            )
+            return [RouteCycleAlertTemperatureSchema(**row) for row in rows]
+
+        schemas = await self._commit(__query)
+        return cast(
+            "list[PersistedRouteCycleAlertTemperatureEvent]",
+            await asyncio.gather(
+                *[PersistedRouteCycleAlertTemperatureEvent.construct_model(self._app, schema) for schema in schemas]
+            ),
+        )
+
+    async def find_alert_humidity_events_by_route_cycle_id(
+        self, route_cycle_id: str, /
+    ) -> list[PersistedRouteCycleAlertHumidityEvent]:
+        async def __query(client: PgConnection) -> list[RouteCycleAlertHumiditySchema]:
+            rows = await client.fetch(
+                """
+                    SELECT * FROM route_cycle_alert_humidity
+                    WHERE route_cycle_id = $1
+                    ORDER BY event_time
+                    """,
+                int(route_cycle_id),
+            )
+            return [RouteCycleAlertHumiditySchema(**row) for row in rows]
+
+        schemas = await self._commit(__query)
+        return cast(
+            "list[PersistedRouteCycleAlertHumidityEvent]",
+            await asyncio.gather(
+                *[PersistedRouteCycleAlertHumidityEvent.construct_model(self._app, schema) for schema in schemas]
+            ),
+        )
+
+    async def find_alert_humidity_events_by_route_cycle_ids(
+        self, route_cycle_ids: Sequence[str], /
+    ) -> list[list[PersistedRouteCycleAlertHumidityEvent]]:
+        targets = list(dict.fromkeys(int(route_cycle_id) for route_cycle_id in route_cycle_ids))
+
+        async def __query(client: PgConnection) -> dict[int, list[RouteCycleAlertHumiditySchema]]:
+            found = await _fetch_alert_rows_by_route_cycle_ids(client, "route_cycle_alert_humidity", targets)
+            return {
+                route_cycle_id: [RouteCycleAlertHumiditySchema(**row) for row in rows]
+                for route_cycle_id, rows in found.items()
+            }
+
+        schemas = await self._commit(__query)
+        return [
+            cast(
+                "list[PersistedRouteCycleAlertHumidityEvent]",
+                await asyncio.gather(
+                    *[
+                        PersistedRouteCycleAlertHumidityEvent.construct_model(self._app, schema)
+                        for schema in schemas[int(route_cycle_id)]
+                    ]
+                ),
+            )
+            for route_cycle_id in route_cycle_ids
+        ]
+
+    async def find_alert_humidity_events_page(
+        self, route_cycle_id: str | None, /, page: EventPage, a: datetime | None = None, b: datetime | None = None
+    ) -> list[PersistedRouteCycleAlertHumidityEvent]:
+        async def __query(client: PgConnection) -> list[RouteCycleAlertHumiditySchema]:
+            rows = await self._fetch_event_page(
+                client,
+                "route_cycle_alert_humidity",
+                ("route_cycle_id", int(route_cycle_id)) if route_cycle_id is not None else None,
+                page=page,
+                a=a,
+                b=b,
+            )
+            return [RouteCycleAlertHumiditySchema(**row) for row in rows]
+
+        schemas = await self._commit(__query)
+        return cast(
+            "list[PersistedRouteCycleAlertHumidityEvent]",
+            await asyncio.gather(
+                *[PersistedRouteCycleAlertHumidityEvent.construct_model(self._app, schema) for schema in schemas]
+            ),
+        )
+
+    async def create_route_cycle_alert_temperatures(
+        self, events: Sequence[RouteCycleAlertTemperatureCreateSchema], /
+    ) -> int:
+        if not events:
+            return 0
+
+        async def __query(client: PgConnection) -> int:
+            status = await client.execute(
+                """
+                INSERT INTO route_cycle_alert_temperature (
+                    route_cycle_id,
+                    node_coldtag_id,
+                    core_coldtag_id,
+                    temperature,
+                    temperature_alert_threshold,
+                    latitude,
+                    longitude,
+                    core_coldtag_received_time,
+                    event_time
+                )
+                SELECT * FROM UNNEST(
+                    $1::int[],
+                    $2::int[],
+                    $3::int[],
+                    $4::float8[],
+                    $5::float8[],
+                    $6::float8[],
+                    $7::float8[],
+                    $8::timestamptz[],
+                    $9::timestamptz[]
+                )
+                ON CONFLICT DO NOTHING
+                """,
+                *map(list, zip(*events, strict=True)),
+            )
+            return _count_inserted(status)
+
+        return await self._commit(__query)
+
+    async def create_route_cycle_alert_humidities(
+        self, events: Sequence[RouteCycleAlertHumidityCreateSchema], /
+    ) -> int:
+        if not events:
+            return 0
+
+        async def __query(client: PgConnection) -> int:
+            status = await client.execute(
+                """
+                INSERT INTO route_cycle_alert_humidity (
+                    route_cycle_id,
+                    node_coldtag_id,
+                    core_coldtag_id,
+                    humidity,
+                    humidity_alert_threshold,
+                    latitude,
+                    longitude,
+                    core_coldtag_received_time,
+                    event_time
+                )
+                SELECT * FROM UNNEST(
+                    $1::int[],
+                    $2::int[],
+                    $3::int[],
+                    $4::float8[],
+                    $5::float8[],
+                    $6::float8[],
+                    $7::float8[],
+                    $8::timestamptz[],
+                    $9::timestamptz[]
+                )
+                ON CONFLICT DO NOTHING
+                """,
+                *map(list, zip(*events, strict=True)),
+            )
+            return _count_inserted(status)
+
+        return await self._commit(__query)
+
+    async def rebuild_route_cycle_alerts(self, route_cycle_id: str, /) -> None:
+        async def __query(client: PgConnection) -> None:
+            await _rebuild_route_cycle_alerts(client, int(route_cycle_id))
+
+        await self._commit(__query)
+
     async def create_route_cycle(
         self,
         *,
@@ -271,6 +635,16 @@ class RouteCyclePersistence(BasePersistence):
                 *sql.values,
             )
 
+            # Excursions depend on the thresholds and on the dispatch and completion time
+            if (
+                temperature_alert_threshold is not MISSING
+                or humidity_alert_threshold is not MISSING
+                or started is not MISSING
+                or completed is not MISSING
+                or canceled is not MISSING
+            ):
+                await _rebuild_route_cycle_alerts(client, int(route_cycle_id))
+
         await self._commit(__query)
         updated_route_cycle = await self.find_route_cycle_by_id(route_cycle_id)
         assert updated_route_cycle is not None
@@ -1,20 +1,11 @@
-import asyncio
-from collections.abc import Awaitable
 from datetime import datetime
 
-from fastapi import FastAPI, HTTPException, status
+from fastapi import FastAPI
 from pydantic import BaseModel, ConfigDict
 
-from src.persistence.core_coldtag import PersistedCoreColdtag
-from src.persistence.node_coldtag import (
-    NodeColdtagPersistence,
-    PersistedNodeColdtag,
-    PersistedNodeColdtagEvent,
-    PersistedNodeColdtagEventAlertImpact,
-    PersistedNodeColdtagEventAlertLiquid,
-)
-
 from .schema import (
+    RouteCycleAlertHumiditySchema,
+    RouteCycleAlertTemperatureSchema,
     RouteCycleSchema,
 )
 
@@ -23,23 +14,28 @@ class PersistedRouteCycleAlertTemperatureEvent(BaseModel):
     model_config = ConfigDict(arbitrary_types_allowed=True)
 
     id: str
-    node_coldtag: Awaitable["PersistedNodeColdtag"]
-    core_coldtag: Awaitable[PersistedCoreColdtag]
+    node_coldtag_id: str
+    core_coldtag_id: str
     temperature: float
+    temperature_alert_threshold: float
+    latitude: float | None
+    longitude: float | None
     core_coldtag_received_time: datetime
     event_time: datetime
     time: datetime
 
     @staticmethod
     async def construct_model(
-        app: FastAPI, data: PersistedNodeColdtagEvent, /
+        app: FastAPI, data: RouteCycleAlertTemperatureSchema, /
     ) -> "PersistedRouteCycleAlertTemperatureEvent":
-        assert data.temperature is not None
         return PersistedRouteCycleAlertTemperatureEvent(
-            id=data.id,
-            node_coldtag=data.node_coldtag,
-            core_coldtag=data.core_coldtag,
+            id=str(data.id),
+            node_coldtag_id=str(data.node_coldtag_id),
+            core_coldtag_id=str(data.core_coldtag_id),
             temperature=data.temperature,
+            temperature_alert_threshold=data.temperature_alert_threshold,
+            latitude=data.latitude,
+            longitude=data.longitude,
             core_coldtag_received_time=data.core_coldtag_received_time,
             event_time=data.event_time,
             time=data.time,
@@ -50,23 +46,28 @@ class PersistedRouteCycleAlertHumidityEvent(BaseModel):
     model_config = ConfigDict(arbitrary_types_allowed=True)
 
     id: str
-    node_coldtag: Awaitable["PersistedNodeColdtag"]
-    core_coldtag: Awaitable[PersistedCoreColdtag]
+    node_coldtag_id: str
+    core_coldtag_id: str
     humidity: float
+    humidity_alert_threshold: float
+    latitude: float | None
+    longitude: float | None
     core_coldtag_received_time: datetime
     event_time: datetime
     time: datetime
 
     @staticmethod
     async def construct_model(
-        app: FastAPI, data: PersistedNodeColdtagEvent, /
+        app: FastAPI, data: RouteCycleAlertHumiditySchema, /
     ) -> "PersistedRouteCycleAlertHumidityEvent":
-        assert data.humidity is not None
         return PersistedRouteCycleAlertHumidityEvent(
-            id=data.id,
-            node_coldtag=data.node_coldtag,
-            core_coldtag=data.core_coldtag,
+            id=str(data.id),
+            node_coldtag_id=str(data.node_coldtag_id),
+            core_coldtag_id=str(data.core_coldtag_id),
             humidity=data.humidity,
+            humidity_alert_threshold=data.humidity_alert_threshold,
+            latitude=data.latitude,
+            longitude=data.longitude,
             core_coldtag_received_time=data.core_coldtag_received_time,
             event_time=data.event_time,
             time=data.time,
@@ -77,7 +78,7 @@ class PersistedRouteCycle(BaseModel):
     model_config = ConfigDict(arbitrary_types_allowed=True)
 
     id: str
-    node_coldtag: Awaitable[PersistedNodeColdtag]
+    node_coldtag_id: str
     identifier: str | None
     description: str | None
     owner_name: str | None
@@ -93,80 +94,14 @@ class PersistedRouteCycle(BaseModel):
     canceled: bool
     dispatch_time: datetime | None
     completion_time: datetime | None
-    telemetry_events: Awaitable[list[PersistedNodeColdtagEvent]]
-    alert_liquid_events: Awaitable[list[PersistedNodeColdtagEventAlertLiquid]]
-    alert_impact_events: Awaitable[list[PersistedNodeColdtagEventAlertImpact]]
-    alert_temperature_events: Awaitable[list[PersistedRouteCycleAlertTemperatureEvent]]
-    alert_humidity_events: Awaitable[list[PersistedRouteCycleAlertHumidityEvent]]
     created_time: datetime
     updated_time: datetime
 
     @staticmethod
     async def construct_model(app: FastAPI, data: RouteCycleSchema, /) -> "PersistedRouteCycle":
-        async def __node_coldtag() -> PersistedNodeColdtag:
-            node_coldtag_persistence: NodeColdtagPersistence = app.extra["node_coldtag_persistence"]
-            persisted_node = await node_coldtag_persistence.find_node_by_id(str(data.node_coldtag_id))
-            if not persisted_node:
-                raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
-
-            return persisted_node
-
-        async def __telemetry_events() -> list[PersistedNodeColdtagEvent]:
-            node_coldtag_persistence: NodeColdtagPersistence = app.extra["node_coldtag_persistence"]
-            if data.dispatch_time is None:
-                raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST)
-
-            return await node_coldtag_persistence.find_node_events_by_time_range(
-                str(data.node_coldtag_id), dispatch_time=data.dispatch_time, completion_time=data.completion_time
-            )
-
-        async def __alert_liquid_events() -> list[PersistedNodeColdtagEventAlertLiquid]:
-            node_coldtag_persistence: NodeColdtagPersistence = app.extra["node_coldtag_persistence"]
-            if data.dispatch_time is None:
-                raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST)
-
-            return await node_coldtag_persistence.find_node_event_alert_liquids_by_time_range(
-                str(data.node_coldtag_id), dispatch_time=data.dispatch_time, completion_time=data.completion_time
-            )
-
-        async def __alert_impact_events() -> list[PersistedNodeColdtagEventAlertImpact]:
-            node_coldtag_persistence: NodeColdtagPersistence = app.extra["node_coldtag_persistence"]
-            if data.dispatch_time is None:
-                raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST)
-
-            return await node_coldtag_persistence.find_node_event_alert_impacts_by_time_range(
-                str(data.node_coldtag_id), dispatch_time=data.dispatch_time, completion_time=data.completion_time
-            )
-
-        async def __alert_temperature_events() -> list[PersistedRouteCycleAlertTemperatureEvent]:
-            if data.temperature_alert_threshold is None:
-                return []
-
-            events = await __telemetry_events()
-            return await asyncio.gather(
-                *[
-                    PersistedRouteCycleAlertTemperatureEvent.construct_model(app, event)
-                    for event in events
-                    if event.temperature is not None and event.temperature >= data.temperature_alert_threshold
-                ]
-            )
-
-        async def __alert_humidity_events() -> list[PersistedRouteCycleAlertHumidityEvent]:
-            if data.humidity_alert_threshold is None:
-                return []
-
-            events = await __telemetry_events()
-            return await asyncio.gather(
-                *[
-                    PersistedRouteCycleAlertHumidityEvent.construct_model(app, event)
-                    for event in events
-                    if event.humidity is not None and event.humidity >= data.humidity_alert_threshold
-                ]
-            )
-
         return PersistedRouteCycle(
             id=str(data.id),
-            node_coldtag=__node_coldtag(),
+            node_coldtag_id=str(data.node_coldtag_id),
             identifier=data.identifier,
             description=data.description,
             owner_name=data.owner_name,
@@ -182,11 +117,6 @@ class PersistedRouteCycle(BaseModel):
             canceled=bool(data.canceled),
             dispatch_time=data.dispatch_time,
             completion_time=data.completion_time,
-            telemetry_events=__telemetry_events(),
-            alert_liquid_events=__alert_liquid_events(),
-            alert_impact_events=__alert_impact_events(),
-            alert_temperature_events=__alert_temperature_events(),
-            alert_humidity_events=__alert_humidity_events(),
             created_time=data.created_time,
             updated_time=data.updated_time,
         )
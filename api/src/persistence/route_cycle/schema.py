@@ -1,4 +1,5 @@
 from datetime import datetime
+from typing import NamedTuple
 
 from pydantic import BaseModel
 
@@ -23,3 +24,63 @@ class RouteCycleSchema(BaseModel):
     completion_time: datetime | None
     created_time: datetime
     updated_time: datetime
+
+
+class RouteCycleAlertTemperatureSchema(BaseModel):
+    id: int
+    route_cycle_id: int
+    node_coldtag_id: int
+    core_coldtag_id: int
+    temperature: float
+    temperature_alert_threshold: float
+    latitude: float | None
+    longitude: float | None
+    core_coldtag_received_time: datetime
+    event_time: datetime
+    time: datetime
+
+
+class RouteCycleAlertHumiditySchema(BaseModel):
+    id: int
+    route_cycle_id: int
+    node_coldtag_id: int
+    core_coldtag_id: int
+    humidity: float
+    humidity_alert_threshold: float
+    latitude: float | None
+    longitude: float | None
+    core_coldtag_received_time: datetime
+    event_time: datetime
+    time: datetime
+
+
+class RouteCycleThresholdSchema(NamedTuple):
+    route_cycle_id: int
+    node_coldtag_id: int
+    temperature_alert_threshold: float | None
+    humidity_alert_threshold: float | None
+    dispatch_time: datetime
+
+
+class RouteCycleAlertTemperatureCreateSchema(NamedTuple):
+    route_cycle_id: int
+    node_coldtag_id: int
+    core_coldtag_id: int
+    temperature: float
+    temperature_alert_threshold: float
+    latitude: float | None
+    longitude: float | None
+    core_coldtag_received_time: datetime
+    event_time: datetime
+
+
+class RouteCycleAlertHumidityCreateSchema(NamedTuple):
+    route_cycle_id: int
+    node_coldtag_id: int
+    core_coldtag_id: int
+    humidity: float
+    humidity_alert_threshold: float
+    latitude: float | None
+    longitude: float | None
+    core_coldtag_received_time: datetime
+    event_time: datetime
@@ -36,7 +36,7 @@ CREATE TABLE "update_node_coldtag" (
 
 ALTER TABLE "update_node_coldtag" ENABLE ROW LEVEL SECURITY;
 
-CREATE VIEW "core_coldtag" AS (
+CREATE VIEW "core_coldtag_derived" AS (
   SELECT
     CNC.ID,
     CNC.MAC_ADDRESS,
@@ -90,7 +90,7 @@ CREATE VIEW "core_coldtag" AS (
     "create_core_coldtag" CNC
 );
 
-CREATE VIEW "node_coldtag" AS (
+CREATE VIEW "node_coldtag_derived" AS (
   SELECT
     CNC.ID,
     CNC.MAC_ADDRESS,
@@ -1,45 +1,156 @@
+CREATE FUNCTION "create_event_partition" ("parent" REGCLASS, "month" TIMESTAMPTZ) RETURNS TEXT LANGUAGE PLPGSQL AS $$
+DECLARE
+  lower_bound TIMESTAMPTZ := DATE_TRUNC('month', "month" AT TIME ZONE 'UTC') AT TIME ZONE 'UTC';
+  upper_bound TIMESTAMPTZ := lower_bound + INTERVAL '1 month';
+  parent_name TEXT := (SELECT RELNAME FROM PG_CLASS WHERE OID = "parent");
+  partition_name TEXT := parent_name || '_p' || TO_CHAR(lower_bound AT TIME ZONE 'UTC', 'YYYYMM');
+BEGIN
+  IF TO_REGCLASS(FORMAT('public.%I', partition_name)) IS NOT NULL THEN
+    RETURN NULL;
+  END IF;
+
+  -- Rows of the month that already landed in the default partition are moved over first,
+  -- attaching would otherwise fail on the default partition constraint
+  EXECUTE FORMAT('CREATE TABLE public.%I (LIKE public.%I INCLUDING DEFAULTS)', partition_name, parent_name);
+  EXECUTE FORMAT(
+    'WITH moved AS (DELETE FROM public.%I WHERE event_time >= $1 AND event_time < $2 RETURNING *) INSERT INTO public.%I SELECT * FROM moved',
+    parent_name || '_default',
+    partition_name
+  ) USING lower_bound, upper_bound;
+  EXECUTE FORMAT(
+    'ALTER TABLE public.%I ATTACH PARTITION public.%I FOR VALUES FROM (%L) TO (%L)',
+    parent_name,
+    partition_name,
+    lower_bound,
+    upper_bound
+  );
+  EXECUTE FORMAT('ALTER TABLE public.%I ENABLE ROW LEVEL SECURITY', partition_name);
+
+  RETURN partition_name;
+END;
+$$;
+
+CREATE FUNCTION "drop_event_partitions" ("parent" REGCLASS, "retention" INTERVAL) RETURNS SETOF TEXT LANGUAGE PLPGSQL AS $$
+DECLARE
+  partition_name TEXT;
+BEGIN
+  FOR partition_name IN
+    SELECT
+      C.RELNAME
+    FROM
+      PG_INHERITS I
+      JOIN PG_CLASS C ON C.OID = I.INHRELID
+    WHERE
+      I.INHPARENT = "parent"
+      AND C.RELNAME ~ '_p[0-9]{6}$'
+      AND TO_DATE(RIGHT(C.RELNAME, 6), 'YYYYMM')::TIMESTAMP AT TIME ZONE 'UTC' + INTERVAL '1 month' <= NOW() - "retention"
+    ORDER BY
+      C.RELNAME
+  LOOP
+    EXECUTE FORMAT('ALTER TABLE %s DETACH PARTITION public.%I', "parent", partition_name);
+    EXECUTE FORMAT('DROP TABLE public.%I', partition_name);
+    RETURN NEXT partition_name;
+  END LOOP;
+END;
+$$;
+
 CREATE TABLE "core_coldtag_event" (
-  "id" SERIAL PRIMARY KEY,
+  "id" SERIAL,
   "core_coldtag_id" INT NOT NULL REFERENCES "create_core_coldtag" (ID),
   "latitude" DOUBLE PRECISION,
   "longitude" DOUBLE PRECISION,
   "event_time" TIMESTAMPTZ NOT NULL,
-  "time" TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP
-);
+  "time" TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP,
+  PRIMARY KEY ("id", "event_time"),
+  UNIQUE ("core_coldtag_id", "event_time")
+)
+PARTITION BY
+  RANGE ("event_time");
 
 ALTER TABLE "core_coldtag_event" ENABLE ROW LEVEL SECURITY;
 
+CREATE TABLE "core_coldtag_event_default" PARTITION OF "core_coldtag_event" DEFAULT;
+
+ALTER TABLE "core_coldtag_event_default" ENABLE ROW LEVEL SECURITY;
+
 CREATE TABLE "node_coldtag_event" (
-  "id" SERIAL PRIMARY KEY,
+  "id" SERIAL,
   "node_coldtag_id" INT NOT NULL REFERENCES "create_node_coldtag" (ID),
   "core_coldtag_id" INT NOT NULL REFERENCES "create_core_coldtag" (ID),
   "temperature" DOUBLE PRECISION,
   "humidity" DOUBLE PRECISION,
   "core_coldtag_received_time" TIMESTAMPTZ NOT NULL,
   "event_time" TIMESTAMPTZ NOT NULL,
-  "time" TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP
-);
+  "latitude" DOUBLE PRECISION,
+  "longitude" DOUBLE PRECISION,
+  "time" TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP,
+  PRIMARY KEY ("id", "event_time"),
+  UNIQUE ("node_coldtag_id", "event_time")
+)
+PARTITION BY
+  RANGE ("event_time");
 
 ALTER TABLE "node_coldtag_event" ENABLE ROW LEVEL SECURITY;
 
+CREATE TABLE "node_coldtag_event_default" PARTITION OF "node_coldtag_event" DEFAULT;
+
+ALTER TABLE "node_coldtag_event_default" ENABLE ROW LEVEL SECURITY;
+
 CREATE TABLE "node_coldtag_event_alert_liquid" (
-  "id" SERIAL PRIMARY KEY,
+  "id" SERIAL,
   "node_coldtag_id" INT NOT NULL REFERENCES "create_node_coldtag" (ID),
   "core_coldtag_id" INT NOT NULL REFERENCES "create_core_coldtag" (ID),
   "core_coldtag_received_time" TIMESTAMPTZ NOT NULL,
   "event_time" TIMESTAMPTZ NOT NULL,
-  "time" TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP
-);
+  "latitude" DOUBLE PRECISION,
+  "longitude" DOUBLE PRECISION,
+  "time" TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP,
+  PRIMARY KEY ("id", "event_time"),
+  UNIQUE ("node_coldtag_id", "event_time")
+)
+PARTITION BY
+  RANGE ("event_time");
 
 ALTER TABLE "node_coldtag_event_alert_liquid" ENABLE ROW LEVEL SECURITY;
 
+CREATE TABLE "node_coldtag_event_alert_liquid_default" PARTITION OF "node_coldtag_event_alert_liquid" DEFAULT;
+
+ALTER TABLE "node_coldtag_event_alert_liquid_default" ENABLE ROW LEVEL SECURITY;
+
 CREATE TABLE "node_coldtag_event_alert_impact" (
-  "id" SERIAL PRIMARY KEY,
+  "id" SERIAL,
   "node_coldtag_id" INT NOT NULL REFERENCES "create_node_coldtag" (ID),
   "core_coldtag_id" INT NOT NULL REFERENCES "create_core_coldtag" (ID),
   "core_coldtag_received_time" TIMESTAMPTZ NOT NULL,
   "event_time" TIMESTAMPTZ NOT NULL,
-  "time" TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP
-);
+  "latitude" DOUBLE PRECISION,
+  "longitude" DOUBLE PRECISION,
+  "time" TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP,
+  PRIMARY KEY ("id", "event_time"),
+  UNIQUE ("node_coldtag_id", "event_time")
+)
+PARTITION BY
+  RANGE ("event_time");
 
 ALTER TABLE "node_coldtag_event_alert_impact" ENABLE ROW LEVEL SECURITY;
+
+CREATE TABLE "node_coldtag_event_alert_impact_default" PARTITION OF "node_coldtag_event_alert_impact" DEFAULT;
+
+ALTER TABLE "node_coldtag_event_alert_impact_default" ENABLE ROW LEVEL SECURITY;
+
+CREATE INDEX "core_coldtag_event_event_time_brin_idx" ON "core_coldtag_event" USING BRIN ("event_time");
+
+CREATE INDEX "node_coldtag_event_event_time_brin_idx" ON "node_coldtag_event" USING BRIN ("event_time");
+
+CREATE INDEX "node_coldtag_event_alert_liquid_event_time_brin_idx" ON "node_coldtag_event_alert_liquid" USING BRIN ("event_time");
+
+CREATE INDEX "node_coldtag_event_alert_impact_event_time_brin_idx" ON "node_coldtag_event_alert_impact" USING BRIN ("event_time");
+
+-- Fleet-wide connections page on (event_time, id) without an owner filter, BRIN cannot return rows in that order
+CREATE INDEX "core_coldtag_event_event_time_id_idx" ON "core_coldtag_event" ("event_time", "id");
+
+CREATE INDEX "node_coldtag_event_event_time_id_idx" ON "node_coldtag_event" ("event_time", "id");
+
+CREATE INDEX "node_coldtag_event_alert_liquid_event_time_id_idx" ON "node_coldtag_event_alert_liquid" ("event_time", "id");
+
+CREATE INDEX "node_coldtag_event_alert_impact_event_time_id_idx" ON "node_coldtag_event_alert_impact" ("event_time", "id");
@@ -37,7 +37,7 @@ CREATE TABLE "update_route_cycle" (
 
 ALTER TABLE "update_route_cycle" ENABLE ROW LEVEL SECURITY;
 
-CREATE VIEW "route_cycle" AS (
+CREATE VIEW "route_cycle_derived" AS (
   SELECT
     CRC.ID,
     CRC.NODE_COLDTAG_ID,
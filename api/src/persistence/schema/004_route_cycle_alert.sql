@@ -0,0 +1,51 @@
+CREATE TABLE "route_cycle_alert_temperature" (
+  "id" SERIAL,
+  "route_cycle_id" INT NOT NULL REFERENCES "create_route_cycle" (ID),
+  "node_coldtag_id" INT NOT NULL REFERENCES "create_node_coldtag" (ID),
+  "core_coldtag_id" INT NOT NULL REFERENCES "create_core_coldtag" (ID),
+  "temperature" DOUBLE PRECISION NOT NULL,
+  "temperature_alert_threshold" DOUBLE PRECISION NOT NULL,
+  "latitude" DOUBLE PRECISION,
+  "longitude" DOUBLE PRECISION,
+  "core_coldtag_received_time" TIMESTAMPTZ NOT NULL,
+  "event_time" TIMESTAMPTZ NOT NULL,
+  "time" TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP,
+  PRIMARY KEY ("id", "event_time"),
+  UNIQUE ("route_cycle_id", "event_time")
+)
+PARTITION BY
+  RANGE ("event_time");
+
+ALTER TABLE "route_cycle_alert_temperature" ENABLE ROW LEVEL SECURITY;
+
+CREATE TABLE "route_cycle_alert_temperature_default" PARTITION OF "route_cycle_alert_temperature" DEFAULT;
+
+ALTER TABLE "route_cycle_alert_temperature_default" ENABLE ROW LEVEL SECURITY;
+
+CREATE TABLE "route_cycle_alert_humidity" (
+  "id" SERIAL,
+  "route_cycle_id" INT NOT NULL REFERENCES "create_route_cycle" (ID),
+  "node_coldtag_id" INT NOT NULL REFERENCES "create_node_coldtag" (ID),
+  "core_coldtag_id" INT NOT NULL REFERENCES "create_core_coldtag" (ID),
+  "humidity" DOUBLE PRECISION NOT NULL,
+  "humidity_alert_threshold" DOUBLE PRECISION NOT NULL,
+  "latitude" DOUBLE PRECISION,
+  "longitude" DOUBLE PRECISION,
+  "core_coldtag_received_time" TIMESTAMPTZ NOT NULL,
+  "event_time" TIMESTAMPTZ NOT NULL,
+  "time" TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP,
+  PRIMARY KEY ("id", "event_time"),
+  UNIQUE ("route_cycle_id", "event_time")
+)
+PARTITION BY
+  RANGE ("event_time");
+
+ALTER TABLE "route_cycle_alert_humidity" ENABLE ROW LEVEL SECURITY;
+
+CREATE TABLE "route_cycle_alert_humidity_default" PARTITION OF "route_cycle_alert_humidity" DEFAULT;
+
+ALTER TABLE "route_cycle_alert_humidity_default" ENABLE ROW LEVEL SECURITY;
+
+CREATE INDEX "route_cycle_alert_temperature_event_time_brin_idx" ON "route_cycle_alert_temperature" USING BRIN ("event_time");
+
+CREATE INDEX "route_cycle_alert_humidity_event_time_brin_idx" ON "route_cycle_alert_humidity" USING BRIN ("event_time");
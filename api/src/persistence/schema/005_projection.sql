@@ -0,0 +1,175 @@
+CREATE INDEX "update_core_coldtag_core_coldtag_id_time_idx" ON "update_core_coldtag" ("core_coldtag_id", "time" DESC);
+
+CREATE INDEX "update_node_coldtag_node_coldtag_id_time_idx" ON "update_node_coldtag" ("node_coldtag_id", "time" DESC);
+
+CREATE INDEX "update_route_cycle_route_cycle_id_time_idx" ON "update_route_cycle" ("route_cycle_id", "time" DESC);
+
+CREATE TABLE "core_coldtag_projection" (
+  "id" INT PRIMARY KEY REFERENCES "create_core_coldtag" (ID),
+  "mac_address" TEXT UNIQUE NOT NULL,
+  "identifier" TEXT,
+  "deleted" BOOLEAN,
+  "created_time" TIMESTAMPTZ NOT NULL,
+  "updated_time" TIMESTAMPTZ NOT NULL
+);
+
+ALTER TABLE "core_coldtag_projection" ENABLE ROW LEVEL SECURITY;
+
+CREATE TABLE "node_coldtag_projection" (
+  "id" INT PRIMARY KEY REFERENCES "create_node_coldtag" (ID),
+  "mac_address" TEXT UNIQUE NOT NULL,
+  "identifier" TEXT,
+  "deleted" BOOLEAN,
+  "created_time" TIMESTAMPTZ NOT NULL,
+  "updated_time" TIMESTAMPTZ NOT NULL
+);
+
+ALTER TABLE "node_coldtag_projection" ENABLE ROW LEVEL SECURITY;
+
+CREATE TABLE "route_cycle_projection" (
+  "id" INT PRIMARY KEY REFERENCES "create_route_cycle" (ID),
+  "node_coldtag_id" INT NOT NULL REFERENCES "create_node_coldtag" (ID),
+  "identifier" TEXT,
+  "description" TEXT,
+  "owner_name" TEXT,
+  "placed_at" TEXT,
+  "departure_latitude" DOUBLE PRECISION,
+  "departure_longitude" DOUBLE PRECISION,
+  "destination_latitude" DOUBLE PRECISION,
+  "destination_longitude" DOUBLE PRECISION,
+  "temperature_alert_threshold" DOUBLE PRECISION,
+  "humidity_alert_threshold" DOUBLE PRECISION,
+  "started" BOOLEAN,
+  "completed" BOOLEAN,
+  "dispatch_time" TIMESTAMPTZ,
+  "completion_time" TIMESTAMPTZ,
+  "canceled" BOOLEAN,
+  "created_time" TIMESTAMPTZ NOT NULL,
+  "updated_time" TIMESTAMPTZ NOT NULL
+);
+
+ALTER TABLE "route_cycle_projection" ENABLE ROW LEVEL SECURITY;
+
+CREATE INDEX "route_cycle_projection_node_coldtag_id_idx" ON "route_cycle_projection" ("node_coldtag_id", "id" DESC);
+
+CREATE INDEX "route_cycle_projection_active_idx" ON "route_cycle_projection" ("node_coldtag_id")
+WHERE
+  "dispatch_time" IS NOT NULL
+  AND "completion_time" IS NULL;
+
+-- Each projection row is derived again from the create and update history of its entity
+-- whenever that history grows, the row lock serializes concurrent updates of one entity
+CREATE FUNCTION "refresh_core_coldtag_projection"() RETURNS TRIGGER LANGUAGE PLPGSQL AS $$
+DECLARE
+  target INT := (TO_JSONB(NEW) ->> TG_ARGV[0])::INT;
+BEGIN
+  PERFORM 1 FROM "create_core_coldtag" WHERE ID = target FOR UPDATE;
+
+  INSERT INTO "core_coldtag_projection"
+  SELECT * FROM "core_coldtag_derived" WHERE ID = target
+  ON CONFLICT (ID) DO UPDATE SET
+    MAC_ADDRESS = EXCLUDED.MAC_ADDRESS,
+    IDENTIFIER = EXCLUDED.IDENTIFIER,
+    DELETED = EXCLUDED.DELETED,
+    CREATED_TIME = EXCLUDED.CREATED_TIME,
+    UPDATED_TIME = EXCLUDED.UPDATED_TIME;
+
+  RETURN NULL;
+END;
+$$;
+
+CREATE FUNCTION "refresh_node_coldtag_projection"() RETURNS TRIGGER LANGUAGE PLPGSQL AS $$
+DECLARE
+  target INT := (TO_JSONB(NEW) ->> TG_ARGV[0])::INT;
+BEGIN
+  PERFORM 1 FROM "create_node_coldtag" WHERE ID = target FOR UPDATE;
+
+  INSERT INTO "node_coldtag_projection"
+  SELECT * FROM "node_coldtag_derived" WHERE ID = target
+  ON CONFLICT (ID) DO UPDATE SET
+    MAC_ADDRESS = EXCLUDED.MAC_ADDRESS,
+    IDENTIFIER = EXCLUDED.IDENTIFIER,
+    DELETED = EXCLUDED.DELETED,
+    CREATED_TIME = EXCLUDED.CREATED_TIME,
+    UPDATED_TIME = EXCLUDED.UPDATED_TIME;
+
+  RETURN NULL;
+END;
+$$;
+
+CREATE FUNCTION "refresh_route_cycle_projection"() RETURNS TRIGGER LANGUAGE PLPGSQL AS $$
+DECLARE
+  target INT := (TO_JSONB(NEW) ->> TG_ARGV[0])::INT;
+BEGIN
+  PERFORM 1 FROM "create_route_cycle" WHERE ID = target FOR UPDATE;
+
+  INSERT INTO "route_cycle_projection"
+  SELECT * FROM "route_cycle_derived" WHERE ID = target
+  ON CONFLICT (ID) DO UPDATE SET
+    NODE_COLDTAG_ID = EXCLUDED.NODE_COLDTAG_ID,
+    IDENTIFIER = EXCLUDED.IDENTIFIER,
+    DESCRIPTION = EXCLUDED.DESCRIPTION,
+    OWNER_NAME = EXCLUDED.OWNER_NAME,
+    PLACED_AT = EXCLUDED.PLACED_AT,
+    DEPARTURE_LATITUDE = EXCLUDED.DEPARTURE_LATITUDE,
+    DEPARTURE_LONGITUDE = EXCLUDED.DEPARTURE_LONGITUDE,
+    DESTINATION_LATITUDE = EXCLUDED.DESTINATION_LATITUDE,
+    DESTINATION_LONGITUDE = EXCLUDED.DESTINATION_LONGITUDE,
+    TEMPERATURE_ALERT_THRESHOLD = EXCLUDED.TEMPERATURE_ALERT_THRESHOLD,
+    HUMIDITY_ALERT_THRESHOLD = EXCLUDED.HUMIDITY_ALERT_THRESHOLD,
+    STARTED = EXCLUDED.STARTED,
+    COMPLETED = EXCLUDED.COMPLETED,
+    DISPATCH_TIME = EXCLUDED.DISPATCH_TIME,
+    COMPLETION_TIME = EXCLUDED.COMPLETION_TIME,
+    CANCELED = EXCLUDED.CANCELED,
+    CREATED_TIME = EXCLUDED.CREATED_TIME,
+    UPDATED_TIME = EXCLUDED.UPDATED_TIME;
+
+  RETURN NULL;
+END;
+$$;
+
+CREATE TRIGGER "create_core_coldtag_projection"
+AFTER INSERT ON "create_core_coldtag" FOR EACH ROW
+EXECUTE FUNCTION "refresh_core_coldtag_projection"('id');
+
+CREATE TRIGGER "update_core_coldtag_projection"
+AFTER INSERT ON "update_core_coldtag" FOR EACH ROW
+EXECUTE FUNCTION "refresh_core_coldtag_projection"('core_coldtag_id');
+
+CREATE TRIGGER "create_node_coldtag_projection"
+AFTER INSERT ON "create_node_coldtag" FOR EACH ROW
+EXECUTE FUNCTION "refresh_node_coldtag_projection"('id');
+
+CREATE TRIGGER "update_node_coldtag_projection"
+AFTER INSERT ON "update_node_coldtag" FOR EACH ROW
+EXECUTE FUNCTION "refresh_node_coldtag_projection"('node_coldtag_id');
+
+CREATE TRIGGER "create_route_cycle_projection"
+AFTER INSERT ON "create_route_cycle" FOR EACH ROW
+EXECUTE FUNCTION "refresh_route_cycle_projection"('id');
+
+CREATE TRIGGER "update_route_cycle_projection"
+AFTER INSERT ON "update_route_cycle" FOR EACH ROW
+EXECUTE FUNCTION "refresh_route_cycle_projection"('route_cycle_id');
+
+CREATE VIEW "core_coldtag" AS (
+  SELECT
+    *
+  FROM
+    "core_coldtag_projection"
+);
+
+CREATE VIEW "node_coldtag" AS (
+  SELECT
+    *
+  FROM
+    "node_coldtag_projection"
+);
+
+CREATE VIEW "route_cycle" AS (
+  SELECT
+    *
+  FROM
+    "route_cycle_projection"
+);
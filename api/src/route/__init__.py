@@ -1,4 +1,6 @@
+import asyncio
 from collections.abc import Callable
+from datetime import datetime
 from functools import cached_property
 from typing import Literal
 
@@ -6,16 +8,29 @@ from aiomqtt import Client as MQTTClient
 from fastapi import FastAPI, UploadFile
 from redis.asyncio import Redis
 from strawberry import Schema
+from strawberry.dataloader import DataLoader
 from strawberry.fastapi import BaseContext
 from strawberry.file_uploads import Upload
 from strawberry.schema.base import BaseSchema
 from supabase import AClient as SupabaseClient
 
-from src.persistence.core_coldtag import CoreColdtagPersistence
-from src.persistence.node_coldtag import NodeColdtagPersistence
-from src.persistence.route_cycle import RouteCyclePersistence
+from src.persistence import BATCH_LOADER_MAX_BATCH_SIZE
+from src.persistence.core_coldtag import CoreColdtagPersistence, PersistedCoreColdtag, PersistedCoreColdtagEvent
+from src.persistence.node_coldtag import (
+    NodeColdtagPersistence,
+    PersistedNodeColdtag,
+    PersistedNodeColdtagEvent,
+    PersistedNodeColdtagEventAlertImpact,
+    PersistedNodeColdtagEventAlertLiquid,
+)
+from src.persistence.route_cycle import (
+    PersistedRouteCycleAlertHumidityEvent,
+    PersistedRouteCycleAlertTemperatureEvent,
+    RouteCyclePersistence,
+)
 from src.route.mutate import MutationSchema
 from src.route.query import QuerySchema
+from src.route.subscribe import LiveHub, SubscriptionSchema
 
 
 class AppContext(BaseContext):
@@ -46,6 +61,10 @@ class AppContext(BaseContext):
     def mqtt(self) -> MQTTClient:
         return self.app.extra["mqtt"]
 
+    @cached_property
+    def live_hub(self) -> LiveHub:
+        return self.app.extra["live_hub"]
+
     @cached_property
     def core_coldtag_persistence(self) -> CoreColdtagPersistence:
         return self.app.extra["core_coldtag_persistence"]
@@ -58,15 +77,120 @@ class AppContext(BaseContext):
     def route_cycle_persistence(self) -> RouteCyclePersistence:
         return self.app.extra["route_cycle_persistence"]
 
+    # The loaders below live as long as this context, i.e. one request,
+    # a key loaded twice while resolving a response is fetched once
+
+    @cached_property
+    def node_coldtag_loader(self) -> DataLoader[str, PersistedNodeColdtag | None]:
+        return DataLoader(self.node_coldtag_persistence.find_nodes_by_ids, max_batch_size=BATCH_LOADER_MAX_BATCH_SIZE)
+
+    @cached_property
+    def core_coldtag_loader(self) -> DataLoader[str, PersistedCoreColdtag | None]:
+        return DataLoader(self.core_coldtag_persistence.find_cores_by_ids, max_batch_size=BATCH_LOADER_MAX_BATCH_SIZE)
+
+    @cached_property
+    def node_coldtag_events_loader(self) -> DataLoader[str, list[PersistedNodeColdtagEvent]]:
+        return DataLoader(
+            self.node_coldtag_persistence.find_node_events_by_node_ids, max_batch_size=BATCH_LOADER_MAX_BATCH_SIZE
+        )
+
+    @cached_property
+    def node_coldtag_event_alert_liquids_loader(self) -> DataLoader[str, list[PersistedNodeColdtagEventAlertLiquid]]:
+        return DataLoader(
+            self.node_coldtag_persistence.find_node_event_alert_liquids_by_node_ids,
+            max_batch_size=BATCH_LOADER_MAX_BATCH_SIZE,
+        )
+
+    @cached_property
+    def node_coldtag_event_alert_impacts_loader(self) -> DataLoader[str, list[PersistedNodeColdtagEventAlertImpact]]:
+        return DataLoader(
+            self.node_coldtag_persistence.find_node_event_alert_impacts_by_node_ids,
+            max_batch_size=BATCH_LOADER_MAX_BATCH_SIZE,
+        )
+
+    @cached_property
+    def core_coldtag_events_loader(self) -> DataLoader[str, list[PersistedCoreColdtagEvent]]:
+        return DataLoader(
+            self.core_coldtag_persistence.find_core_events_by_core_ids, max_batch_size=BATCH_LOADER_MAX_BATCH_SIZE
+        )
+
+    # Keyed by node id, dispatch time and completion time, one per route cycle
+
+    @cached_property
+    def node_coldtag_events_by_time_range_loader(
+        self,
+    ) -> DataLoader[tuple[str, datetime, datetime | None], list[PersistedNodeColdtagEvent]]:
+        return DataLoader(
+            self.node_coldtag_persistence.find_node_events_by_time_ranges, max_batch_size=BATCH_LOADER_MAX_BATCH_SIZE
+        )
+
+    @cached_property
+    def node_coldtag_event_alert_liquids_by_time_range_loader(
+        self,
+    ) -> DataLoader[tuple[str, datetime, datetime | None], list[PersistedNodeColdtagEventAlertLiquid]]:
+        return DataLoader(
+            self.node_coldtag_persistence.find_node_event_alert_liquids_by_time_ranges,
+            max_batch_size=BATCH_LOADER_MAX_BATCH_SIZE,
+        )
+
+    @cached_property
+    def node_coldtag_event_alert_impacts_by_time_range_loader(
+        self,
+    ) -> DataLoader[tuple[str, datetime, datetime | None], list[PersistedNodeColdtagEventAlertImpact]]:
+        return DataLoader(
+            self.node_coldtag_persistence.find_node_event_alert_impacts_by_time_ranges,
+            max_batch_size=BATCH_LOADER_MAX_BATCH_SIZE,
+        )
+
+    @cached_property
+    def route_cycle_alert_temperature_events_loader(
+        self,
+    ) -> DataLoader[str, list[PersistedRouteCycleAlertTemperatureEvent]]:
+        return DataLoader(
+            self.route_cycle_persistence.find_alert_temperature_events_by_route_cycle_ids,
+            max_batch_size=BATCH_LOADER_MAX_BATCH_SIZE,
+        )
+
+    @cached_property
+    def route_cycle_alert_humidity_events_loader(self) -> DataLoader[str, list[PersistedRouteCycleAlertHumidityEvent]]:
+        return DataLoader(
+            self.route_cycle_persistence.find_alert_humidity_events_by_route_cycle_ids,
+            max_batch_size=BATCH_LOADER_MAX_BATCH_SIZE,
+        )
+
+    @cached_property
+    def closest_core_coldtag_event_loader(self) -> DataLoader[tuple[str, datetime], PersistedCoreColdtagEvent | None]:
+        async def load(keys: list[tuple[str, datetime]]) -> list[PersistedCoreColdtagEvent | None]:
+            times: dict[str, list[datetime]] = {}
+            for core_id, time in keys:
+                times.setdefault(core_id, []).append(time)
+
+            found = await asyncio.gather(
+                *[
+                    self.core_coldtag_persistence.find_core_events_by_closest_times(core_id, times=core_times)
+                    for core_id, core_times in times.items()
+                ]
+            )
+
+            closest = {
+                (core_id, time): event
+                for (core_id, core_times), events in zip(times.items(), found, strict=True)
+                for time, event in zip(core_times, events, strict=True)
+            }
+            return [closest[key] for key in keys]
+
+        return DataLoader(load, max_batch_size=BATCH_LOADER_MAX_BATCH_SIZE)
+
 
 def create_context(app: FastAPI, /, env: Literal["production", "development"]) -> Callable[..., AppContext]:
-    context = AppContext(app, env=env)
-    return lambda: context
+    # A fresh context per request, it carries the request and the loaders of that request
+    return lambda: AppContext(app, env=env)
 
 
 def create_schema() -> BaseSchema:
     return Schema(
         query=QuerySchema,
         mutation=MutationSchema,
+        subscription=SubscriptionSchema,
         scalar_overrides={UploadFile: Upload},
     )
@@ -24,4 +24,4 @@ class CoreColdtagCreate:
             mac_address=mac_address,
             identifier=identifier,
         )
-        return await resolve_core_coldtag(persisted_core, info=info)
+        return resolve_core_coldtag(persisted_core)
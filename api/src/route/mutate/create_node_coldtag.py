@@ -24,4 +24,4 @@ class NodeColdtagCreate:
             mac_address=mac_address,
             identifier=identifier,
         )
-        return await resolve_node_coldtag(persisted_node, info=info)
+        return resolve_node_coldtag(persisted_node)
@@ -43,4 +43,4 @@ class RouteCycleCreate:
             humidity_alert_threshold=humidity_alert_threshold,
         )
 
-        return await resolve_route_cycle(persisted_route_cycle, info=info)
+        return resolve_route_cycle(persisted_route_cycle)
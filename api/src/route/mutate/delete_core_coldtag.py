@@ -18,4 +18,4 @@ class CoreColdtagDelete:
         core_coldtag_persistence = info.context.core_coldtag_persistence
 
         persisted_core = await core_coldtag_persistence.update_core(core_coldtag_id, deleted=True)
-        return await resolve_core_coldtag(persisted_core, info=info)
+        return resolve_core_coldtag(persisted_core)
@@ -18,4 +18,4 @@ class NodeColdtagDelete:
         node_coldtag_persistence = info.context.node_coldtag_persistence
 
         persisted_node = await node_coldtag_persistence.update_node(node_coldtag_id, deleted=True)
-        return await resolve_node_coldtag(persisted_node, info=info)
+        return resolve_node_coldtag(persisted_node)
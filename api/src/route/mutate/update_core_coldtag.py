@@ -33,4 +33,4 @@ class CoreColdtagUpdate:
             core_coldtag_id,
             identifier=MISSING if identifier is None else identifier,
         )
-        return await resolve_core_coldtag(updated_persisted_core, info=info)
+        return resolve_core_coldtag(updated_persisted_core)
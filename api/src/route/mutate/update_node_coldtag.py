@@ -33,4 +33,4 @@ class NodeColdtagUpdate:
             node_coldtag_id,
             identifier=MISSING if identifier is None else identifier,
         )
-        return await resolve_node_coldtag(updated_persisted_node, info=info)
+        return resolve_node_coldtag(updated_persisted_node)
@@ -51,7 +51,7 @@ class RouteCycleUpdate:
             temperature_alert_threshold=MISSING if temperature_alert_threshold is None else temperature_alert_threshold,
             humidity_alert_threshold=MISSING if humidity_alert_threshold is None else humidity_alert_threshold,
         )
-        return await resolve_route_cycle(updated_persisted_route_cycle, info=info)
+        return resolve_route_cycle(updated_persisted_route_cycle)
 
     @strawberry.field
     async def start_route_cycle(
@@ -72,7 +72,7 @@ class RouteCycleUpdate:
             route_cycle_id,
             started=True,
         )
-        return await resolve_route_cycle(updated_persisted_route_cycle, info=info)
+        return resolve_route_cycle(updated_persisted_route_cycle)
 
     @strawberry.field
     async def complete_route_cycle(
@@ -93,7 +93,7 @@ class RouteCycleUpdate:
             route_cycle_id,
             completed=True,
         )
-        return await resolve_route_cycle(updated_persisted_route_cycle, info=info)
+        return resolve_route_cycle(updated_persisted_route_cycle)
 
     @strawberry.field
     async def cancel_route_cycle(
@@ -114,4 +114,4 @@ class RouteCycleUpdate:
             route_cycle_id,
             canceled=True,
         )
-        return await resolve_route_cycle(updated_persisted_route_cycle, info=info)
+        return resolve_route_cycle(updated_persisted_route_cycle)
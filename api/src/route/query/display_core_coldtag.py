@@ -1,4 +1,3 @@
-import asyncio
 from typing import TYPE_CHECKING, cast
 
 import strawberry
@@ -21,7 +20,7 @@ class CoreColdtagDisplay:
             persisted_cores = await core_coldtag_persistence.find_cores()
             return cast(
                 "list[CoreColdtag]",
-                await asyncio.gather(*[resolve_core_coldtag(core, info=info) for core in persisted_cores]),
+                [resolve_core_coldtag(core) for core in persisted_cores],
             )
 
         @strawberry.field
@@ -32,7 +31,7 @@ class CoreColdtagDisplay:
             if persisted_core is None:
                 raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST)
 
-            return await resolve_core_coldtag(persisted_core, info=info)
+            return resolve_core_coldtag(persisted_core)
 
         @strawberry.field
         async def count(self, info: Info["AppContext"]) -> int:
@@ -1,10 +1,10 @@
-import asyncio
 from datetime import datetime
 from typing import TYPE_CHECKING
 
 import strawberry
 from strawberry import Info
 
+from src.route.resolve.connection import Connection, event_page, resolve_connection
 from src.route.resolve.core_coldtag import (
     CoreColdtagEvent,
     resolve_core_coldtag_event,
@@ -24,7 +24,24 @@ class CoreColdtagEventDisplay:
         ) -> list[CoreColdtagEvent]:
             core_coldtag_persistence = info.context.core_coldtag_persistence
             persisted_events = await core_coldtag_persistence.find_core_events_all_by_time_range(a, b)
-            return await asyncio.gather(*[resolve_core_coldtag_event(event, info=info) for event in persisted_events])
+            return [resolve_core_coldtag_event(event) for event in persisted_events]
+
+        @strawberry.field
+        async def connection_by_time_range(
+            self,
+            a: datetime,
+            info: Info["AppContext"],
+            b: datetime | None = None,
+            *,
+            first: int | None = None,
+            after: str | None = None,
+            last: int | None = None,
+            before: str | None = None,
+        ) -> Connection[CoreColdtagEvent]:
+            page = event_page(first=first, after=after, last=last, before=before)
+            core_coldtag_persistence = info.context.core_coldtag_persistence
+            persisted_events = await core_coldtag_persistence.find_core_events_page(None, page=page, a=a, b=b)
+            return resolve_connection(page, persisted_events, resolve=resolve_core_coldtag_event)
 
     @strawberry.field
     async def display_core_coldtag_event(self) -> DisplayCoreColdtagEventFields:
@@ -1,4 +1,3 @@
-import asyncio
 from typing import TYPE_CHECKING, cast
 
 import strawberry
@@ -21,7 +20,7 @@ class NodeColdtagDisplay:
             persisted_nodes = await node_coldtag_persistence.find_nodes()
             return cast(
                 "list[NodeColdtag]",
-                await asyncio.gather(*[resolve_node_coldtag(node, info=info) for node in persisted_nodes]),
+                [resolve_node_coldtag(node) for node in persisted_nodes],
             )
 
         @strawberry.field
@@ -30,7 +29,7 @@ class NodeColdtagDisplay:
             persisted_nodes = await node_coldtag_persistence.find_nodes_available_for_route_cycle()
             return cast(
                 "list[NodeColdtag]",
-                await asyncio.gather(*[resolve_node_coldtag(node, info=info) for node in persisted_nodes]),
+                [resolve_node_coldtag(node) for node in persisted_nodes],
             )
 
         @strawberry.field
@@ -41,7 +40,7 @@ class NodeColdtagDisplay:
             if persisted_node is None:
                 raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
 
-            return await resolve_node_coldtag(persisted_node, info=info)
+            return resolve_node_coldtag(persisted_node)
 
         @strawberry.field
         async def count(self, info: Info["AppContext"]) -> int:
@@ -1,17 +1,21 @@
-import asyncio
 from datetime import datetime
 from typing import TYPE_CHECKING
 
 import strawberry
 from strawberry import Info
 
+from src.route.resolve.connection import Connection, event_page, resolve_connection
 from src.route.resolve.node_coldtag import (
     NodeColdtagEvent,
     NodeColdtagEventAlertImpact,
     NodeColdtagEventAlertLiquid,
+    NodeColdtagEventRollup,
+    TelemetryResolution,
     resolve_node_coldtag_event,
     resolve_node_coldtag_event_alert_impact,
     resolve_node_coldtag_event_alert_liquid,
+    resolve_node_coldtag_event_rollup,
+    resolve_telemetry_resolution,
 )
 
 if TYPE_CHECKING:
@@ -28,7 +32,39 @@ class NodeColdtagEventDisplay:
         ) -> list[NodeColdtagEvent]:
             node_coldtag_persistence = info.context.node_coldtag_persistence
             persisted_events = await node_coldtag_persistence.find_node_events_all_by_time_range(a, b)
-            return await asyncio.gather(*[resolve_node_coldtag_event(event, info=info) for event in persisted_events])
+            return [resolve_node_coldtag_event(event) for event in persisted_events]
+
+        @strawberry.field
+        async def connection_by_time_range(
+            self,
+            a: datetime,
+            info: Info["AppContext"],
+            b: datetime | None = None,
+            *,
+            first: int | None = None,
+            after: str | None = None,
+            last: int | None = None,
+            before: str | None = None,
+        ) -> Connection[NodeColdtagEvent]:
+            page = event_page(first=first, after=after, last=last, before=before)
+            node_coldtag_persistence = info.context.node_coldtag_persistence
+            persisted_events = await node_coldtag_persistence.find_node_events_page(None, page=page, a=a, b=b)
+            return resolve_connection(page, persisted_events, resolve=resolve_node_coldtag_event)
+
+        @strawberry.field
+        async def rollups_by_time_range(
+            self,
+            a: datetime,
+            info: Info["AppContext"],
+            b: datetime | None = None,
+            resolution: TelemetryResolution = TelemetryResolution.AUTO,
+            max_points: int = 500,
+        ) -> list[NodeColdtagEventRollup]:
+            node_coldtag_persistence = info.context.node_coldtag_persistence
+            persisted_rollups = await node_coldtag_persistence.find_node_event_rollups_all_by_time_range(
+                resolve_telemetry_resolution(resolution, a, b, max_points=max_points), a, b
+            )
+            return [resolve_node_coldtag_event_rollup(rollup) for rollup in persisted_rollups]
 
     @strawberry.field
     async def display_node_coldtag_event(self) -> DisplayNodeColdtagEventFields:
@@ -45,9 +81,26 @@ class NodeColdtagEventAlertLiquidDisplay:
         ) -> list[NodeColdtagEventAlertLiquid]:
             node_coldtag_persistence = info.context.node_coldtag_persistence
             persisted_events = await node_coldtag_persistence.find_node_event_alert_liquids_all_by_time_range(a, b)
-            return await asyncio.gather(
-                *[resolve_node_coldtag_event_alert_liquid(event, info=info) for event in persisted_events]
+            return [resolve_node_coldtag_event_alert_liquid(event) for event in persisted_events]
+
+        @strawberry.field
+        async def connection_by_time_range(
+            self,
+            a: datetime,
+            info: Info["AppContext"],
+            b: datetime | None = None,
+            *,
+            first: int | None = None,
+            after: str | None = None,
+            last: int | None = None,
+            before: str | None = None,
+        ) -> Connection[NodeColdtagEventAlertLiquid]:
+            page = event_page(first=first, after=after, last=last, before=before)
+            node_coldtag_persistence = info.context.node_coldtag_persistence
+            persisted_events = await node_coldtag_persistence.find_node_event_alert_liquids_page(
+                None, page=page, a=a, b=b
             )
+            return resolve_connection(page, persisted_events, resolve=resolve_node_coldtag_event_alert_liquid)
 
     @strawberry.field
     async def display_node_coldtag_event_alert_liquid(self) -> DisplayNodeColdtagEventAlertLiquidFields:
@@ -64,9 +117,26 @@ class NodeColdtagEventAlertImpactDisplay:
         ) -> list[NodeColdtagEventAlertImpact]:
             node_coldtag_persistence = info.context.node_coldtag_persistence
             persisted_events = await node_coldtag_persistence.find_node_event_alert_impacts_all_by_time_range(a, b)
-            return await asyncio.gather(
-                *[resolve_node_coldtag_event_alert_impact(event, info=info) for event in persisted_events]
+            return [resolve_node_coldtag_event_alert_impact(event) for event in persisted_events]
+
+        @strawberry.field
+        async def connection_by_time_range(
+            self,
+            a: datetime,
+            info: Info["AppContext"],
+            b: datetime | None = None,
+            *,
+            first: int | None = None,
+            after: str | None = None,
+            last: int | None = None,
+            before: str | None = None,
+        ) -> Connection[NodeColdtagEventAlertImpact]:
+            page = event_page(first=first, after=after, last=last, before=before)
+            node_coldtag_persistence = info.context.node_coldtag_persistence
+            persisted_events = await node_coldtag_persistence.find_node_event_alert_impacts_page(
+                None, page=page, a=a, b=b
             )
+            return resolve_connection(page, persisted_events, resolve=resolve_node_coldtag_event_alert_impact)
 
     @strawberry.field
     async def display_node_coldtag_event_alert_impact(self) -> DisplayNodeColdtagEventAlertImpactFields:
@@ -1,5 +1,4 @@
-import asyncio
-from typing import TYPE_CHECKING, cast
+from typing import TYPE_CHECKING
 
 import strawberry
 from fastapi import HTTPException, status
@@ -19,12 +18,7 @@ class RouteCycleDisplay:
         async def all(self, info: Info["AppContext"]) -> list[RouteCycle]:
             route_cycle_persistence = info.context.route_cycle_persistence
             persisted_route_cycles = await route_cycle_persistence.find_route_cycles()
-            return cast(
-                "list[RouteCycle]",
-                await asyncio.gather(
-                    *[resolve_route_cycle(route_cycle, info=info) for route_cycle in persisted_route_cycles]
-                ),
-            )
+            return [resolve_route_cycle(route_cycle) for route_cycle in persisted_route_cycles]
 
         @strawberry.field
         async def by_id(self, route_cycle_id: strawberry.scalars.ID, info: Info["AppContext"]) -> RouteCycle:
@@ -34,7 +28,7 @@ class RouteCycleDisplay:
             if persisted_route_cycle is None:
                 raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST)
 
-            return await resolve_route_cycle(persisted_route_cycle, info=info)
+            return resolve_route_cycle(persisted_route_cycle)
 
         @strawberry.field
         async def latest_by_node_coldtag_id(
@@ -46,7 +40,7 @@ class RouteCycleDisplay:
             if persisted_route_cycle is None:
                 raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST)
 
-            return await resolve_route_cycle(persisted_route_cycle, info=info)
+            return resolve_route_cycle(persisted_route_cycle)
 
         @strawberry.field
         async def count(self, info: Info["AppContext"]) -> int:
@@ -0,0 +1,99 @@
+import base64
+import binascii
+import os
+from collections.abc import Callable, Sequence
+from datetime import datetime
+from typing import Protocol
+
+import strawberry
+from fastapi import HTTPException, status
+
+from src.persistence import EventKey, EventPage
+
+CONNECTION_DEFAULT_PAGE_SIZE: int = int(os.getenv("CONNECTION_DEFAULT_PAGE_SIZE", "100"))
+
+CONNECTION_MAX_PAGE_SIZE: int = int(os.getenv("CONNECTION_MAX_PAGE_SIZE", "1000"))
+
+
+class _Event(Protocol):
+    @property
+    def id(self) -> str: ...
+
+    @property
+    def event_time(self) -> datetime: ...
+
+
+@strawberry.type
+class PageInfo:
+    has_next_page: bool
+    has_previous_page: bool
+    start_cursor: str | None
+    end_cursor: str | None
+
+
+@strawberry.type
+class Edge[T]:
+    cursor: str
+    node: T
+
+
+@strawberry.type
+class Connection[T]:
+    edges: list[Edge[T]]
+    page_info: PageInfo
+
+
+def encode_cursor(event: _Event, /) -> str:
+    return base64.urlsafe_b64encode(f"{event.event_time.isoformat()}|{event.id}".encode()).decode()
+
+
+def decode_cursor(cursor: str, /) -> EventKey:
+    try:
+        event_time, event_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return EventKey(event_time=datetime.fromisoformat(event_time), id=int(event_id))
+
+    except (binascii.Error, UnicodeDecodeError, ValueError) as err:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST) from err
+
+
+def event_page(*, first: int | None, after: str | None, last: int | None, before: str | None) -> EventPage:
+    if first is not None and last is not None:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST)
+
+    if (first is not None and first < 0) or (last is not None and last < 0):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST)
+
+    size = min(
+        last if last is not None else first if first is not None else CONNECTION_DEFAULT_PAGE_SIZE,
+        CONNECTION_MAX_PAGE_SIZE,
+    )
+
+    # One row past the page tells whether there is more in that direction
+    return EventPage(
+        after=decode_cursor(after) if after is not None else None,
+        before=decode_cursor(before) if before is not None else None,
+        limit=size + 1,
+        backward=last is not None,
+    )
+
+
+def resolve_connection[P: _Event, T](
+    page: EventPage, persisted: Sequence[P], /, resolve: Callable[[P], T]
+) -> Connection[T]:
+    size = page.limit - 1
+    more = len(persisted) > size
+
+    # A backward page is fetched from the cursor towards the newest, so the extra row leads the list
+    items = (persisted[len(persisted) - size :] if more else persisted) if page.backward else persisted[:size]
+
+    edges = [Edge(cursor=encode_cursor(item), node=resolve(item)) for item in items]
+
+    return Connection(
+        edges=edges,
+        page_info=PageInfo(
+            has_next_page=more and not page.backward,
+            has_previous_page=more and page.backward,
+            start_cursor=edges[0].cursor if edges else None,
+            end_cursor=edges[-1].cursor if edges else None,
+        ),
+    )
@@ -1,5 +1,4 @@
-import asyncio
-from collections.abc import Awaitable
+from collections.abc import Awaitable, Callable
 from datetime import datetime
 from typing import TYPE_CHECKING
 
@@ -9,6 +8,7 @@ from src.persistence.core_coldtag import (
     PersistedCoreColdtag,
     PersistedCoreColdtagEvent,
 )
+from src.route.resolve.connection import Connection, event_page, resolve_connection
 from src.route.resolve.coordinate import Coordinate
 
 if TYPE_CHECKING:
@@ -19,23 +19,22 @@ if TYPE_CHECKING:
 class CoreColdtagEvent:
     id: strawberry.scalars.ID
 
-    _core_coldtag: strawberry.Private[Awaitable["CoreColdtag"]]
+    _core_coldtag: strawberry.Private[Callable[[strawberry.Info["AppContext"]], Awaitable["CoreColdtag"]]]
 
     @strawberry.field
-    async def core_coldtag(self) -> "CoreColdtag":
-        return await self._core_coldtag
+    async def core_coldtag(self, info: strawberry.Info["AppContext"]) -> "CoreColdtag":
+        return await self._core_coldtag(info)
 
     coordinate: Coordinate | None
     event_time: datetime
     time: datetime
 
 
-async def resolve_core_coldtag_event(
-    coldtag_event: PersistedCoreColdtagEvent, /, info: strawberry.Info["AppContext"]
-) -> CoreColdtagEvent:
-    async def __core_coldtag() -> CoreColdtag:
-        core_coldtag = await coldtag_event.core_coldtag
-        return await resolve_core_coldtag(core_coldtag, info=info)
+def resolve_core_coldtag_event(coldtag_event: PersistedCoreColdtagEvent, /) -> CoreColdtagEvent:
+    async def __core_coldtag(info: strawberry.Info["AppContext"]) -> CoreColdtag:
+        core_coldtag = await info.context.core_coldtag_loader.load(coldtag_event.core_coldtag_id)
+        assert core_coldtag is not None
+        return resolve_core_coldtag(core_coldtag)
 
     coordinate = (
         Coordinate(latitude=coldtag_event.latitude, longitude=coldtag_event.longitude)
@@ -45,7 +44,7 @@ async def resolve_core_coldtag_event(
 
     return CoreColdtagEvent(
         id=strawberry.scalars.ID(coldtag_event.id),
-        _core_coldtag=__core_coldtag(),
+        _core_coldtag=__core_coldtag,
         coordinate=coordinate,
         event_time=coldtag_event.event_time,
         time=coldtag_event.time,
@@ -58,29 +57,40 @@ class CoreColdtag:
     mac_address: str
     identifier: str | None
 
-    _telemetry_events: strawberry.Private[Awaitable[list[CoreColdtagEvent]]]
+    _telemetry_events: strawberry.Private[Callable[[strawberry.Info["AppContext"]], Awaitable[list[CoreColdtagEvent]]]]
 
     @strawberry.field
-    async def telemetry_events(self) -> list[CoreColdtagEvent]:
-        return await self._telemetry_events
+    async def telemetry_events(self, info: strawberry.Info["AppContext"]) -> list[CoreColdtagEvent]:
+        return await self._telemetry_events(info)
+
+    @strawberry.field
+    async def telemetry_events_connection(
+        self,
+        info: strawberry.Info["AppContext"],
+        first: int | None = None,
+        after: str | None = None,
+        last: int | None = None,
+        before: str | None = None,
+    ) -> Connection[CoreColdtagEvent]:
+        page = event_page(first=first, after=after, last=last, before=before)
+        persisted_events = await info.context.core_coldtag_persistence.find_core_events_page(self.id, page=page)
+        return resolve_connection(page, persisted_events, resolve=resolve_core_coldtag_event)
 
     deleted: bool
     created_time: datetime
     updated_time: datetime
 
 
-async def resolve_core_coldtag(
-    core_coldtag: PersistedCoreColdtag, /, info: strawberry.Info["AppContext"]
-) -> CoreColdtag:
-    async def __telemetry_events() -> list[CoreColdtagEvent]:
-        persisted_events = await core_coldtag.telemetry_events
-        return await asyncio.gather(*[resolve_core_coldtag_event(event, info=info) for event in persisted_events])
+def resolve_core_coldtag(core_coldtag: PersistedCoreColdtag, /) -> CoreColdtag:
+    async def __telemetry_events(info: strawberry.Info["AppContext"]) -> list[CoreColdtagEvent]:
+        persisted_events = await info.context.core_coldtag_events_loader.load(core_coldtag.id)
+        return [resolve_core_coldtag_event(event) for event in persisted_events]
 
     return CoreColdtag(
         id=strawberry.scalars.ID(core_coldtag.id),
         mac_address=core_coldtag.mac_address,
         identifier=core_coldtag.identifier,
-        _telemetry_events=__telemetry_events(),
+        _telemetry_events=__telemetry_events,
         deleted=core_coldtag.deleted,
         created_time=core_coldtag.created_time,
         updated_time=core_coldtag.updated_time,
@@ -0,0 +1,75 @@
+from datetime import datetime
+from enum import Enum
+from typing import Any
+
+import strawberry
+
+from src.route.resolve.coordinate import Coordinate
+
+
+@strawberry.enum
+class LiveAlertKind(Enum):
+    TEMPERATURE = "temperature"
+    HUMIDITY = "humidity"
+    LIQUID = "liquid"
+    IMPACT = "impact"
+
+
+@strawberry.type
+class LiveNodeColdtagEvent:
+    node_coldtag_id: strawberry.scalars.ID
+    core_coldtag_id: strawberry.scalars.ID
+    temperature: float | None
+    humidity: float | None
+    coordinate: Coordinate | None
+    core_coldtag_received_time: datetime
+    event_time: datetime
+
+
+def resolve_live_node_coldtag_event(payload: dict[str, Any], /) -> LiveNodeColdtagEvent:
+    return LiveNodeColdtagEvent(
+        node_coldtag_id=strawberry.scalars.ID(payload["node_coldtag_id"]),
+        core_coldtag_id=strawberry.scalars.ID(payload["core_coldtag_id"]),
+        temperature=payload["temperature"],
+        humidity=payload["humidity"],
+        coordinate=(
+            Coordinate(latitude=payload["latitude"], longitude=payload["longitude"])
+            if payload["latitude"] is not None and payload["longitude"] is not None
+            else None
+        ),
+        core_coldtag_received_time=datetime.fromisoformat(payload["core_coldtag_received_time"]),
+        event_time=datetime.fromisoformat(payload["event_time"]),
+    )
+
+
+@strawberry.type
+class LiveAlert:
+    kind: LiveAlertKind
+    route_cycle_id: strawberry.scalars.ID | None
+    node_coldtag_id: strawberry.scalars.ID
+    core_coldtag_id: strawberry.scalars.ID
+    value: float | None
+    threshold: float | None
+    coordinate: Coordinate | None
+    core_coldtag_received_time: datetime
+    event_time: datetime
+
+
+def resolve_live_alert(payload: dict[str, Any], /) -> LiveAlert:
+    return LiveAlert(
+        kind=LiveAlertKind(payload["kind"]),
+        route_cycle_id=(
+            strawberry.scalars.ID(payload["route_cycle_id"]) if payload["route_cycle_id"] is not None else None
+        ),
+        node_coldtag_id=strawberry.scalars.ID(payload["node_coldtag_id"]),
+        core_coldtag_id=strawberry.scalars.ID(payload["core_coldtag_id"]),
+        value=payload["value"],
+        threshold=payload["threshold"],
+        coordinate=(
+            Coordinate(latitude=payload["latitude"], longitude=payload["longitude"])
+            if payload["latitude"] is not None and payload["longitude"] is not None
+            else None
+        ),
+        core_coldtag_received_time=datetime.fromisoformat(payload["core_coldtag_received_time"]),
+        event_time=datetime.fromisoformat(payload["event_time"]),
+    )
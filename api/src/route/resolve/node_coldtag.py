@@ -1,6 +1,6 @@
-import asyncio
-from collections.abc import Awaitable
+from collections.abc import Awaitable, Callable
 from datetime import datetime
+from enum import Enum
 from typing import TYPE_CHECKING
 
 import strawberry
@@ -10,7 +10,10 @@ from src.persistence.node_coldtag import (
     PersistedNodeColdtagEvent,
     PersistedNodeColdtagEventAlertImpact,
     PersistedNodeColdtagEventAlertLiquid,
+    PersistedNodeColdtagEventRollup,
+    select_rollup_resolution,
 )
+from src.route.resolve.connection import Connection, event_page, resolve_connection
 from src.route.resolve.coordinate import Coordinate
 from src.route.resolve.core_coldtag import CoreColdtag, resolve_core_coldtag
 
@@ -22,23 +25,23 @@ if TYPE_CHECKING:
 class NodeColdtagEvent:
     id: strawberry.scalars.ID
 
-    _node_coldtag: strawberry.Private[Awaitable["NodeColdtag"]]
+    _node_coldtag: strawberry.Private[Callable[[strawberry.Info["AppContext"]], Awaitable["NodeColdtag"]]]
 
     @strawberry.field
-    async def node_coldtag(self) -> "NodeColdtag":
-        return await self._node_coldtag
+    async def node_coldtag(self, info: strawberry.Info["AppContext"]) -> "NodeColdtag":
+        return await self._node_coldtag(info)
 
-    _core_coldtag: strawberry.Private[Awaitable[CoreColdtag]]
+    _core_coldtag: strawberry.Private[Callable[[strawberry.Info["AppContext"]], Awaitable[CoreColdtag]]]
 
     @strawberry.field
-    async def core_coldtag(self) -> CoreColdtag:
-        return await self._core_coldtag
+    async def core_coldtag(self, info: strawberry.Info["AppContext"]) -> CoreColdtag:
+        return await self._core_coldtag(info)
 
-    _coordinate: strawberry.Private[Awaitable[Coordinate | None]]
+    _coordinate: strawberry.Private[Callable[[strawberry.Info["AppContext"]], Awaitable[Coordinate | None]]]
 
     @strawberry.field
-    async def coordinate(self) -> Coordinate | None:
-        return await self._coordinate
+    async def coordinate(self, info: strawberry.Info["AppContext"]) -> Coordinate | None:
+        return await self._coordinate(info)
 
     temperature: float | None
     humidity: float | None
@@ -47,22 +50,23 @@ class NodeColdtagEvent:
     time: datetime
 
 
-async def resolve_node_coldtag_event(
-    coldtag_event: PersistedNodeColdtagEvent, /, info: strawberry.Info["AppContext"]
-) -> NodeColdtagEvent:
-    async def __node_coldtag() -> NodeColdtag:
-        coldtag = await coldtag_event.node_coldtag
-        return await resolve_node_coldtag(coldtag, info=info)
+def resolve_node_coldtag_event(coldtag_event: PersistedNodeColdtagEvent, /) -> NodeColdtagEvent:
+    async def __node_coldtag(info: strawberry.Info["AppContext"]) -> NodeColdtag:
+        coldtag = await info.context.node_coldtag_loader.load(coldtag_event.node_coldtag_id)
+        assert coldtag is not None
+        return resolve_node_coldtag(coldtag)
 
-    async def __core_coldtag() -> CoreColdtag:
-        coldtag = await coldtag_event.core_coldtag
-        return await resolve_core_coldtag(coldtag, info=info)
+    async def __core_coldtag(info: strawberry.Info["AppContext"]) -> CoreColdtag:
+        coldtag = await info.context.core_coldtag_loader.load(coldtag_event.core_coldtag_id)
+        assert coldtag is not None
+        return resolve_core_coldtag(coldtag)
 
-    async def __coordinate() -> Coordinate | None:
-        core_coldtag_persistence = info.context.core_coldtag_persistence
-        core_coldtag = await coldtag_event.core_coldtag
-        closest_event = await core_coldtag_persistence.find_core_event_by_closest_time(
-            core_coldtag.id, time=coldtag_event.event_time
+    async def __coordinate(info: strawberry.Info["AppContext"]) -> Coordinate | None:
+        if coldtag_event.latitude is not None and coldtag_event.longitude is not None:
+            return Coordinate(latitude=coldtag_event.latitude, longitude=coldtag_event.longitude)
+
+        closest_event = await info.context.closest_core_coldtag_event_loader.load(
+            (coldtag_event.core_coldtag_id, coldtag_event.event_time)
         )
         if closest_event is None:
             return None
@@ -74,9 +78,9 @@ async def resolve_node_coldtag_event(
 
     return NodeColdtagEvent(
         id=strawberry.scalars.ID(coldtag_event.id),
-        _node_coldtag=__node_coldtag(),
-        _core_coldtag=__core_coldtag(),
-        _coordinate=__coordinate(),
+        _node_coldtag=__node_coldtag,
+        _core_coldtag=__core_coldtag,
+        _coordinate=__coordinate,
         temperature=coldtag_event.temperature,
         humidity=coldtag_event.humidity,
         core_coldtag_received_time=coldtag_event.core_coldtag_received_time,
@@ -85,49 +89,122 @@ async def resolve_node_coldtag_event(
     )
 
 
+@strawberry.enum
+class TelemetryResolution(Enum):
+    AUTO = 0
+    MINUTE = 60
+    QUARTER_HOUR = 900
+    HOUR = 3600
+
+
+def resolve_telemetry_resolution(
+    resolution: TelemetryResolution, a: datetime, b: datetime | None = None, /, *, max_points: int
+) -> int:
+    if resolution is TelemetryResolution.AUTO:
+        return select_rollup_resolution(a, b, max_points=max_points)
+
+    return resolution.value
+
+
+@strawberry.type
+class NodeColdtagEventRollup:
+    _node_coldtag: strawberry.Private[Callable[[strawberry.Info["AppContext"]], Awaitable["NodeColdtag"]]]
+
+    @strawberry.field
+    async def node_coldtag(self, info: strawberry.Info["AppContext"]) -> "NodeColdtag":
+        return await self._node_coldtag(info)
+
+    resolution: int
+    bucket_time: datetime
+    count: int
+    temperature_min: float | None
+    temperature_max: float | None
+    temperature_average: float | None
+    temperature_first: float | None
+    temperature_last: float | None
+    humidity_min: float | None
+    humidity_max: float | None
+    humidity_average: float | None
+    humidity_first: float | None
+    humidity_last: float | None
+    first_event_time: datetime
+    last_event_time: datetime
+
+
+def resolve_node_coldtag_event_rollup(
+    coldtag_event_rollup: PersistedNodeColdtagEventRollup, /
+) -> NodeColdtagEventRollup:
+    async def __node_coldtag(info: strawberry.Info["AppContext"]) -> NodeColdtag:
+        coldtag = await info.context.node_coldtag_loader.load(coldtag_event_rollup.node_coldtag_id)
+        assert coldtag is not None
+        return resolve_node_coldtag(coldtag)
+
+    return NodeColdtagEventRollup(
+        _node_coldtag=__node_coldtag,
+        resolution=coldtag_event_rollup.resolution,
+        bucket_time=coldtag_event_rollup.bucket_time,
+        count=coldtag_event_rollup.count,
+        temperature_min=coldtag_event_rollup.temperature_min,
+        temperature_max=coldtag_event_rollup.temperature_max,
+        temperature_average=coldtag_event_rollup.temperature_average,
+        temperature_first=coldtag_event_rollup.temperature_first,
+        temperature_last=coldtag_event_rollup.temperature_last,
+        humidity_min=coldtag_event_rollup.humidity_min,
+        humidity_max=coldtag_event_rollup.humidity_max,
+        humidity_average=coldtag_event_rollup.humidity_average,
+        humidity_first=coldtag_event_rollup.humidity_first,
+        humidity_last=coldtag_event_rollup.humidity_last,
+        first_event_time=coldtag_event_rollup.first_event_time,
+        last_event_time=coldtag_event_rollup.last_event_time,
+    )
+
+
 @strawberry.type
 class NodeColdtagEventAlertLiquid:
     id: strawberry.scalars.ID
 
-    _node_coldtag: strawberry.Private[Awaitable["NodeColdtag"]]
+    _node_coldtag: strawberry.Private[Callable[[strawberry.Info["AppContext"]], Awaitable["NodeColdtag"]]]
 
     @strawberry.field
-    async def node_coldtag(self) -> "NodeColdtag":
-        return await self._node_coldtag
+    async def node_coldtag(self, info: strawberry.Info["AppContext"]) -> "NodeColdtag":
+        return await self._node_coldtag(info)
 
-    _core_coldtag: strawberry.Private[Awaitable[CoreColdtag]]
+    _core_coldtag: strawberry.Private[Callable[[strawberry.Info["AppContext"]], Awaitable[CoreColdtag]]]
 
     @strawberry.field
-    async def core_coldtag(self) -> CoreColdtag:
-        return await self._core_coldtag
+    async def core_coldtag(self, info: strawberry.Info["AppContext"]) -> CoreColdtag:
+        return await self._core_coldtag(info)
 
-    _coordinate: strawberry.Private[Awaitable[Coordinate | None]]
+    _coordinate: strawberry.Private[Callable[[strawberry.Info["AppContext"]], Awaitable[Coordinate | None]]]
 
     @strawberry.field
-    async def coordinate(self) -> Coordinate | None:
-        return await self._coordinate
+    async def coordinate(self, info: strawberry.Info["AppContext"]) -> Coordinate | None:
+        return await self._coordinate(info)
 
     core_coldtag_received_time: datetime
     event_time: datetime
     time: datetime
 
 
-async def resolve_node_coldtag_event_alert_liquid(
-    coldtag_event: PersistedNodeColdtagEventAlertLiquid, /, info: strawberry.Info["AppContext"]
+def resolve_node_coldtag_event_alert_liquid(
+    coldtag_event: PersistedNodeColdtagEventAlertLiquid, /
 ) -> NodeColdtagEventAlertLiquid:
-    async def __node_coldtag() -> NodeColdtag:
-        node_coldtag = await coldtag_event.node_coldtag
-        return await resolve_node_coldtag(node_coldtag, info=info)
-
-    async def __core_coldtag() -> CoreColdtag:
-        core_coldtag = await coldtag_event.core_coldtag
-        return await resolve_core_coldtag(core_coldtag, info=info)
-
-    async def __coordinate() -> Coordinate | None:
-        core_coldtag_persistence = info.context.core_coldtag_persistence
-        core_coldtag = await coldtag_event.core_coldtag
-        closest_event = await core_coldtag_persistence.find_core_event_by_closest_time(
-            core_coldtag.id, time=coldtag_event.event_time
+    async def __node_coldtag(info: strawberry.Info["AppContext"]) -> NodeColdtag:
+        node_coldtag = await info.context.node_coldtag_loader.load(coldtag_event.node_coldtag_id)
+        assert node_coldtag is not None
+        return resolve_node_coldtag(node_coldtag)
+
+    async def __core_coldtag(info: strawberry.Info["AppContext"]) -> CoreColdtag:
+        core_coldtag = await info.context.core_coldtag_loader.load(coldtag_event.core_coldtag_id)
+        assert core_coldtag is not None
+        return resolve_core_coldtag(core_coldtag)
+
+    async def __coordinate(info: strawberry.Info["AppContext"]) -> Coordinate | None:
+        if coldtag_event.latitude is not None and coldtag_event.longitude is not None:
+            return Coordinate(latitude=coldtag_event.latitude, longitude=coldtag_event.longitude)
+
+        closest_event = await info.context.closest_core_coldtag_event_loader.load(
+            (coldtag_event.core_coldtag_id, coldtag_event.event_time)
         )
         if closest_event is None:
             return None
@@ -139,9 +216,9 @@ async def resolve_node_coldtag_event_alert_liquid(
 
     return NodeColdtagEventAlertLiquid(
         id=strawberry.scalars.ID(coldtag_event.id),
-        _node_coldtag=__node_coldtag(),
-        _core_coldtag=__core_coldtag(),
-        _coordinate=__coordinate(),
+        _node_coldtag=__node_coldtag,
+        _core_coldtag=__core_coldtag,
+        _coordinate=__coordinate,
         core_coldtag_received_time=coldtag_event.core_coldtag_received_time,
         event_time=coldtag_event.event_time,
         time=coldtag_event.time,
@@ -152,45 +229,48 @@ async def resolve_node_coldtag_event_alert_liquid(
 class NodeColdtagEventAlertImpact:
     id: strawberry.scalars.ID
 
-    _node_coldtag: strawberry.Private[Awaitable["NodeColdtag"]]
+    _node_coldtag: strawberry.Private[Callable[[strawberry.Info["AppContext"]], Awaitable["NodeColdtag"]]]
 
     @strawberry.field
-    async def node_coldtag(self) -> "NodeColdtag":
-        return await self._node_coldtag
+    async def node_coldtag(self, info: strawberry.Info["AppContext"]) -> "NodeColdtag":
+        return await self._node_coldtag(info)
 
-    _core_coldtag: strawberry.Private[Awaitable[CoreColdtag]]
+    _core_coldtag: strawberry.Private[Callable[[strawberry.Info["AppContext"]], Awaitable[CoreColdtag]]]
 
     @strawberry.field
-    async def core_coldtag(self) -> CoreColdtag:
-        return await self._core_coldtag
+    async def core_coldtag(self, info: strawberry.Info["AppContext"]) -> CoreColdtag:
+        return await self._core_coldtag(info)
 
-    _coordinate: strawberry.Private[Awaitable[Coordinate | None]]
+    _coordinate: strawberry.Private[Callable[[strawberry.Info["AppContext"]], Awaitable[Coordinate | None]]]
 
     @strawberry.field
-    async def coordinate(self) -> Coordinate | None:
-        return await self._coordinate
+    async def coordinate(self, info: strawberry.Info["AppContext"]) -> Coordinate | None:
+        return await self._coordinate(info)
 
     core_coldtag_received_time: datetime
     event_time: datetime
     time: datetime
 
 
-async def resolve_node_coldtag_event_alert_impact(
-    coldtag_event: PersistedNodeColdtagEventAlertImpact, /, info: strawberry.Info["AppContext"]
+def resolve_node_coldtag_event_alert_impact(
+    coldtag_event: PersistedNodeColdtagEventAlertImpact, /
 ) -> NodeColdtagEventAlertImpact:
-    async def __node_coldtag() -> NodeColdtag:
-        node_coldtag = await coldtag_event.node_coldtag
-        return await resolve_node_coldtag(node_coldtag, info=info)
-
-    async def __core_coldtag() -> CoreColdtag:
-        core_coldtag = await coldtag_event.core_coldtag
-        return await resolve_core_coldtag(core_coldtag, info=info)
-
-    async def __coordinate() -> Coordinate | None:
-        core_coldtag_persistence = info.context.core_coldtag_persistence
-        core_coldtag = await coldtag_event.core_coldtag
-        closest_event = await core_coldtag_persistence.find_core_event_by_closest_time(
-            core_coldtag.id, time=coldtag_event.event_time
+    async def __node_coldtag(info: strawberry.Info["AppContext"]) -> NodeColdtag:
+        node_coldtag = await info.context.node_coldtag_loader.load(coldtag_event.node_coldtag_id)
+        assert node_coldtag is not None
+        return resolve_node_coldtag(node_coldtag)
+
+    async def __core_coldtag(info: strawberry.Info["AppContext"]) -> CoreColdtag:
+        core_coldtag = await info.context.core_coldtag_loader.load(coldtag_event.core_coldtag_id)
+        assert core_coldtag is not None
+        return resolve_core_coldtag(core_coldtag)
+
+    async def __coordinate(info: strawberry.Info["AppContext"]) -> Coordinate | None:
+        if coldtag_event.latitude is not None and coldtag_event.longitude is not None:
+            return Coordinate(latitude=coldtag_event.latitude, longitude=coldtag_event.longitude)
+
+        closest_event = await info.context.closest_core_coldtag_event_loader.load(
+            (coldtag_event.core_coldtag_id, coldtag_event.event_time)
         )
         if closest_event is None:
             return None
@@ -202,9 +282,9 @@ async def resolve_node_coldtag_event_alert_impact(
 
     return NodeColdtagEventAlertImpact(
         id=strawberry.scalars.ID(coldtag_event.id),
-        _node_coldtag=__node_coldtag(),
-        _core_coldtag=__core_coldtag(),
-        _coordinate=__coordinate(),
+        _node_coldtag=__node_coldtag,
+        _core_coldtag=__core_coldtag,
+        _coordinate=__coordinate,
         core_coldtag_received_time=coldtag_event.core_coldtag_received_time,
         event_time=coldtag_event.event_time,
         time=coldtag_event.time,
@@ -217,55 +297,96 @@ class NodeColdtag:
     mac_address: str
     identifier: str | None
 
-    _telemetry_events: strawberry.Private[Awaitable[list[NodeColdtagEvent]]]
+    _telemetry_events: strawberry.Private[Callable[[strawberry.Info["AppContext"]], Awaitable[list[NodeColdtagEvent]]]]
 
     @strawberry.field
-    async def telemetry_events(self) -> list[NodeColdtagEvent]:
-        return await self._telemetry_events
+    async def telemetry_events(self, info: strawberry.Info["AppContext"]) -> list[NodeColdtagEvent]:
+        return await self._telemetry_events(info)
 
-    _alert_liquid_events: strawberry.Private[Awaitable[list[NodeColdtagEventAlertLiquid]]]
+    @strawberry.field
+    async def telemetry_events_connection(
+        self,
+        info: strawberry.Info["AppContext"],
+        first: int | None = None,
+        after: str | None = None,
+        last: int | None = None,
+        before: str | None = None,
+    ) -> Connection[NodeColdtagEvent]:
+        page = event_page(first=first, after=after, last=last, before=before)
+        persisted_events = await info.context.node_coldtag_persistence.find_node_events_page(self.id, page=page)
+        return resolve_connection(page, persisted_events, resolve=resolve_node_coldtag_event)
+
+    _alert_liquid_events: strawberry.Private[
+        Callable[[strawberry.Info["AppContext"]], Awaitable[list[NodeColdtagEventAlertLiquid]]]
+    ]
 
     @strawberry.field
-    async def alert_liquid_events(self) -> list[NodeColdtagEventAlertLiquid]:
-        return await self._alert_liquid_events
+    async def alert_liquid_events(self, info: strawberry.Info["AppContext"]) -> list[NodeColdtagEventAlertLiquid]:
+        return await self._alert_liquid_events(info)
+
+    @strawberry.field
+    async def alert_liquid_events_connection(
+        self,
+        info: strawberry.Info["AppContext"],
+        first: int | None = None,
+        after: str | None = None,
+        last: int | None = None,
+        before: str | None = None,
+    ) -> Connection[NodeColdtagEventAlertLiquid]:
+        page = event_page(first=first, after=after, last=last, before=before)
+        persisted_events = await info.context.node_coldtag_persistence.find_node_event_alert_liquids_page(
+            self.id, page=page
+        )
+        return resolve_connection(page, persisted_events, resolve=resolve_node_coldtag_event_alert_liquid)
 
-    _alert_impact_events: strawberry.Private[Awaitable[list[NodeColdtagEventAlertImpact]]]
+    _alert_impact_events: strawberry.Private[
+        Callable[[strawberry.Info["AppContext"]], Awaitable[list[NodeColdtagEventAlertImpact]]]
+    ]
 
     @strawberry.field
-    async def alert_impact_events(self) -> list[NodeColdtagEventAlertImpact]:
-        return await self._alert_impact_events
+    async def alert_impact_events(self, info: strawberry.Info["AppContext"]) -> list[NodeColdtagEventAlertImpact]:
+        return await self._alert_impact_events(info)
+
+    @strawberry.field
+    async def alert_impact_events_connection(
+        self,
+        info: strawberry.Info["AppContext"],
+        first: int | None = None,
+        after: str | None = None,
+        last: int | None = None,
+        before: str | None = None,
+    ) -> Connection[NodeColdtagEventAlertImpact]:
+        page = event_page(first=first, after=after, last=last, before=before)
+        persisted_events = await info.context.node_coldtag_persistence.find_node_event_alert_impacts_page(
+            self.id, page=page
+        )
+        return resolve_connection(page, persisted_events, resolve=resolve_node_coldtag_event_alert_impact)
 
     deleted: bool
     created_time: datetime
     updated_time: datetime
 
 
-async def resolve_node_coldtag(
-    node_coldtag: PersistedNodeColdtag, /, info: strawberry.Info["AppContext"]
-) -> NodeColdtag:
-    async def __telemetry_events() -> list[NodeColdtagEvent]:
-        persisted_events = await node_coldtag.telemetry_events
-        return await asyncio.gather(*[resolve_node_coldtag_event(event, info=info) for event in persisted_events])
+def resolve_node_coldtag(node_coldtag: PersistedNodeColdtag, /) -> NodeColdtag:
+    async def __telemetry_events(info: strawberry.Info["AppContext"]) -> list[NodeColdtagEvent]:
+        persisted_events = await info.context.node_coldtag_events_loader.load(node_coldtag.id)
+        return [resolve_node_coldtag_event(event) for event in persisted_events]
 
-    async def __alert_liquid_events() -> list[NodeColdtagEventAlertLiquid]:
-        persisted_events = await node_coldtag.alert_liquid_events
-        return await asyncio.gather(
-            *[resolve_node_coldtag_event_alert_liquid(event, info=info) for event in persisted_events]
-        )
+    async def __alert_liquid_events(info: strawberry.Info["AppContext"]) -> list[NodeColdtagEventAlertLiquid]:
+        persisted_events = await info.context.node_coldtag_event_alert_liquids_loader.load(node_coldtag.id)
+        return [resolve_node_coldtag_event_alert_liquid(event) for event in persisted_events]
 
-    async def __alert_impact_events() -> list[NodeColdtagEventAlertImpact]:
-        persisted_events = await node_coldtag.alert_impact_events
-        return await asyncio.gather(
-            *[resolve_node_coldtag_event_alert_impact(event, info=info) for event in persisted_events]
-        )
+    async def __alert_impact_events(info: strawberry.Info["AppContext"]) -> list[NodeColdtagEventAlertImpact]:
+        persisted_events = await info.context.node_coldtag_event_alert_impacts_loader.load(node_coldtag.id)
+        return [resolve_node_coldtag_event_alert_impact(event) for event in persisted_events]
 
     return NodeColdtag(
         id=strawberry.scalars.ID(node_coldtag.id),
         mac_address=node_coldtag.mac_address,
         identifier=node_coldtag.identifier,
-        _telemetry_events=__telemetry_events(),
-        _alert_liquid_events=__alert_liquid_events(),
-        _alert_impact_events=__alert_impact_events(),
+        _telemetry_events=__telemetry_events,
+        _alert_liquid_events=__alert_liquid_events,
+        _alert_impact_events=__alert_impact_events,
         deleted=node_coldtag.deleted,
         created_time=node_coldtag.created_time,
         updated_time=node_coldtag.updated_time,
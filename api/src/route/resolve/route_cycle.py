@@ -1,15 +1,16 @@
-import asyncio
-from collections.abc import Awaitable
+from collections.abc import Awaitable, Callable
 from datetime import datetime
 from typing import TYPE_CHECKING
 
 import strawberry
+from fastapi import HTTPException, status
 
 from src.persistence.route_cycle import PersistedRouteCycle
 from src.persistence.route_cycle.model import (
     PersistedRouteCycleAlertHumidityEvent,
     PersistedRouteCycleAlertTemperatureEvent,
 )
+from src.route.resolve.connection import Connection, event_page, resolve_connection
 from src.route.resolve.coordinate import Coordinate
 from src.route.resolve.core_coldtag import CoreColdtag, resolve_core_coldtag
 from src.route.resolve.node_coldtag import (
@@ -17,10 +18,14 @@ from src.route.resolve.node_coldtag import (
     NodeColdtagEvent,
     NodeColdtagEventAlertImpact,
     NodeColdtagEventAlertLiquid,
+    NodeColdtagEventRollup,
+    TelemetryResolution,
     resolve_node_coldtag,
     resolve_node_coldtag_event,
     resolve_node_coldtag_event_alert_impact,
     resolve_node_coldtag_event_alert_liquid,
+    resolve_node_coldtag_event_rollup,
+    resolve_telemetry_resolution,
 )
 
 if TYPE_CHECKING:
@@ -31,23 +36,23 @@ if TYPE_CHECKING:
 class RouteCycleAlertTemperatureEvent:
     id: strawberry.scalars.ID
 
-    _node_coldtag: strawberry.Private[Awaitable["NodeColdtag"]]
+    _node_coldtag: strawberry.Private[Callable[[strawberry.Info["AppContext"]], Awaitable["NodeColdtag"]]]
 
     @strawberry.field
-    async def node_coldtag(self) -> "NodeColdtag":
-        return await self._node_coldtag
+    async def node_coldtag(self, info: strawberry.Info["AppContext"]) -> "NodeColdtag":
+        return await self._node_coldtag(info)
 
-    _core_coldtag: strawberry.Private[Awaitable[CoreColdtag]]
+    _core_coldtag: strawberry.Private[Callable[[strawberry.Info["AppContext"]], Awaitable[CoreColdtag]]]
 
     @strawberry.field
-    async def core_coldtag(self) -> CoreColdtag:
-        return await self._core_coldtag
+    async def core_coldtag(self, info: strawberry.Info["AppContext"]) -> CoreColdtag:
+        return await self._core_coldtag(info)
 
-    _coordinate: strawberry.Private[Awaitable[Coordinate | None]]
+    _coordinate: strawberry.Private[Callable[[strawberry.Info["AppContext"]], Awaitable[Coordinate | None]]]
 
     @strawberry.field
-    async def coordinate(self) -> Coordinate | None:
-        return await self._coordinate
+    async def coordinate(self, info: strawberry.Info["AppContext"]) -> Coordinate | None:
+        return await self._coordinate(info)
 
     temperature: float
     core_coldtag_received_time: datetime
@@ -55,22 +60,25 @@ class RouteCycleAlertTemperatureEvent:
     time: datetime
 
 
-async def resolve_route_cycle_alert_temperature_event(
-    alert_temperature_event: PersistedRouteCycleAlertTemperatureEvent, /, info: strawberry.Info["AppContext"]
+def resolve_route_cycle_alert_temperature_event(
+    alert_temperature_event: PersistedRouteCycleAlertTemperatureEvent, /
 ) -> RouteCycleAlertTemperatureEvent:
-    async def __node_coldtag() -> NodeColdtag:
-        coldtag = await alert_temperature_event.node_coldtag
-        return await resolve_node_coldtag(coldtag, info=info)
-
-    async def __core_coldtag() -> CoreColdtag:
-        coldtag = await alert_temperature_event.core_coldtag
-        return await resolve_core_coldtag(coldtag, info=info)
-
-    async def __coordinate() -> Coordinate | None:
-        core_coldtag_persistence = info.context.core_coldtag_persistence
-        core_coldtag = await alert_temperature_event.core_coldtag
-        closest_event = await core_coldtag_persistence.find_core_event_by_closest_time(
-            core_coldtag.id, time=alert_temperature_event.event_time
+    async def __node_coldtag(info: strawberry.Info["AppContext"]) -> NodeColdtag:
+        coldtag = await info.context.node_coldtag_loader.load(alert_temperature_event.node_coldtag_id)
+        assert coldtag is not None
+        return resolve_node_coldtag(coldtag)
+
+    async def __core_coldtag(info: strawberry.Info["AppContext"]) -> CoreColdtag:
+        coldtag = await info.context.core_coldtag_loader.load(alert_temperature_event.core_coldtag_id)
+        assert coldtag is not None
+        return resolve_core_coldtag(coldtag)
+
+    async def __coordinate(info: strawberry.Info["AppContext"]) -> Coordinate | None:
+        if alert_temperature_event.latitude is not None and alert_temperature_event.longitude is not None:
+            return Coordinate(latitude=alert_temperature_event.latitude, longitude=alert_temperature_event.longitude)
+
+        closest_event = await info.context.closest_core_coldtag_event_loader.load(
+            (alert_temperature_event.core_coldtag_id, alert_temperature_event.event_time)
         )
         if closest_event is None:
             return None
@@ -82,9 +90,9 @@ async def resolve_route_cycle_alert_temperature_event(
 
     return RouteCycleAlertTemperatureEvent(
         id=strawberry.scalars.ID(alert_temperature_event.id),
-        _node_coldtag=__node_coldtag(),
-        _core_coldtag=__core_coldtag(),
-        _coordinate=__coordinate(),
+        _node_coldtag=__node_coldtag,
+        _core_coldtag=__core_coldtag,
+        _coordinate=__coordinate,
         temperature=alert_temperature_event.temperature,
         core_coldtag_received_time=alert_temperature_event.core_coldtag_received_time,
         event_time=alert_temperature_event.event_time,
@@ -96,23 +104,23 @@ async def resolve_route_cycle_alert_temperature_event(
 class RouteCycleAlertHumidityEvent:
     id: strawberry.scalars.ID
 
-    _node_coldtag: strawberry.Private[Awaitable["NodeColdtag"]]
+    _node_coldtag: strawberry.Private[Callable[[strawberry.Info["AppContext"]], Awaitable["NodeColdtag"]]]
 
     @strawberry.field
-    async def node_coldtag(self) -> "NodeColdtag":
-        return await self._node_coldtag
+    async def node_coldtag(self, info: strawberry.Info["AppContext"]) -> "NodeColdtag":
+        return await self._node_coldtag(info)
 
-    _core_coldtag: strawberry.Private[Awaitable[CoreColdtag]]
+    _core_coldtag: strawberry.Private[Callable[[strawberry.Info["AppContext"]], Awaitable[CoreColdtag]]]
 
     @strawberry.field
-    async def core_coldtag(self) -> CoreColdtag:
-        return await self._core_coldtag
+    async def core_coldtag(self, info: strawberry.Info["AppContext"]) -> CoreColdtag:
+        return await self._core_coldtag(info)
 
-    _coordinate: strawberry.Private[Awaitable[Coordinate | None]]
+    _coordinate: strawberry.Private[Callable[[strawberry.Info["AppContext"]], Awaitable[Coordinate | None]]]
 
     @strawberry.field
-    async def coordinate(self) -> Coordinate | None:
-        return await self._coordinate
+    async def coordinate(self, info: strawberry.Info["AppContext"]) -> Coordinate | None:
+        return await self._coordinate(info)
 
     humidity: float
     core_coldtag_received_time: datetime
@@ -120,22 +128,25 @@ class RouteCycleAlertHumidityEvent:
     time: datetime
 
 
-async def resolve_route_cycle_alert_humidity_event(
-    alert_humidity_event: PersistedRouteCycleAlertHumidityEvent, /, info: strawberry.Info["AppContext"]
+def resolve_route_cycle_alert_humidity_event(
+    alert_humidity_event: PersistedRouteCycleAlertHumidityEvent, /
 ) -> RouteCycleAlertHumidityEvent:
-    async def __node_coldtag() -> NodeColdtag:
-        coldtag = await alert_humidity_event.node_coldtag
-        return await resolve_node_coldtag(coldtag, info=info)
-
-    async def __core_coldtag() -> CoreColdtag:
-        coldtag = await alert_humidity_event.core_coldtag
-        return await resolve_core_coldtag(coldtag, info=info)
-
-    async def __coordinate() -> Coordinate | None:
-        core_coldtag_persistence = info.context.core_coldtag_persistence
-        core_coldtag = await alert_humidity_event.core_coldtag
-        closest_event = await core_coldtag_persistence.find_core_event_by_closest_time(
-            core_coldtag.id, time=alert_humidity_event.event_time
+    async def __node_coldtag(info: strawberry.Info["AppContext"]) -> NodeColdtag:
+        coldtag = await info.context.node_coldtag_loader.load(alert_humidity_event.node_coldtag_id)
+        assert coldtag is not None
+        return resolve_node_coldtag(coldtag)
+
+    async def __core_coldtag(info: strawberry.Info["AppContext"]) -> CoreColdtag:
+        coldtag = await info.context.core_coldtag_loader.load(alert_humidity_event.core_coldtag_id)
+        assert coldtag is not None
+        return resolve_core_coldtag(coldtag)
+
+    async def __coordinate(info: strawberry.Info["AppContext"]) -> Coordinate | None:
+        if alert_humidity_event.latitude is not None and alert_humidity_event.longitude is not None:
+            return Coordinate(latitude=alert_humidity_event.latitude, longitude=alert_humidity_event.longitude)
+
+        closest_event = await info.context.closest_core_coldtag_event_loader.load(
+            (alert_humidity_event.core_coldtag_id, alert_humidity_event.event_time)
         )
         if closest_event is None:
             return None
@@ -147,9 +158,9 @@ async def resolve_route_cycle_alert_humidity_event(
 
     return RouteCycleAlertHumidityEvent(
         id=strawberry.scalars.ID(alert_humidity_event.id),
-        _node_coldtag=__node_coldtag(),
-        _core_coldtag=__core_coldtag(),
-        _coordinate=__coordinate(),
+        _node_coldtag=__node_coldtag,
+        _core_coldtag=__core_coldtag,
+        _coordinate=__coordinate,
         humidity=alert_humidity_event.humidity,
         core_coldtag_received_time=alert_humidity_event.core_coldtag_received_time,
         event_time=alert_humidity_event.event_time,
@@ -161,11 +172,11 @@ async def resolve_route_cycle_alert_humidity_event(
 class RouteCycle:
     id: strawberry.scalars.ID
 
-    _node_coldtag: strawberry.Private[Awaitable[NodeColdtag]]
+    _node_coldtag: strawberry.Private[Callable[[strawberry.Info["AppContext"]], Awaitable[NodeColdtag]]]
 
     @strawberry.field
-    async def node_coldtag(self) -> NodeColdtag:
-        return await self._node_coldtag
+    async def node_coldtag(self, info: strawberry.Info["AppContext"]) -> NodeColdtag:
+        return await self._node_coldtag(info)
 
     identifier: str | None
     description: str | None
@@ -181,72 +192,198 @@ class RouteCycle:
     dispatch_time: datetime | None
     completion_time: datetime | None
 
-    _telemetry_events: strawberry.Private[Awaitable[list[NodeColdtagEvent]]]
+    _telemetry_events: strawberry.Private[Callable[[strawberry.Info["AppContext"]], Awaitable[list[NodeColdtagEvent]]]]
 
     @strawberry.field
-    async def telemetry_events(self) -> list[NodeColdtagEvent]:
-        return await self._telemetry_events
+    async def telemetry_events(self, info: strawberry.Info["AppContext"]) -> list[NodeColdtagEvent]:
+        return await self._telemetry_events(info)
 
-    _alert_liquid_events: strawberry.Private[Awaitable[list[NodeColdtagEventAlertLiquid]]]
+    _node_coldtag_id: strawberry.Private[str]
 
     @strawberry.field
-    async def alert_liquid_events(self) -> list[NodeColdtagEventAlertLiquid]:
-        return await self._alert_liquid_events
+    async def telemetry_events_connection(
+        self,
+        info: strawberry.Info["AppContext"],
+        first: int | None = None,
+        after: str | None = None,
+        last: int | None = None,
+        before: str | None = None,
+    ) -> Connection[NodeColdtagEvent]:
+        if self.dispatch_time is None:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST)
+
+        page = event_page(first=first, after=after, last=last, before=before)
+        persisted_events = await info.context.node_coldtag_persistence.find_node_events_page(
+            self._node_coldtag_id, page=page, a=self.dispatch_time, b=self.completion_time
+        )
+        return resolve_connection(page, persisted_events, resolve=resolve_node_coldtag_event)
+
+    @strawberry.field
+    async def telemetry_rollups(
+        self,
+        info: strawberry.Info["AppContext"],
+        resolution: TelemetryResolution = TelemetryResolution.AUTO,
+        max_points: int = 500,
+    ) -> list[NodeColdtagEventRollup]:
+        if self.dispatch_time is None:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST)
+
+        node_coldtag_persistence = info.context.node_coldtag_persistence
+        persisted_rollups = await node_coldtag_persistence.find_node_event_rollups_by_time_range(
+            self._node_coldtag_id,
+            resolution=resolve_telemetry_resolution(
+                resolution, self.dispatch_time, self.completion_time, max_points=max_points
+            ),
+            dispatch_time=self.dispatch_time,
+            completion_time=self.completion_time,
+        )
+        return [resolve_node_coldtag_event_rollup(rollup) for rollup in persisted_rollups]
+
+    _alert_liquid_events: strawberry.Private[
+        Callable[[strawberry.Info["AppContext"]], Awaitable[list[NodeColdtagEventAlertLiquid]]]
+    ]
+
+    @strawberry.field
+    async def alert_liquid_events(self, info: strawberry.Info["AppContext"]) -> list[NodeColdtagEventAlertLiquid]:
+        return await self._alert_liquid_events(info)
 
-    _alert_impact_events: strawberry.Private[Awaitable[list[NodeColdtagEventAlertImpact]]]
+    @strawberry.field
+    async def alert_liquid_events_connection(
+        self,
+        info: strawberry.Info["AppContext"],
+        first: int | None = None,
+        after: str | None = None,
+        last: int | None = None,
+        before: str | None = None,
+    ) -> Connection[NodeColdtagEventAlertLiquid]:
+        if self.dispatch_time is None:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST)
+
+        page = event_page(first=first, after=after, last=last, before=before)
+        persisted_events = await info.context.node_coldtag_persistence.find_node_event_alert_liquids_page(
+            self._node_coldtag_id, page=page, a=self.dispatch_time, b=self.completion_time
+        )
+        return resolve_connection(page, persisted_events, resolve=resolve_node_coldtag_event_alert_liquid)
+
+    _alert_impact_events: strawberry.Private[
+        Callable[[strawberry.Info["AppContext"]], Awaitable[list[NodeColdtagEventAlertImpact]]]
+    ]
 
     @strawberry.field
-    async def alert_impact_events(self) -> list[NodeColdtagEventAlertImpact]:
-        return await self._alert_impact_events
+    async def alert_impact_events(self, info: strawberry.Info["AppContext"]) -> list[NodeColdtagEventAlertImpact]:
+        return await self._alert_impact_events(info)
+
+    @strawberry.field
+    async def alert_impact_events_connection(
+        self,
+        info: strawberry.Info["AppContext"],
+        first: int | None = None,
+        after: str | None = None,
+        last: int | None = None,
+        before: str | None = None,
+    ) -> Connection[NodeColdtagEventAlertImpact]:
+        if self.dispatch_time is None:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST)
+
+        page = event_page(first=first, after=after, last=last, before=before)
+        persisted_events = await info.context.node_coldtag_persistence.find_node_event_alert_impacts_page(
+            self._node_coldtag_id, page=page, a=self.dispatch_time, b=self.completion_time
+        )
+        return resolve_connection(page, persisted_events, resolve=resolve_node_coldtag_event_alert_impact)
+
+    _alert_temperature_events: strawberry.Private[
+        Callable[[strawberry.Info["AppContext"]], Awaitable[list[RouteCycleAlertTemperatureEvent]]]
+    ]
 
-    _alert_temperature_events: strawberry.Private[Awaitable[list[RouteCycleAlertTemperatureEvent]]]
+    @strawberry.field
+    async def alert_temperature_events(
+        self, info: strawberry.Info["AppContext"]
+    ) -> list[RouteCycleAlertTemperatureEvent]:
+        return await self._alert_temperature_events(info)
 
     @strawberry.field
-    async def alert_temperature_events(self) -> list[RouteCycleAlertTemperatureEvent]:
-        return await self._alert_temperature_events
+    async def alert_temperature_events_connection(
+        self,
+        info: strawberry.Info["AppContext"],
+        first: int | None = None,
+        after: str | None = None,
+        last: int | None = None,
+        before: str | None = None,
+    ) -> Connection[RouteCycleAlertTemperatureEvent]:
+        page = event_page(first=first, after=after, last=last, before=before)
+        persisted_events = await info.context.route_cycle_persistence.find_alert_temperature_events_page(
+            self.id, page=page
+        )
+        return resolve_connection(page, persisted_events, resolve=resolve_route_cycle_alert_temperature_event)
 
-    _alert_humidity_events: strawberry.Private[Awaitable[list[RouteCycleAlertHumidityEvent]]]
+    _alert_humidity_events: strawberry.Private[
+        Callable[[strawberry.Info["AppContext"]], Awaitable[list[RouteCycleAlertHumidityEvent]]]
+    ]
 
     @strawberry.field
-    async def alert_humidity_events(self) -> list[RouteCycleAlertHumidityEvent]:
-        return await self._alert_humidity_events
+    async def alert_humidity_events(self, info: strawberry.Info["AppContext"]) -> list[RouteCycleAlertHumidityEvent]:
+        return await self._alert_humidity_events(info)
+
+    @strawberry.field
+    async def alert_humidity_events_connection(
+        self,
+        info: strawberry.Info["AppContext"],
+        first: int | None = None,
+        after: str | None = None,
+        last: int | None = None,
+        before: str | None = None,
+    ) -> Connection[RouteCycleAlertHumidityEvent]:
+        page = event_page(first=first, after=after, last=last, before=before)
+        persisted_events = await info.context.route_cycle_persistence.find_alert_humidity_events_page(
+            self.id, page=page
+        )
+        return resolve_connection(page, persisted_events, resolve=resolve_route_cycle_alert_humidity_event)
 
     created_time: datetime
     updated_time: datetime
 
 
-async def resolve_route_cycle(route_cycle: PersistedRouteCycle, /, info: strawberry.Info["AppContext"]) -> RouteCycle:
-    async def __node_coldtag() -> NodeColdtag:
-        node_coldtag = await route_cycle.node_coldtag
-        return await resolve_node_coldtag(node_coldtag, info=info)
+def resolve_route_cycle(route_cycle: PersistedRouteCycle, /) -> RouteCycle:
+    async def __node_coldtag(info: strawberry.Info["AppContext"]) -> NodeColdtag:
+        node_coldtag = await info.context.node_coldtag_loader.load(route_cycle.node_coldtag_id)
+        assert node_coldtag is not None
+        return resolve_node_coldtag(node_coldtag)
 
-    async def __telemetry_events() -> list[NodeColdtagEvent]:
-        persisted_events = await route_cycle.telemetry_events
-        return await asyncio.gather(*[resolve_node_coldtag_event(event, info=info) for event in persisted_events])
+    # The unbounded lists are kept for the web client, the *_connection fields page the same events
 
-    async def __alert_liquid_events() -> list[NodeColdtagEventAlertLiquid]:
-        persisted_events = await route_cycle.alert_liquid_events
-        return await asyncio.gather(
-            *[resolve_node_coldtag_event_alert_liquid(event, info=info) for event in persisted_events]
-        )
+    def __time_range() -> tuple[str, datetime, datetime | None]:
+        if route_cycle.dispatch_time is None:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST)
 
-    async def __alert_impact_events() -> list[NodeColdtagEventAlertImpact]:
-        persisted_events = await route_cycle.alert_impact_events
-        return await asyncio.gather(
-            *[resolve_node_coldtag_event_alert_impact(event, info=info) for event in persisted_events]
-        )
+        return (route_cycle.node_coldtag_id, route_cycle.dispatch_time, route_cycle.completion_time)
 
-    async def __alert_temperature_events() -> list[RouteCycleAlertTemperatureEvent]:
-        persisted_events = await route_cycle.alert_temperature_events
-        return await asyncio.gather(
-            *[resolve_route_cycle_alert_temperature_event(event, info=info) for event in persisted_events]
-        )
+    async def __telemetry_events(info: strawberry.Info["AppContext"]) -> list[NodeColdtagEvent]:
+        persisted_events = await info.context.node_coldtag_events_by_time_range_loader.load(__time_range())
+        return [resolve_node_coldtag_event(event) for event in persisted_events]
 
-    async def __alert_humidity_events() -> list[RouteCycleAlertHumidityEvent]:
-        persisted_events = await route_cycle.alert_humidity_events
-        return await asyncio.gather(
-            *[resolve_route_cycle_alert_humidity_event(event, info=info) for event in persisted_events]
-        )
+    async def __alert_liquid_events(info: strawberry.Info["AppContext"]) -> list[NodeColdtagEventAlertLiquid]:
+        loader = info.context.node_coldtag_event_alert_liquids_by_time_range_loader
+        persisted_events = await loader.load(__time_range())
+        return [resolve_node_coldtag_event_alert_liquid(event) for event in persisted_events]
+
+    async def __alert_impact_events(info: strawberry.Info["AppContext"]) -> list[NodeColdtagEventAlertImpact]:
+        loader = info.context.node_coldtag_event_alert_impacts_by_time_range_loader
+        persisted_events = await loader.load(__time_range())
+        return [resolve_node_coldtag_event_alert_impact(event) for event in persisted_events]
+
+    async def __alert_temperature_events(info: strawberry.Info["AppContext"]) -> list[RouteCycleAlertTemperatureEvent]:
+        if route_cycle.temperature_alert_threshold is None:
+            return []
+
+        persisted_events = await info.context.route_cycle_alert_temperature_events_loader.load(route_cycle.id)
+        return [resolve_route_cycle_alert_temperature_event(event) for event in persisted_events]
+
+    async def __alert_humidity_events(info: strawberry.Info["AppContext"]) -> list[RouteCycleAlertHumidityEvent]:
+        if route_cycle.humidity_alert_threshold is None:
+            return []
+
+        persisted_events = await info.context.route_cycle_alert_humidity_events_loader.load(route_cycle.id)
+        return [resolve_route_cycle_alert_humidity_event(event) for event in persisted_events]
 
     departure_coordinate = (
         Coordinate(latitude=route_cycle.departure_latitude, longitude=route_cycle.departure_longitude)
@@ -261,7 +398,7 @@ async def resolve_route_cycle(route_cycle: PersistedRouteCycle, /, info: strawbe
 
     return RouteCycle(
         id=strawberry.scalars.ID(route_cycle.id),
-        _node_coldtag=__node_coldtag(),
+        _node_coldtag=__node_coldtag,
         identifier=route_cycle.identifier,
         description=route_cycle.description,
         owner_name=route_cycle.owner_name,
@@ -275,11 +412,12 @@ async def resolve_route_cycle(route_cycle: PersistedRouteCycle, /, info: strawbe
         canceled=route_cycle.canceled,
         dispatch_time=route_cycle.dispatch_time,
         completion_time=route_cycle.completion_time,
-        _telemetry_events=__telemetry_events(),
-        _alert_liquid_events=__alert_liquid_events(),
-        _alert_impact_events=__alert_impact_events(),
-        _alert_temperature_events=__alert_temperature_events(),
-        _alert_humidity_events=__alert_humidity_events(),
+        _telemetry_events=__telemetry_events,
+        _node_coldtag_id=route_cycle.node_coldtag_id,
+        _alert_liquid_events=__alert_liquid_events,
+        _alert_impact_events=__alert_impact_events,
+        _alert_temperature_events=__alert_temperature_events,
+        _alert_humidity_events=__alert_humidity_events,
         created_time=route_cycle.created_time,
         updated_time=route_cycle.updated_time,
     )
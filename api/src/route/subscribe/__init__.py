@@ -0,0 +1,24 @@
+import os
+
+from strawberry.tools import merge_types
+
+from .hub import LiveHub
+from .node_coldtag_telemetry import NodeColdtagTelemetrySubscription
+from .route_cycle_alert import RouteCycleAlertSubscription
+
+__all__ = [
+    "LIVE_SUBSCRIPTION_QUEUE_SIZE",
+    "LiveHub",
+    "SubscriptionSchema",
+]
+
+# Messages held per websocket subscription before its oldest are dropped
+LIVE_SUBSCRIPTION_QUEUE_SIZE: int = int(os.getenv("LIVE_SUBSCRIPTION_QUEUE_SIZE", "256"))
+
+SubscriptionSchema = merge_types(
+    name="SubscriptionSchema",
+    types=(
+        NodeColdtagTelemetrySubscription,
+        RouteCycleAlertSubscription,
+    ),
+)
@@ -0,0 +1,134 @@
+import asyncio
+from collections.abc import AsyncGenerator
+from typing import TYPE_CHECKING, Any
+
+import orjson
+from loguru import logger
+
+if TYPE_CHECKING:
+    from redis.asyncio import Redis
+
+
+class LiveHub:
+    def __init__(self, redis: "Redis", /, *, queue_size: int) -> None:
+        assert queue_size > 0
+
+        # One Redis subscription per channel and worker however many websockets follow it,
+        # each message is decoded once and handed to the queue of every local subscriber
+        self._pubsub = redis.pubsub(ignore_subscribe_messages=True)
+        self._queue_size = queue_size
+        self._subscribers: dict[str, set[asyncio.Queue[Any]]] = {}
+        self._lock = asyncio.Lock()
+        self._task: asyncio.Task | None = None
+
+        self.received = 0
+        self.delivered = 0
+        self.dropped = 0
+        self.malformed = 0
+
+    def __len__(self) -> int:
+        return sum(len(queues) for queues in self._subscribers.values())
+
+    async def _attach(self, channels: tuple[str, ...], queue: asyncio.Queue[Any], /) -> None:
+        async with self._lock:
+            added: list[str] = []
+            for channel in channels:
+                queues = self._subscribers.setdefault(channel, set())
+                if not queues:
+                    added.append(channel)
+                queues.add(queue)
+
+            if added:
+                await self._pubsub.subscribe(*added)
+
+            if self._task is None:
+                self._task = asyncio.create_task(self._read())
+                self._task.add_done_callback(self._read_done)
+
+    def _read_done(self, task: asyncio.Task, /) -> None:
+        # Should the reader ever stop on its own, the next subscriber starts a new one
+        if self._task is task:
+            self._task = None
+
+    async def _detach(self, channels: tuple[str, ...], queue: asyncio.Queue[Any], /) -> None:
+        async with self._lock:
+            removed: list[str] = []
+            for channel in channels:
+                queues = self._subscribers.get(channel)
+                if queues is None:
+                    continue
+
+                queues.discard(queue)
+                if not queues:
+                    del self._subscribers[channel]
+                    removed.append(channel)
+
+            if removed:
+                await self._pubsub.unsubscribe(*removed)
+
+    def _deliver(self, message: dict[str, Any], /) -> None:
+        channel = message["channel"].decode() if isinstance(message["channel"], bytes) else message["channel"]
+        queues = self._subscribers.get(channel)
+        if not queues:
+            return
+
+        self.received += 1
+        payload = orjson.loads(message["data"])
+
+        for queue in queues:
+            # A slow client loses its oldest messages rather than holding up the others
+            if queue.full():
+                queue.get_nowait()
+                self.dropped += 1
+
+            queue.put_nowait(payload)
+            self.delivered += 1
+
+    async def _read(self) -> None:
+        while True:
+            try:
+                message = await self._pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+
+            except Exception as err:
+                logger.exception(err)
+                await asyncio.sleep(1)
+                continue
+
+            if message is None or message["type"] != "message":
+                continue
+
+            # A bad payload costs that message only, the reader carries on with the next
+            try:
+                self._deliver(message)
+
+            except Exception as err:
+                self.malformed += 1
+                logger.exception(err)
+
+    async def subscribe(self, *channels: str) -> AsyncGenerator[Any, None]:
+        queue: asyncio.Queue[Any] = asyncio.Queue(maxsize=self._queue_size)
+        await self._attach(channels, queue)
+
+        try:
+            while True:
+                yield await queue.get()
+
+        finally:
+            await self._detach(channels, queue)
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+        await self._pubsub.aclose()
+
+    def metrics(self) -> dict[str, int]:
+        return {
+            "channels": len(self._subscribers),
+            "subscribers": len(self),
+            "received": self.received,
+            "delivered": self.delivered,
+            "dropped": self.dropped,
+            "malformed": self.malformed,
+        }
@@ -0,0 +1,23 @@
+from collections.abc import AsyncGenerator
+from typing import TYPE_CHECKING
+
+import strawberry
+from strawberry import Info
+
+from src.listener.publish import node_coldtag_telemetry_channel
+from src.route.resolve.live import LiveNodeColdtagEvent, resolve_live_node_coldtag_event
+
+if TYPE_CHECKING:
+    from src.route import AppContext
+
+
+@strawberry.type
+class NodeColdtagTelemetrySubscription:
+    @strawberry.subscription
+    async def node_coldtag_telemetry(
+        self, node_id: strawberry.scalars.ID, info: Info["AppContext"]
+    ) -> AsyncGenerator[LiveNodeColdtagEvent, None]:
+        live_hub = info.context.live_hub
+        async for payload in live_hub.subscribe(node_coldtag_telemetry_channel(node_id)):
+            for event in payload:
+                yield resolve_live_node_coldtag_event(event)
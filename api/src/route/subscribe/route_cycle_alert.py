@@ -0,0 +1,30 @@
+from collections.abc import AsyncGenerator
+from typing import TYPE_CHECKING
+
+import strawberry
+from strawberry import Info
+
+from src.listener.publish import ALERTS_CHANNEL, route_cycle_alerts_channel
+from src.route.resolve.live import LiveAlert, resolve_live_alert
+
+if TYPE_CHECKING:
+    from src.route import AppContext
+
+
+@strawberry.type
+class RouteCycleAlertSubscription:
+    @strawberry.subscription
+    async def route_cycle_alerts(
+        self, route_cycle_id: strawberry.scalars.ID, info: Info["AppContext"]
+    ) -> AsyncGenerator[LiveAlert, None]:
+        live_hub = info.context.live_hub
+        async for payload in live_hub.subscribe(route_cycle_alerts_channel(route_cycle_id)):
+            for alert in payload:
+                yield resolve_live_alert(alert)
+
+    @strawberry.subscription
+    async def alerts(self, info: Info["AppContext"]) -> AsyncGenerator[LiveAlert, None]:
+        live_hub = info.context.live_hub
+        async for payload in live_hub.subscribe(ALERTS_CHANNEL):
+            for alert in payload:
+                yield resolve_live_alert(alert)
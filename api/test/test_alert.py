@@ -0,0 +1,110 @@
+import asyncio
+from datetime import UTC, datetime, timedelta
+
+from src.listener.alert import ThresholdAlertEngine
+from src.persistence.node_coldtag import NodeColdtagEventCreateSchema
+from src.persistence.route_cycle import RouteCycleThresholdSchema
+
+DISPATCH = datetime(2024, 5, 1, tzinfo=UTC)
+
+
+def _threshold(**overrides: object) -> RouteCycleThresholdSchema:
+    return RouteCycleThresholdSchema(
+        **{
+            "route_cycle_id": 7,
+            "node_coldtag_id": 1,
+            "temperature_alert_threshold": 8.0,
+            "humidity_alert_threshold": 80.0,
+            "dispatch_time": DISPATCH,
+            **overrides,
+        }
+    )
+
+
+def _event(**overrides: object) -> NodeColdtagEventCreateSchema:
+    return NodeColdtagEventCreateSchema(
+        **{
+            "node_coldtag_id": 1,
+            "core_coldtag_id": 2,
+            "temperature": 4.0,
+            "humidity": 50.0,
+            "core_coldtag_received_time": DISPATCH + timedelta(hours=1),
+            "event_time": DISPATCH + timedelta(hours=1),
+            "latitude": None,
+            "longitude": None,
+            **overrides,
+        }
+    )
+
+
+def _engine(
+    *thresholds: list[RouteCycleThresholdSchema],
+) -> tuple[ThresholdAlertEngine, list[str]]:
+    pending = list(thresholds)
+    rebuilt: list[str] = []
+
+    async def find_thresholds() -> list[RouteCycleThresholdSchema]:
+        return pending.pop(0)
+
+    async def rebuild(route_cycle_id: str) -> None:
+        rebuilt.append(route_cycle_id)
+
+    return ThresholdAlertEngine(find_thresholds, rebuild, refresh_interval=60.0), rebuilt
+
+
+def test_reading_within_thresholds_raises_nothing() -> None:
+    engine, _ = _engine([_threshold()])
+    asyncio.run(engine.refresh())
+
+    assert engine.evaluate(_event()) == (None, None)
+    assert engine.metrics()["evaluated"] == 1
+
+
+def test_reading_at_thresholds_raises_both_alerts() -> None:
+    engine, _ = _engine([_threshold()])
+    asyncio.run(engine.refresh())
+
+    temperature, humidity = engine.evaluate(_event(temperature=8.0, humidity=90.0))
+
+    assert temperature is not None
+    assert (temperature.route_cycle_id, temperature.temperature, temperature.temperature_alert_threshold) == (
+        7,
+        8.0,
+        8.0,
+    )
+    assert humidity is not None
+    assert (humidity.route_cycle_id, humidity.humidity, humidity.humidity_alert_threshold) == (7, 90.0, 80.0)
+
+
+def test_unset_threshold_and_missing_reading_are_skipped() -> None:
+    engine, _ = _engine([_threshold(humidity_alert_threshold=None)])
+    asyncio.run(engine.refresh())
+
+    assert engine.evaluate(_event(temperature=None, humidity=99.0)) == (None, None)
+
+
+def test_reading_before_dispatch_or_without_route_cycle_is_ignored() -> None:
+    engine, _ = _engine([_threshold()])
+    asyncio.run(engine.refresh())
+
+    assert engine.evaluate(_event(temperature=20.0, event_time=DISPATCH - timedelta(seconds=1))) == (None, None)
+    assert engine.evaluate(_event(node_coldtag_id=3, temperature=20.0)) == (None, None)
+    assert engine.metrics()["evaluated"] == 0
+    assert engine.route_cycle_id(1) == 7
+    assert engine.route_cycle_id(3) is None
+
+
+def test_refresh_rebuilds_only_changed_route_cycles() -> None:
+    engine, rebuilt = _engine(
+        [_threshold(), _threshold(route_cycle_id=8, node_coldtag_id=2)],
+        [_threshold(temperature_alert_threshold=6.0), _threshold(route_cycle_id=8, node_coldtag_id=2)],
+    )
+
+    async def run() -> None:
+        await engine.refresh()
+        await engine.refresh()
+
+    asyncio.run(run())
+
+    assert rebuilt == ["7"]
+    assert len(engine) == 2
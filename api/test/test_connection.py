@@ -0,0 +1,101 @@
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from fastapi import HTTPException
+
+from src.persistence import EventKey, EventPage
+from src.route.resolve.connection import (
+    CONNECTION_DEFAULT_PAGE_SIZE,
+    CONNECTION_MAX_PAGE_SIZE,
+    decode_cursor,
+    encode_cursor,
+    event_page,
+    resolve_connection,
+)
+
+TIME = datetime(2024, 5, 1, tzinfo=UTC)
+
+
+@dataclass
+class _Event:
+    id: str
+    event_time: datetime
+
+
+def _events(*ids: int) -> list[_Event]:
+    return [_Event(id=str(i), event_time=TIME + timedelta(minutes=i)) for i in ids]
+
+
+def test_cursor_round_trips() -> None:
+    event = _events(42)[0]
+
+    assert decode_cursor(encode_cursor(event)) == EventKey(event_time=event.event_time, id=42)
+
+
+@pytest.mark.parametrize("cursor", ["not base64!", "aGVsbG8=", encode_cursor(_Event(id="x", event_time=TIME))])
+def test_malformed_cursor_is_bad_request(cursor: str) -> None:
+    with pytest.raises(HTTPException) as err:
+        decode_cursor(cursor)
+
+    assert err.value.status_code == 400
+
+
+def test_event_page_fetches_one_past_the_page() -> None:
+    cursor = encode_cursor(_events(1)[0])
+
+    assert event_page(first=10, after=cursor, last=None, before=None) == EventPage(
+        after=decode_cursor(cursor), before=None, limit=11, backward=False
+    )
+    assert event_page(first=None, after=None, last=5, before=cursor).backward
+    assert event_page(first=None, after=None, last=None, before=None).limit == CONNECTION_DEFAULT_PAGE_SIZE + 1
+    assert event_page(first=CONNECTION_MAX_PAGE_SIZE * 2, after=None, last=None, before=None).limit == (
+        CONNECTION_MAX_PAGE_SIZE + 1
+    )
+
+
+@pytest.mark.parametrize(("first", "last"), [(1, 1), (-1, None), (None, -1)])
+def test_event_page_rejects_invalid_sizes(first: int | None, last: int | None) -> None:
+    with pytest.raises(HTTPException) as err:
+        event_page(first=first, after=None, last=last, before=None)
+
+    assert err.value.status_code == 400
+
+
+def test_forward_page_drops_trailing_extra_row() -> None:
+    page = EventPage(after=None, before=None, limit=3)
+
+    connection = resolve_connection(page, _events(5, 4, 3), lambda event: event.id)
+
+    assert [edge.node for edge in connection.edges] == ["5", "4"]
+    assert connection.page_info.has_next_page
+    assert not connection.page_info.has_previous_page
+    assert connection.page_info.start_cursor == encode_cursor(_events(5)[0])
+    assert connection.page_info.end_cursor == encode_cursor(_events(4)[0])
+
+
+def test_backward_page_drops_leading_extra_row() -> None:
+    page = EventPage(after=None, before=None, limit=3, backward=True)
+
+    connection = resolve_connection(page, _events(5, 4, 3), lambda event: event.id)
+
+    assert [edge.node for edge in connection.edges] == ["4", "3"]
+    assert connection.page_info.has_previous_page
+    assert not connection.page_info.has_next_page
+
+
+def test_last_page_has_no_more() -> None:
+    page = EventPage(after=None, before=None, limit=3, backward=True)
+
+    connection = resolve_connection(page, _events(4, 3), lambda event: event.id)
+
+    assert [edge.node for edge in connection.edges] == ["4", "3"]
+    assert not connection.page_info.has_previous_page
+
+
+def test_empty_page_has_no_cursors() -> None:
+    connection = resolve_connection(EventPage(after=None, before=None, limit=3), [], lambda event: event)
+
+    assert connection.edges == []
+    assert connection.page_info.start_cursor is None
+    assert connection.page_info.end_cursor is None
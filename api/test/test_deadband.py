@@ -0,0 +1,75 @@
+from datetime import UTC, datetime, timedelta
+
+from src.listener.deadband import DeadbandFilter
+from src.persistence.node_coldtag import NodeColdtagEventCreateSchema
+
+TIME = datetime(2024, 5, 1, tzinfo=UTC)
+
+
+def _event(
+    minutes: float, /, temperature: float | None = 4.0, humidity: float | None = 50.0
+) -> NodeColdtagEventCreateSchema:
+    event_time = TIME + timedelta(minutes=minutes)
+    return NodeColdtagEventCreateSchema(
+        node_coldtag_id=1,
+        core_coldtag_id=2,
+        temperature=temperature,
+        humidity=humidity,
+        core_coldtag_received_time=event_time,
+        event_time=event_time,
+        latitude=None,
+        longitude=None,
+    )
+
+
+def _filter() -> DeadbandFilter:
+    return DeadbandFilter(temperature_delta=0.5, humidity_delta=2.0, max_interval=600.0)
+
+
+def test_unchanged_reading_is_dropped() -> None:
+    deadband = _filter()
+
+    assert deadband.keep(_event(0), excursion=False)
+    assert not deadband.keep(_event(1, temperature=4.4, humidity=51.9), excursion=False)
+    assert deadband.metrics() == {"kept": 1, "dropped": 1}
+
+
+def test_reading_past_delta_is_kept() -> None:
+    deadband = _filter()
+
+    assert deadband.keep(_event(0), excursion=False)
+    assert deadband.keep(_event(1, temperature=4.5), excursion=False)
+    assert deadband.keep(_event(2, temperature=4.5, humidity=48.0), excursion=False)
+
+
+def test_slow_drift_is_measured_against_last_kept_reading() -> None:
+    deadband = _filter()
+
+    assert deadband.keep(_event(0), excursion=False)
+    assert not deadband.keep(_event(1, temperature=4.3), excursion=False)
+    assert deadband.keep(_event(2, temperature=4.6), excursion=False)
+
+
+def test_reading_is_kept_after_max_interval() -> None:
+    deadband = _filter()
+
+    assert deadband.keep(_event(0), excursion=False)
+    assert not deadband.keep(_event(9), excursion=False)
+    assert deadband.keep(_event(10), excursion=False)
+
+
+def test_excursion_and_missing_value_are_kept() -> None:
+    deadband = _filter()
+
+    assert deadband.keep(_event(0), excursion=False)
+    assert deadband.keep(_event(1), excursion=True)
+    assert deadband.keep(_event(2, humidity=None), excursion=False)
+    assert not deadband.keep(_event(3, humidity=None), excursion=False)
+
+
+def test_out_of_order_reading_is_kept_without_moving_baseline() -> None:
+    deadband = _filter()
+
+    assert deadband.keep(_event(5), excursion=False)
+    assert deadband.keep(_event(1), excursion=False)
+    assert not deadband.keep(_event(6), excursion=False)
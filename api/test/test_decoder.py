@@ -0,0 +1,157 @@
+from datetime import UTC, datetime
+
+import orjson
+import pytest
+
+from src.listener.decoder import (
+    CORE_TELEMETRY_BINARY,
+    NODE_TELEMETRY_BINARY,
+    decode_core_telemetry,
+    decode_core_telemetry_binary,
+    decode_node_alert_impact,
+    decode_node_telemetry,
+    decode_node_telemetry_batch,
+    decode_node_telemetry_binary,
+    parse_timestamp,
+)
+
+CORE = "AA:BB:CC:DD:EE:FF"
+NODE = "11:22:33:44:55:66"
+TIME = datetime(2024, 5, 1, 12, 30, tzinfo=UTC)
+
+
+def _node_reading(**overrides: object) -> dict:
+    return {
+        "core_coldtag_mac_address": CORE,
+        "temperature": 4.5,
+        "humidity": 60,
+        "core_coldtag_received_time": "2024-05-01T12:30:00Z",
+        "event_time": "2024-05-01T12:30:00Z",
+        **overrides,
+    }
+
+
+def test_parse_timestamp_accepts_utc_seconds() -> None:
+    assert parse_timestamp("2024-05-01T12:30:00Z") == TIME
+
+
+@pytest.mark.parametrize("value", ["2024-05-01T12:30:00", "2024-05-01 12:30:00Z", "2024-05-01T12:30:00.000Z", 0])
+def test_parse_timestamp_rejects_other_formats(value: object) -> None:
+    with pytest.raises(ValueError, match="YYYY-MM-DDTHH:MM:SSZ"):
+        parse_timestamp(value)
+
+
+def test_decode_node_telemetry() -> None:
+    telemetry = decode_node_telemetry(NODE, orjson.dumps(_node_reading()))
+
+    assert telemetry.node_coldtag_mac_address == NODE
+    assert telemetry.core_coldtag_mac_address == CORE
+    assert telemetry.temperature == 4.5
+    assert telemetry.humidity == 60.0
+    assert isinstance(telemetry.humidity, float)
+    assert telemetry.event_time == TIME
+
+
+def test_decode_node_telemetry_rejects_bool_number() -> None:
+    with pytest.raises(TypeError, match="Expected number"):
+        decode_node_telemetry(NODE, orjson.dumps(_node_reading(temperature=True)))
+
+
+def test_decode_node_telemetry_rejects_missing_field() -> None:
+    reading = _node_reading()
+    del reading["humidity"]
+
+    with pytest.raises(KeyError):
+        decode_node_telemetry(NODE, orjson.dumps(reading))
+
+
+def test_decode_rejects_non_object_payload() -> None:
+    with pytest.raises(TypeError, match="JSON object"):
+        decode_node_telemetry(NODE, b"[]")
+
+
+def test_decode_rejects_non_json_payload_type() -> None:
+    with pytest.raises(TypeError, match="JSON payload"):
+        decode_node_telemetry(NODE, 1)
+
+
+def test_decode_core_telemetry() -> None:
+    payload = orjson.dumps({"latitude": 1.5, "longitude": -2, "event_time": "2024-05-01T12:30:00Z"})
+
+    telemetry = decode_core_telemetry(CORE, payload)
+
+    assert (telemetry.latitude, telemetry.longitude, telemetry.event_time) == (1.5, -2.0, TIME)
+
+
+def test_decode_node_alert_impact() -> None:
+    payload = orjson.dumps(
+        {
+            "core_coldtag_mac_address": CORE,
+            "core_coldtag_received_time": "2024-05-01T12:30:00Z",
+            "event_time": "2024-05-01T12:30:00Z",
+        }
+    )
+
+    alert = decode_node_alert_impact(NODE, payload)
+
+    assert (alert.node_coldtag_mac_address, alert.core_coldtag_mac_address, alert.event_time) == (NODE, CORE, TIME)
+
+
+def test_decode_node_telemetry_batch() -> None:
+    payload = orjson.dumps(
+        [
+            _node_reading(node_coldtag_mac_address=NODE),
+            _node_reading(node_coldtag_mac_address="22:33:44:55:66:77", temperature=5),
+        ]
+    )
+
+    batch = decode_node_telemetry_batch(CORE, payload)
+
+    assert batch.core_coldtag_mac_address == CORE
+    assert [reading.node_coldtag_mac_address for reading in batch.readings] == [NODE, "22:33:44:55:66:77"]
+    assert {reading.core_coldtag_mac_address for reading in batch.readings} == {CORE}
+    assert batch.readings[1].temperature == 5.0
+
+
+def test_decode_node_telemetry_batch_rejects_object() -> None:
+    with pytest.raises(TypeError, match="JSON array"):
+        decode_node_telemetry_batch(CORE, orjson.dumps(_node_reading()))
+
+
+def test_decode_node_telemetry_binary() -> None:
+    timestamp = int(TIME.timestamp())
+    payload = NODE_TELEMETRY_BINARY.pack(1, bytes.fromhex("aabbccddeeff"), 4.5, 60.0, timestamp, timestamp)
+
+    telemetry = decode_node_telemetry_binary(NODE, payload)
+
+    assert telemetry.core_coldtag_mac_address == "aa:bb:cc:dd:ee:ff"
+    assert (telemetry.temperature, telemetry.humidity) == (4.5, 60.0)
+    assert telemetry.core_coldtag_received_time == TIME
+    assert telemetry.event_time == TIME
+
+
+def test_decode_core_telemetry_binary() -> None:
+    payload = CORE_TELEMETRY_BINARY.pack(1, 1.5, -2.25, int(TIME.timestamp()))
+
+    telemetry = decode_core_telemetry_binary(CORE, payload)
+
+    assert (telemetry.latitude, telemetry.longitude, telemetry.event_time) == (1.5, -2.25, TIME)
+
+
+def test_decode_binary_rejects_wrong_size() -> None:
+    payload = CORE_TELEMETRY_BINARY.pack(1, 1.5, -2.25, 0)
+
+    with pytest.raises(ValueError, match=f"Expected {CORE_TELEMETRY_BINARY.size} bytes"):
+        decode_core_telemetry_binary(CORE, payload[:-1])
+
+
+def test_decode_binary_rejects_unknown_version() -> None:
+    payload = CORE_TELEMETRY_BINARY.pack(2, 1.5, -2.25, 0)
+
+    with pytest.raises(ValueError, match="version 2"):
+        decode_core_telemetry_binary(CORE, payload)
+
+
+def test_decode_binary_rejects_text_payload() -> None:
+    with pytest.raises(TypeError, match="binary payload"):
+        decode_core_telemetry_binary(CORE, "x" * CORE_TELEMETRY_BINARY.size)
@@ -0,0 +1,42 @@
+from datetime import UTC, datetime, timedelta
+
+from src.listener.dedup import DuplicateFilter
+
+TIME = datetime(2024, 5, 1, tzinfo=UTC)
+
+
+def test_repeated_event_time_is_duplicate() -> None:
+    duplicate_filter = DuplicateFilter(window=4)
+
+    assert not duplicate_filter.is_duplicate(1, TIME)
+    assert duplicate_filter.is_duplicate(1, TIME)
+    assert duplicate_filter.duplicates == 1
+
+
+def test_devices_are_tracked_separately() -> None:
+    duplicate_filter = DuplicateFilter(window=4)
+
+    assert not duplicate_filter.is_duplicate(1, TIME)
+    assert not duplicate_filter.is_duplicate(2, TIME)
+    assert duplicate_filter.metrics() == {"devices": 2, "duplicates": 0, "conflicts": 0}
+
+
+def test_window_evicts_oldest_event_time() -> None:
+    duplicate_filter = DuplicateFilter(window=2)
+
+    for minutes in range(3):
+        assert not duplicate_filter.is_duplicate(1, TIME + timedelta(minutes=minutes))
+
+    # The first reading fell out of the window, the last two are still remembered
+    assert not duplicate_filter.is_duplicate(1, TIME)
+    assert duplicate_filter.is_duplicate(1, TIME + timedelta(minutes=2))
+
+
+def test_duplicate_does_not_extend_window() -> None:
+    duplicate_filter = DuplicateFilter(window=2)
+
+    duplicate_filter.is_duplicate(1, TIME)
+    duplicate_filter.is_duplicate(1, TIME)
+    duplicate_filter.is_duplicate(1, TIME + timedelta(minutes=1))
+
+    assert duplicate_filter.is_duplicate(1, TIME)
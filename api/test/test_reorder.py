@@ -0,0 +1,107 @@
+import asyncio
+from datetime import UTC, datetime, timedelta
+
+from src.listener.reorder import ReorderBuffer
+from src.persistence.node_coldtag import NodeColdtagEventCreateSchema
+
+TIME = datetime(2024, 5, 1, tzinfo=UTC)
+
+
+def _event(node_id: int, seconds: int, /) -> NodeColdtagEventCreateSchema:
+    event_time = TIME + timedelta(seconds=seconds)
+    return NodeColdtagEventCreateSchema(
+        node_coldtag_id=node_id,
+        core_coldtag_id=2,
+        temperature=4.0,
+        humidity=50.0,
+        core_coldtag_received_time=event_time,
+        event_time=event_time,
+        latitude=None,
+        longitude=None,
+    )
+
+
+def _buffer(
+    lateness: float = 10.0,
+) -> tuple[ReorderBuffer, list[NodeColdtagEventCreateSchema], list[NodeColdtagEventCreateSchema]]:
+    emitted: list[NodeColdtagEventCreateSchema] = []
+    corrected: list[NodeColdtagEventCreateSchema] = []
+
+    async def emit(events: list[NodeColdtagEventCreateSchema]) -> None:
+        emitted.extend(events)
+
+    async def correct(events: list[NodeColdtagEventCreateSchema]) -> None:
+        corrected.extend(events)
+
+    return ReorderBuffer(emit, correct, lateness=lateness, interval=60.0), emitted, corrected
+
+
+def test_readings_are_emitted_in_event_time_order_behind_watermark() -> None:
+    buffer, emitted, _ = _buffer()
+
+    async def run() -> None:
+        await buffer.put_many([_event(1, 5), _event(1, 0), _event(1, 3)])
+        assert emitted == []
+
+        await buffer.put_many([_event(1, 13)])
+
+    asyncio.run(run())
+
+    assert emitted == [_event(1, 0), _event(1, 3)]
+    assert len(buffer) == 2
+
+
+def test_watermark_is_tracked_per_node() -> None:
+    buffer, emitted, _ = _buffer()
+
+    asyncio.run(buffer.put_many([_event(1, 0), _event(1, 20), _event(2, 5)]))
+
+    assert emitted == [_event(1, 0)]
+    assert len(buffer) == 2
+
+
+def test_reading_behind_emitted_is_sent_as_correction() -> None:
+    buffer, emitted, corrected = _buffer()
+
+    async def run() -> None:
+        await buffer.put_many([_event(1, 5), _event(1, 20)])
+        await buffer.put_many([_event(1, 2), _event(1, 5), _event(1, 8)])
+
+    asyncio.run(run())
+
+    assert emitted == [_event(1, 5), _event(1, 8)]
+    assert corrected == [_event(1, 2), _event(1, 5)]
+    assert buffer.metrics() == {"held": 1, "emitted": 2, "corrected": 2}
+
+
+def test_close_releases_held_readings_in_order() -> None:
+    buffer, emitted, _ = _buffer()
+
+    async def run() -> None:
+        await buffer.put_many([_event(1, 3), _event(2, 1), _event(1, 1)])
+        await buffer.close()
+
+    asyncio.run(run())
+
+    assert [(event.node_coldtag_id, event.event_time) for event in emitted] == [
+        (1, TIME + timedelta(seconds=1)),
+        (1, TIME + timedelta(seconds=3)),
+        (2, TIME + timedelta(seconds=1)),
+    ]
+    assert len(buffer) == 0
+
+
+def test_release_emits_readings_held_past_lateness() -> None:
+    buffer, emitted, _ = _buffer(lateness=0.01)
+
+    async def run() -> None:
+        await buffer.put_many([_event(1, 0)])
+        await buffer.release()
+        assert emitted == []
+
+        await asyncio.sleep(0.02)
+        await buffer.release()
+
+    asyncio.run(run())
+
+    assert emitted == [_event(1, 0)]
@@ -0,0 +1,84 @@
+import asyncio
+
+import pytest
+from aiomqtt import Message
+
+from src.listener.router import Handler, TopicRouter
+
+
+def _message(topic: str, /) -> Message:
+    return Message(topic, b"", qos=0, retain=False, mid=0, properties=None)
+
+
+def _router() -> tuple[TopicRouter, list[tuple[str, list[str]]]]:
+    router = TopicRouter()
+    calls: list[tuple[str, list[str]]] = []
+
+    def handler(name: str, /) -> Handler:
+        async def handle(topics: list[str], _: Message) -> None:
+            calls.append((name, topics))
+
+        return handle
+
+    router.add("node_event/+/telemetry", handler("telemetry"))
+    router.add("node_event/+/telemetry/bin", handler("telemetry_binary"))
+    router.add("node_event/+/alert/impact", handler("alert_impact"))
+    router.add("core_event/+/node_telemetry", handler("node_telemetry"))
+    return router, calls
+
+
+def test_dispatch_matches_single_level_wildcard() -> None:
+    router, calls = _router()
+
+    assert asyncio.run(router.dispatch(_message("node_event/AA:BB:CC:DD:EE:FF/telemetry")))
+    assert calls == [("telemetry", ["node_event", "AA:BB:CC:DD:EE:FF", "telemetry"])]
+
+
+def test_dispatch_tells_apart_filters_sharing_a_prefix() -> None:
+    router, calls = _router()
+
+    asyncio.run(router.dispatch(_message("node_event/AA/telemetry/bin")))
+    asyncio.run(router.dispatch(_message("node_event/AA/alert/impact")))
+    asyncio.run(router.dispatch(_message("core_event/BB/node_telemetry")))
+
+    assert [name for name, _ in calls] == ["telemetry_binary", "alert_impact", "node_telemetry"]
+
+
+@pytest.mark.parametrize(
+    "topic",
+    [
+        "node_event/AA/unknown",
+        "node_event/AA",
+        "node_event/AA/telemetry/bin/extra",
+        "other/AA/telemetry",
+    ],
+)
+def test_dispatch_ignores_unrouted_topics(topic: str) -> None:
+    router, calls = _router()
+
+    assert not asyncio.run(router.dispatch(_message(topic)))
+    assert calls == []
+
+
+def test_topic_filters_keep_registration_order() -> None:
+    router, _ = _router()
+
+    assert router.topic_filters == [
+        "node_event/+/telemetry",
+        "node_event/+/telemetry/bin",
+        "node_event/+/alert/impact",
+        "core_event/+/node_telemetry",
+    ]
+
+
+def test_add_rejects_duplicated_and_multi_level_filters() -> None:
+    router, _ = _router()
+
+    async def handle(_: list[str], __: Message) -> None:
+        return None
+
+    with pytest.raises(AssertionError):
+        router.add("node_event/+/telemetry", handle)
+
+    with pytest.raises(AssertionError):
+        router.add("node_event/#", handle)
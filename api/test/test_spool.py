@@ -0,0 +1,136 @@
+import asyncio
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import NamedTuple
+
+import asyncpg
+import pytest
+
+from src.listener.spool import Spool
+
+TIME = datetime(2024, 5, 1, tzinfo=UTC)
+
+
+class Reading(NamedTuple):
+    device_id: int
+    value: float
+    event_time: datetime
+
+
+def _spool(directory: Path, /, **overrides: float) -> Spool[Reading]:
+    options = {
+        "max_segment_size": 1 << 20,
+        "fsync_interval": 60.0,
+        "replay_interval": 60.0,
+        "replay_batch_size": 2,
+        "replay_max_attempts": 2,
+        **overrides,
+    }
+    return Spool(directory, schema=Reading, **options)
+
+
+def _readings(count: int, /) -> list[Reading]:
+    return [Reading(i, i / 2, TIME) for i in range(count)]
+
+
+def test_replay_round_trips_records_in_batches(tmp_path: Path) -> None:
+    spool = _spool(tmp_path)
+    batches: list[list[Reading]] = []
+
+    async def flush(items: list[Reading]) -> None:
+        batches.append(items)
+
+    async def run() -> int:
+        await spool.append(_readings(3))
+        return await spool.replay(flush)
+
+    assert asyncio.run(run()) == 3
+    assert batches == [_readings(3)[:2], _readings(3)[2:]]
+    assert isinstance(batches[0][0].event_time, datetime)
+    assert spool.metrics()["segments"] == 0
+    assert spool.metrics()["replayed"] == 3
+
+
+def test_segment_rolls_over_at_max_size(tmp_path: Path) -> None:
+    spool = _spool(tmp_path, max_segment_size=1)
+
+    async def run() -> None:
+        await spool.append(_readings(1))
+        await spool.append(_readings(1))
+
+    asyncio.run(run())
+
+    assert spool.metrics()["segments"] == 2
+
+
+def test_connection_error_keeps_segment(tmp_path: Path) -> None:
+    spool = _spool(tmp_path)
+
+    async def flush(_: list[Reading]) -> None:
+        raise asyncpg.PostgresConnectionError
+
+    async def run() -> None:
+        await spool.append(_readings(1))
+        await spool.replay(flush)
+
+    with pytest.raises(asyncpg.PostgresConnectionError):
+        asyncio.run(run())
+
+    assert spool.metrics()["segments"] == 1
+    assert spool.metrics()["replay_failures"] == 0
+
+
+def test_rejected_segment_is_quarantined_after_max_attempts(tmp_path: Path) -> None:
+    spool = _spool(tmp_path)
+    flushed: list[list[Reading]] = []
+
+    async def flush(items: list[Reading]) -> None:
+        if items[0].device_id == 0:
+            raise asyncpg.DataError
+
+        flushed.append(items)
+
+    async def run() -> int:
+        await spool.append(_readings(1))
+        with pytest.raises(asyncpg.DataError):
+            await spool.replay(flush)
+
+        # The poison segment no longer blocks the ones spooled after it
+        await spool.append([Reading(1, 0.5, TIME)])
+        return await spool.replay(flush)
+
+    assert asyncio.run(run()) == 1
+    assert flushed == [[Reading(1, 0.5, TIME)]]
+    assert spool.metrics()["segments"] == 0
+    assert spool.metrics()["quarantined"] == 1
+    assert len(list((tmp_path / "quarantine").iterdir())) == 1
+
+
+def test_replay_waits_for_probe(tmp_path: Path) -> None:
+    spool = _spool(tmp_path, replay_interval=0.01)
+    reachable = asyncio.Event()
+    flushed: list[Reading] = []
+
+    async def flush(items: list[Reading]) -> None:
+        flushed.extend(items)
+
+    async def probe() -> None:
+        if not reachable.is_set():
+            raise OSError
+
+    async def run() -> None:
+        await spool.append(_readings(1))
+        spool.start(flush, probe=probe)
+
+        await asyncio.sleep(0.05)
+        assert flushed == []
+        assert spool.metrics()["segments"] == 1
+
+        reachable.set()
+        await asyncio.sleep(0.05)
+        await spool.close()
+
+    asyncio.run(run())
+
+    assert flushed == _readings(1)
+    assert spool.metrics()["segments"] == 0
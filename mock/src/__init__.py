@@ -2,6 +2,7 @@ import asyncio
 import builtins
 import json
 import os
+import struct
 from collections.abc import AsyncGenerator, Callable, Coroutine
 from contextlib import asynccontextmanager, suppress
 from datetime import UTC, datetime
@@ -25,6 +26,16 @@ API_URL = "http://127.0.0.1:5000/graphql" if ENV == "development" else "http://1
 MQTT_HOST = "127.0.0.1"
 MQTT_PORT = 1883 if ENV == "development" else 58012
 
+PAYLOAD_FORMAT: Literal["json", "binary", "batch"] = cast(
+    "Literal['json', 'binary', 'batch']",
+    os.getenv("MOCK_PAYLOAD_FORMAT", "json"),
+)
+
+# Must be kept in sync with api/src/listener/decoder.py
+BINARY_PAYLOAD_VERSION = 1
+CORE_TELEMETRY_BINARY = struct.Struct("<BddI")
+NODE_TELEMETRY_BINARY = struct.Struct("<B6sffII")
+
 
 class AppMQTT(BaseModel):
     model_config = ConfigDict(arbitrary_types_allowed=True)
@@ -124,6 +135,19 @@ class AppMQTT(BaseModel):
 
     async def publish_core_event(self) -> asyncio.Task:
         async def create(core: AppMQTT.MockCore) -> None:
+            if PAYLOAD_FORMAT == "binary":
+                logger.info(f"Publishing core_event/{core.mac_address}/telemetry/bin")
+                await self.client.publish(
+                    topic=f"core_event/{core.mac_address}/telemetry/bin",
+                    payload=CORE_TELEMETRY_BINARY.pack(
+                        BINARY_PAYLOAD_VERSION,
+                        uniform(10.5, 75.5),
+                        uniform(10.5, 75.5),
+                        int(datetime.now(tz=UTC).timestamp()),
+                    ),
+                )
+                return
+
             logger.info(f"Publishing core_event/{core.mac_address}/telemetry")
             await self.client.publish(
                 topic=f"core_event/{core.mac_address}/telemetry",
@@ -145,7 +169,25 @@ class AppMQTT(BaseModel):
         )
 
     async def publish_node_event(self) -> asyncio.Task:
+        if PAYLOAD_FORMAT == "batch":
+            return await self.publish_core_event_node_telemetry()
+
         async def create(node: AppMQTT.MockNode) -> None:
+            if PAYLOAD_FORMAT == "binary":
+                logger.info(f"Publishing node_event/{node.mac_address}/telemetry/bin")
+                await self.client.publish(
+                    topic=f"node_event/{node.mac_address}/telemetry/bin",
+                    payload=NODE_TELEMETRY_BINARY.pack(
+                        BINARY_PAYLOAD_VERSION,
+                        bytes.fromhex(choice(self.core_devices).mac_address.replace(":", "")),
+                        uniform(10.5, 75.5),
+                        uniform(10.5, 75.5),
+                        int(datetime.now(tz=UTC).timestamp()),
+                        int(datetime.now(tz=UTC).timestamp()),
+                    ),
+                )
+                return
+
             logger.info(f"Publishing node_event/{node.mac_address}/telemetry")
             await self.client.publish(
                 topic=f"node_event/{node.mac_address}/telemetry",
@@ -168,6 +210,35 @@ class AppMQTT(BaseModel):
             )
         )
 
+    async def publish_core_event_node_telemetry(self) -> asyncio.Task:
+        async def create(core: AppMQTT.MockCore) -> None:
+            nodes = self.node_devices[self.core_devices.index(core) :: len(self.core_devices)]
+
+            logger.info(f"Publishing core_event/{core.mac_address}/node_telemetry")
+            await self.client.publish(
+                topic=f"core_event/{core.mac_address}/node_telemetry",
+                payload=json.dumps(
+                    [
+                        {
+                            "node_coldtag_mac_address": node.mac_address,
+                            "temperature": uniform(10.5, 75.5),
+                            "humidity": uniform(10.5, 75.5),
+                            "core_coldtag_received_time": datetime.now(tz=UTC).strftime("%Y-%m-%dT%H:%M:%SZ"),
+                            "event_time": datetime.now(tz=UTC).strftime("%Y-%m-%dT%H:%M:%SZ"),
+                        }
+                        for node in nodes
+                    ]
+                ),
+            )
+
+        return asyncio.create_task(
+            self._schedule_task(
+                lambda: 300,
+                self.core_devices,
+                create,
+            )
+        )
+
     async def publish_node_event_alert_impact(self) -> asyncio.Task:
         async def create(node: AppMQTT.MockNode) -> None:
             logger.info(f"Publishing node_event/{node.mac_address}/alert/impact")
@@ -0,0 +1,35 @@
+DELETE FROM "public"."core_coldtag_event" A USING "public"."core_coldtag_event" B
+WHERE
+  A.CORE_COLDTAG_ID = B.CORE_COLDTAG_ID
+  AND A.EVENT_TIME = B.EVENT_TIME
+  AND A.ID > B.ID;
+
+DELETE FROM "public"."node_coldtag_event" A USING "public"."node_coldtag_event" B
+WHERE
+  A.NODE_COLDTAG_ID = B.NODE_COLDTAG_ID
+  AND A.EVENT_TIME = B.EVENT_TIME
+  AND A.ID > B.ID;
+
+DELETE FROM "public"."node_coldtag_event_alert_liquid" A USING "public"."node_coldtag_event_alert_liquid" B
+WHERE
+  A.NODE_COLDTAG_ID = B.NODE_COLDTAG_ID
+  AND A.EVENT_TIME = B.EVENT_TIME
+  AND A.ID > B.ID;
+
+DELETE FROM "public"."node_coldtag_event_alert_impact" A USING "public"."node_coldtag_event_alert_impact" B
+WHERE
+  A.NODE_COLDTAG_ID = B.NODE_COLDTAG_ID
+  AND A.EVENT_TIME = B.EVENT_TIME
+  AND A.ID > B.ID;
+
+ALTER TABLE "public"."core_coldtag_event"
+ADD CONSTRAINT "core_coldtag_event_core_coldtag_id_event_time_key" UNIQUE ("core_coldtag_id", "event_time");
+
+ALTER TABLE "public"."node_coldtag_event"
+ADD CONSTRAINT "node_coldtag_event_node_coldtag_id_event_time_key" UNIQUE ("node_coldtag_id", "event_time");
+
+ALTER TABLE "public"."node_coldtag_event_alert_liquid"
+ADD CONSTRAINT "node_coldtag_event_alert_liquid_node_coldtag_id_event_time_key" UNIQUE ("node_coldtag_id", "event_time");
+
+ALTER TABLE "public"."node_coldtag_event_alert_impact"
+ADD CONSTRAINT "node_coldtag_event_alert_impact_node_coldtag_id_event_time_key" UNIQUE ("node_coldtag_id", "event_time");
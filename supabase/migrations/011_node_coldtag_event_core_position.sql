@@ -0,0 +1,17 @@
+ALTER TABLE "public"."node_coldtag_event"
+ADD COLUMN "latitude" DOUBLE PRECISION;
+
+ALTER TABLE "public"."node_coldtag_event"
+ADD COLUMN "longitude" DOUBLE PRECISION;
+
+ALTER TABLE "public"."node_coldtag_event_alert_liquid"
+ADD COLUMN "latitude" DOUBLE PRECISION;
+
+ALTER TABLE "public"."node_coldtag_event_alert_liquid"
+ADD COLUMN "longitude" DOUBLE PRECISION;
+
+ALTER TABLE "public"."node_coldtag_event_alert_impact"
+ADD COLUMN "latitude" DOUBLE PRECISION;
+
+ALTER TABLE "public"."node_coldtag_event_alert_impact"
+ADD COLUMN "longitude" DOUBLE PRECISION;
@@ -0,0 +1,103 @@
+CREATE TABLE "public"."route_cycle_alert_temperature" (
+  "id" SERIAL PRIMARY KEY,
+  "route_cycle_id" INT NOT NULL REFERENCES "create_route_cycle" (ID),
+  "node_coldtag_id" INT NOT NULL REFERENCES "create_node_coldtag" (ID),
+  "core_coldtag_id" INT NOT NULL REFERENCES "create_core_coldtag" (ID),
+  "temperature" DOUBLE PRECISION NOT NULL,
+  "temperature_alert_threshold" DOUBLE PRECISION NOT NULL,
+  "latitude" DOUBLE PRECISION,
+  "longitude" DOUBLE PRECISION,
+  "core_coldtag_received_time" TIMESTAMPTZ NOT NULL,
+  "event_time" TIMESTAMPTZ NOT NULL,
+  "time" TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP,
+  UNIQUE ("route_cycle_id", "event_time")
+);
+
+ALTER TABLE "public"."route_cycle_alert_temperature" ENABLE ROW LEVEL SECURITY;
+
+CREATE TABLE "public"."route_cycle_alert_humidity" (
+  "id" SERIAL PRIMARY KEY,
+  "route_cycle_id" INT NOT NULL REFERENCES "create_route_cycle" (ID),
+  "node_coldtag_id" INT NOT NULL REFERENCES "create_node_coldtag" (ID),
+  "core_coldtag_id" INT NOT NULL REFERENCES "create_core_coldtag" (ID),
+  "humidity" DOUBLE PRECISION NOT NULL,
+  "humidity_alert_threshold" DOUBLE PRECISION NOT NULL,
+  "latitude" DOUBLE PRECISION,
+  "longitude" DOUBLE PRECISION,
+  "core_coldtag_received_time" TIMESTAMPTZ NOT NULL,
+  "event_time" TIMESTAMPTZ NOT NULL,
+  "time" TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP,
+  UNIQUE ("route_cycle_id", "event_time")
+);
+
+ALTER TABLE "public"."route_cycle_alert_humidity" ENABLE ROW LEVEL SECURITY;
+
+INSERT INTO "public"."route_cycle_alert_temperature" (
+  ROUTE_CYCLE_ID,
+  NODE_COLDTAG_ID,
+  CORE_COLDTAG_ID,
+  TEMPERATURE,
+  TEMPERATURE_ALERT_THRESHOLD,
+  LATITUDE,
+  LONGITUDE,
+  CORE_COLDTAG_RECEIVED_TIME,
+  EVENT_TIME
+)
+SELECT
+  RC.ID,
+  NCE.NODE_COLDTAG_ID,
+  NCE.CORE_COLDTAG_ID,
+  NCE.TEMPERATURE,
+  RC.TEMPERATURE_ALERT_THRESHOLD,
+  NCE.LATITUDE,
+  NCE.LONGITUDE,
+  NCE.CORE_COLDTAG_RECEIVED_TIME,
+  NCE.EVENT_TIME
+FROM
+  PUBLIC.ROUTE_CYCLE RC
+  JOIN PUBLIC.NODE_COLDTAG_EVENT NCE ON NCE.NODE_COLDTAG_ID = RC.NODE_COLDTAG_ID
+WHERE
+  RC.DISPATCH_TIME IS NOT NULL
+  AND RC.TEMPERATURE_ALERT_THRESHOLD IS NOT NULL
+  AND NCE.EVENT_TIME >= RC.DISPATCH_TIME
+  AND (
+    RC.COMPLETION_TIME IS NULL
+    OR NCE.EVENT_TIME <= RC.COMPLETION_TIME
+  )
+  AND NCE.TEMPERATURE >= RC.TEMPERATURE_ALERT_THRESHOLD
+ON CONFLICT DO NOTHING;
+
+INSERT INTO "public"."route_cycle_alert_humidity" (
+  ROUTE_CYCLE_ID,
+  NODE_COLDTAG_ID,
+  CORE_COLDTAG_ID,
+  HUMIDITY,
+  HUMIDITY_ALERT_THRESHOLD,
+  LATITUDE,
+  LONGITUDE,
+  CORE_COLDTAG_RECEIVED_TIME,
+  EVENT_TIME
+)
+SELECT
+  RC.ID,
+  NCE.NODE_COLDTAG_ID,
+  NCE.CORE_COLDTAG_ID,
+  NCE.HUMIDITY,
+  RC.HUMIDITY_ALERT_THRESHOLD,
+  NCE.LATITUDE,
+  NCE.LONGITUDE,
+  NCE.CORE_COLDTAG_RECEIVED_TIME,
+  NCE.EVENT_TIME
+FROM
+  PUBLIC.ROUTE_CYCLE RC
+  JOIN PUBLIC.NODE_COLDTAG_EVENT NCE ON NCE.NODE_COLDTAG_ID = RC.NODE_COLDTAG_ID
+WHERE
+  RC.DISPATCH_TIME IS NOT NULL
+  AND RC.HUMIDITY_ALERT_THRESHOLD IS NOT NULL
+  AND NCE.EVENT_TIME >= RC.DISPATCH_TIME
+  AND (
+    RC.COMPLETION_TIME IS NULL
+    OR NCE.EVENT_TIME <= RC.COMPLETION_TIME
+  )
+  AND NCE.HUMIDITY >= RC.HUMIDITY_ALERT_THRESHOLD
+ON CONFLICT DO NOTHING;
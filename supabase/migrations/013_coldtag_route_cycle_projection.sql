@@ -0,0 +1,215 @@
+ALTER VIEW "public"."core_coldtag"
+RENAME TO "core_coldtag_derived";
+
+ALTER VIEW "public"."node_coldtag"
+RENAME TO "node_coldtag_derived";
+
+ALTER VIEW "public"."route_cycle"
+RENAME TO "route_cycle_derived";
+
+CREATE INDEX "update_core_coldtag_core_coldtag_id_time_idx" ON "public"."update_core_coldtag" ("core_coldtag_id", "time" DESC);
+
+CREATE INDEX "update_node_coldtag_node_coldtag_id_time_idx" ON "public"."update_node_coldtag" ("node_coldtag_id", "time" DESC);
+
+CREATE INDEX "update_route_cycle_route_cycle_id_time_idx" ON "public"."update_route_cycle" ("route_cycle_id", "time" DESC);
+
+CREATE TABLE "public"."core_coldtag_projection" (
+  "id" INT PRIMARY KEY REFERENCES "public"."create_core_coldtag" (ID),
+  "mac_address" TEXT UNIQUE NOT NULL,
+  "identifier" TEXT,
+  "deleted" BOOLEAN,
+  "created_time" TIMESTAMPTZ NOT NULL,
+  "updated_time" TIMESTAMPTZ NOT NULL
+);
+
+ALTER TABLE "public"."core_coldtag_projection" ENABLE ROW LEVEL SECURITY;
+
+CREATE TABLE "public"."node_coldtag_projection" (
+  "id" INT PRIMARY KEY REFERENCES "public"."create_node_coldtag" (ID),
+  "mac_address" TEXT UNIQUE NOT NULL,
+  "identifier" TEXT,
+  "deleted" BOOLEAN,
+  "created_time" TIMESTAMPTZ NOT NULL,
+  "updated_time" TIMESTAMPTZ NOT NULL
+);
+
+ALTER TABLE "public"."node_coldtag_projection" ENABLE ROW LEVEL SECURITY;
+
+CREATE TABLE "public"."route_cycle_projection" (
+  "id" INT PRIMARY KEY REFERENCES "public"."create_route_cycle" (ID),
+  "node_coldtag_id" INT NOT NULL REFERENCES "public"."create_node_coldtag" (ID),
+  "identifier" TEXT,
+  "description" TEXT,
+  "owner_name" TEXT,
+  "placed_at" TEXT,
+  "departure_latitude" DOUBLE PRECISION,
+  "departure_longitude" DOUBLE PRECISION,
+  "destination_latitude" DOUBLE PRECISION,
+  "destination_longitude" DOUBLE PRECISION,
+  "temperature_alert_threshold" DOUBLE PRECISION,
+  "humidity_alert_threshold" DOUBLE PRECISION,
+  "started" BOOLEAN,
+  "completed" BOOLEAN,
+  "dispatch_time" TIMESTAMPTZ,
+  "completion_time" TIMESTAMPTZ,
+  "canceled" BOOLEAN,
+  "created_time" TIMESTAMPTZ NOT NULL,
+  "updated_time" TIMESTAMPTZ NOT NULL
+);
+
+ALTER TABLE "public"."route_cycle_projection" ENABLE ROW LEVEL SECURITY;
+
+CREATE INDEX "route_cycle_projection_node_coldtag_id_idx" ON "public"."route_cycle_projection" ("node_coldtag_id", "id" DESC);
+
+CREATE INDEX "route_cycle_projection_active_idx" ON "public"."route_cycle_projection" ("node_coldtag_id")
+WHERE
+  "dispatch_time" IS NOT NULL
+  AND "completion_time" IS NULL;
+
+-- Each projection row is derived again from the create and update history of its entity
+-- whenever that history grows, the row lock serializes concurrent updates of one entity
+CREATE FUNCTION "public"."refresh_core_coldtag_projection"() RETURNS TRIGGER LANGUAGE PLPGSQL AS $$
+DECLARE
+  target INT := (TO_JSONB(NEW) ->> TG_ARGV[0])::INT;
+BEGIN
+  PERFORM 1 FROM "public"."create_core_coldtag" WHERE ID = target FOR UPDATE;
+
+  INSERT INTO "public"."core_coldtag_projection"
+  SELECT * FROM "public"."core_coldtag_derived" WHERE ID = target
+  ON CONFLICT (ID) DO UPDATE SET
+    MAC_ADDRESS = EXCLUDED.MAC_ADDRESS,
+    IDENTIFIER = EXCLUDED.IDENTIFIER,
+    DELETED = EXCLUDED.DELETED,
+    CREATED_TIME = EXCLUDED.CREATED_TIME,
+    UPDATED_TIME = EXCLUDED.UPDATED_TIME;
+
+  RETURN NULL;
+END;
+$$;
+
+CREATE FUNCTION "public"."refresh_node_coldtag_projection"() RETURNS TRIGGER LANGUAGE PLPGSQL AS $$
+DECLARE
+  target INT := (TO_JSONB(NEW) ->> TG_ARGV[0])::INT;
+BEGIN
+  PERFORM 1 FROM "public"."create_node_coldtag" WHERE ID = target FOR UPDATE;
+
+  INSERT INTO "public"."node_coldtag_projection"
+  SELECT * FROM "public"."node_coldtag_derived" WHERE ID = target
+  ON CONFLICT (ID) DO UPDATE SET
+    MAC_ADDRESS = EXCLUDED.MAC_ADDRESS,
+    IDENTIFIER = EXCLUDED.IDENTIFIER,
+    DELETED = EXCLUDED.DELETED,
+    CREATED_TIME = EXCLUDED.CREATED_TIME,
+    UPDATED_TIME = EXCLUDED.UPDATED_TIME;
+
+  RETURN NULL;
+END;
+$$;
+
+CREATE FUNCTION "public"."refresh_route_cycle_projection"() RETURNS TRIGGER LANGUAGE PLPGSQL AS $$
+DECLARE
+  target INT := (TO_JSONB(NEW) ->> TG_ARGV[0])::INT;
+BEGIN
+  PERFORM 1 FROM "public"."create_route_cycle" WHERE ID = target FOR UPDATE;
+
+  INSERT INTO "public"."route_cycle_projection"
+  SELECT * FROM "public"."route_cycle_derived" WHERE ID = target
+  ON CONFLICT (ID) DO UPDATE SET
+    NODE_COLDTAG_ID = EXCLUDED.NODE_COLDTAG_ID,
+    IDENTIFIER = EXCLUDED.IDENTIFIER,
+    DESCRIPTION = EXCLUDED.DESCRIPTION,
+    OWNER_NAME = EXCLUDED.OWNER_NAME,
+    PLACED_AT = EXCLUDED.PLACED_AT,
+    DEPARTURE_LATITUDE = EXCLUDED.DEPARTURE_LATITUDE,
+    DEPARTURE_LONGITUDE = EXCLUDED.DEPARTURE_LONGITUDE,
+    DESTINATION_LATITUDE = EXCLUDED.DESTINATION_LATITUDE,
+    DESTINATION_LONGITUDE = EXCLUDED.DESTINATION_LONGITUDE,
+    TEMPERATURE_ALERT_THRESHOLD = EXCLUDED.TEMPERATURE_ALERT_THRESHOLD,
+    HUMIDITY_ALERT_THRESHOLD = EXCLUDED.HUMIDITY_ALERT_THRESHOLD,
+    STARTED = EXCLUDED.STARTED,
+    COMPLETED = EXCLUDED.COMPLETED,
+    DISPATCH_TIME = EXCLUDED.DISPATCH_TIME,
+    COMPLETION_TIME = EXCLUDED.COMPLETION_TIME,
+    CANCELED = EXCLUDED.CANCELED,
+    CREATED_TIME = EXCLUDED.CREATED_TIME,
+    UPDATED_TIME = EXCLUDED.UPDATED_TIME;
+
+  RETURN NULL;
+END;
+$$;
+
+CREATE TRIGGER "create_core_coldtag_projection"
+AFTER INSERT ON "public"."create_core_coldtag" FOR EACH ROW
+EXECUTE FUNCTION "public"."refresh_core_coldtag_projection"('id');
+
+CREATE TRIGGER "update_core_coldtag_projection"
+AFTER INSERT ON "public"."update_core_coldtag" FOR EACH ROW
+EXECUTE FUNCTION "public"."refresh_core_coldtag_projection"('core_coldtag_id');
+
+CREATE TRIGGER "create_node_coldtag_projection"
+AFTER INSERT ON "public"."create_node_coldtag" FOR EACH ROW
+EXECUTE FUNCTION "public"."refresh_node_coldtag_projection"('id');
+
+CREATE TRIGGER "update_node_coldtag_projection"
+AFTER INSERT ON "public"."update_node_coldtag" FOR EACH ROW
+EXECUTE FUNCTION "public"."refresh_node_coldtag_projection"('node_coldtag_id');
+
+CREATE TRIGGER "create_route_cycle_projection"
+AFTER INSERT ON "public"."create_route_cycle" FOR EACH ROW
+EXECUTE FUNCTION "public"."refresh_route_cycle_projection"('id');
+
+CREATE TRIGGER "update_route_cycle_projection"
+AFTER INSERT ON "public"."update_route_cycle" FOR EACH ROW
+EXECUTE FUNCTION "public"."refresh_route_cycle_projection"('route_cycle_id');
+
+LOCK TABLE "public"."create_core_coldtag",
+"public"."update_core_coldtag",
+"public"."create_node_coldtag",
+"public"."update_node_coldtag",
+"public"."create_route_cycle",
+"public"."update_route_cycle" IN SHARE ROW EXCLUSIVE MODE;
+
+INSERT INTO "public"."core_coldtag_projection"
+SELECT
+  *
+FROM
+  "public"."core_coldtag_derived";
+
+INSERT INTO "public"."node_coldtag_projection"
+SELECT
+  *
+FROM
+  "public"."node_coldtag_derived";
+
+INSERT INTO "public"."route_cycle_projection"
+SELECT
+  *
+FROM
+  "public"."route_cycle_derived";
+
+CREATE OR REPLACE VIEW "public"."core_coldtag"
+WITH
+  (SECURITY_INVOKER = ON) AS (
+  SELECT
+    *
+  FROM
+    "public"."core_coldtag_projection"
+);
+
+CREATE OR REPLACE VIEW "public"."node_coldtag"
+WITH
+  (SECURITY_INVOKER = ON) AS (
+  SELECT
+    *
+  FROM
+    "public"."node_coldtag_projection"
+);
+
+CREATE OR REPLACE VIEW "public"."route_cycle"
+WITH
+  (SECURITY_INVOKER = ON) AS (
+  SELECT
+    *
+  FROM
+    "public"."route_cycle_projection"
+);
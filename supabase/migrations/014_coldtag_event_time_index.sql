@@ -0,0 +1,11 @@
+CREATE INDEX "core_coldtag_event_event_time_brin_idx" ON "public"."core_coldtag_event" USING BRIN ("event_time");
+
+CREATE INDEX "node_coldtag_event_event_time_brin_idx" ON "public"."node_coldtag_event" USING BRIN ("event_time");
+
+CREATE INDEX "node_coldtag_event_alert_liquid_event_time_brin_idx" ON "public"."node_coldtag_event_alert_liquid" USING BRIN ("event_time");
+
+CREATE INDEX "node_coldtag_event_alert_impact_event_time_brin_idx" ON "public"."node_coldtag_event_alert_impact" USING BRIN ("event_time");
+
+CREATE INDEX "route_cycle_alert_temperature_event_time_brin_idx" ON "public"."route_cycle_alert_temperature" USING BRIN ("event_time");
+
+CREATE INDEX "route_cycle_alert_humidity_event_time_brin_idx" ON "public"."route_cycle_alert_humidity" USING BRIN ("event_time");
@@ -0,0 +1,409 @@
+CREATE FUNCTION "public"."create_event_partition" ("parent" REGCLASS, "month" TIMESTAMPTZ) RETURNS TEXT LANGUAGE PLPGSQL AS $$
+DECLARE
+  lower_bound TIMESTAMPTZ := DATE_TRUNC('month', "month" AT TIME ZONE 'UTC') AT TIME ZONE 'UTC';
+  upper_bound TIMESTAMPTZ := lower_bound + INTERVAL '1 month';
+  parent_name TEXT := (SELECT RELNAME FROM PG_CLASS WHERE OID = "parent");
+  partition_name TEXT := parent_name || '_p' || TO_CHAR(lower_bound AT TIME ZONE 'UTC', 'YYYYMM');
+BEGIN
+  IF TO_REGCLASS(FORMAT('public.%I', partition_name)) IS NOT NULL THEN
+    RETURN NULL;
+  END IF;
+
+  -- Rows of the month that already landed in the default partition are moved over first,
+  -- attaching would otherwise fail on the default partition constraint
+  EXECUTE FORMAT('CREATE TABLE public.%I (LIKE public.%I INCLUDING DEFAULTS)', partition_name, parent_name);
+  EXECUTE FORMAT(
+    'WITH moved AS (DELETE FROM public.%I WHERE event_time >= $1 AND event_time < $2 RETURNING *) INSERT INTO public.%I SELECT * FROM moved',
+    parent_name || '_default',
+    partition_name
+  ) USING lower_bound, upper_bound;
+  EXECUTE FORMAT(
+    'ALTER TABLE public.%I ATTACH PARTITION public.%I FOR VALUES FROM (%L) TO (%L)',
+    parent_name,
+    partition_name,
+    lower_bound,
+    upper_bound
+  );
+  EXECUTE FORMAT('ALTER TABLE public.%I ENABLE ROW LEVEL SECURITY', partition_name);
+
+  RETURN partition_name;
+END;
+$$;
+
+CREATE FUNCTION "public"."drop_event_partitions" ("parent" REGCLASS, "retention" INTERVAL) RETURNS SETOF TEXT LANGUAGE PLPGSQL AS $$
+DECLARE
+  partition_name TEXT;
+BEGIN
+  FOR partition_name IN
+    SELECT
+      C.RELNAME
+    FROM
+      PG_INHERITS I
+      JOIN PG_CLASS C ON C.OID = I.INHRELID
+    WHERE
+      I.INHPARENT = "parent"
+      AND C.RELNAME ~ '_p[0-9]{6}$'
+      AND TO_DATE(RIGHT(C.RELNAME, 6), 'YYYYMM')::TIMESTAMP AT TIME ZONE 'UTC' + INTERVAL '1 month' <= NOW() - "retention"
+    ORDER BY
+      C.RELNAME
+  LOOP
+    EXECUTE FORMAT('ALTER TABLE %s DETACH PARTITION public.%I', "parent", partition_name);
+    EXECUTE FORMAT('DROP TABLE public.%I', partition_name);
+    RETURN NEXT partition_name;
+  END LOOP;
+END;
+$$;
+
+ALTER TABLE "public"."core_coldtag_event"
+RENAME TO "core_coldtag_event_legacy";
+
+CREATE TABLE "public"."core_coldtag_event" (
+  "id" INT NOT NULL DEFAULT NEXTVAL('public.core_coldtag_event_id_seq'),
+  "core_coldtag_id" INT NOT NULL REFERENCES "public"."create_core_coldtag" (ID),
+  "latitude" DOUBLE PRECISION,
+  "longitude" DOUBLE PRECISION,
+  "event_time" TIMESTAMPTZ NOT NULL,
+  "time" TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP
+)
+PARTITION BY
+  RANGE ("event_time");
+
+ALTER SEQUENCE "public"."core_coldtag_event_id_seq" OWNED BY "public"."core_coldtag_event"."id";
+
+CREATE TABLE "public"."core_coldtag_event_default" PARTITION OF "public"."core_coldtag_event" DEFAULT;
+
+SELECT
+  "public"."create_event_partition" ('"public"."core_coldtag_event"', M)
+FROM
+  GENERATE_SERIES(
+    DATE_TRUNC(
+      'month',
+      COALESCE(
+        (
+          SELECT
+            MIN(EVENT_TIME)
+          FROM
+            "public"."core_coldtag_event_legacy"
+        ),
+        NOW()
+      )
+    ),
+    NOW() + INTERVAL '2 months',
+    INTERVAL '1 month'
+  ) M;
+
+INSERT INTO "public"."core_coldtag_event" ("id", "core_coldtag_id", "latitude", "longitude", "event_time", "time")
+SELECT
+  "id", "core_coldtag_id", "latitude", "longitude", "event_time", "time"
+FROM
+  "public"."core_coldtag_event_legacy";
+
+DROP TABLE "public"."core_coldtag_event_legacy";
+
+ALTER TABLE "public"."core_coldtag_event"
+ADD PRIMARY KEY ("id", "event_time"),
+ADD CONSTRAINT "core_coldtag_event_core_coldtag_id_event_time_key" UNIQUE ("core_coldtag_id", "event_time");
+
+CREATE INDEX "core_coldtag_event_event_time_brin_idx" ON "public"."core_coldtag_event" USING BRIN ("event_time");
+
+ALTER TABLE "public"."core_coldtag_event" ENABLE ROW LEVEL SECURITY;
+
+ALTER TABLE "public"."core_coldtag_event_default" ENABLE ROW LEVEL SECURITY;
+
+ALTER TABLE "public"."node_coldtag_event"
+RENAME TO "node_coldtag_event_legacy";
+
+CREATE TABLE "public"."node_coldtag_event" (
+  "id" INT NOT NULL DEFAULT NEXTVAL('public.node_coldtag_event_id_seq'),
+  "node_coldtag_id" INT NOT NULL REFERENCES "public"."create_node_coldtag" (ID),
+  "core_coldtag_id" INT NOT NULL REFERENCES "public"."create_core_coldtag" (ID),
+  "temperature" DOUBLE PRECISION,
+  "humidity" DOUBLE PRECISION,
+  "core_coldtag_received_time" TIMESTAMPTZ NOT NULL,
+  "event_time" TIMESTAMPTZ NOT NULL,
+  "latitude" DOUBLE PRECISION,
+  "longitude" DOUBLE PRECISION,
+  "time" TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP
+)
+PARTITION BY
+  RANGE ("event_time");
+
+ALTER SEQUENCE "public"."node_coldtag_event_id_seq" OWNED BY "public"."node_coldtag_event"."id";
+
+CREATE TABLE "public"."node_coldtag_event_default" PARTITION OF "public"."node_coldtag_event" DEFAULT;
+
+SELECT
+  "public"."create_event_partition" ('"public"."node_coldtag_event"', M)
+FROM
+  GENERATE_SERIES(
+    DATE_TRUNC(
+      'month',
+      COALESCE(
+        (
+          SELECT
+            MIN(EVENT_TIME)
+          FROM
+            "public"."node_coldtag_event_legacy"
+        ),
+        NOW()
+      )
+    ),
+    NOW() + INTERVAL '2 months',
+    INTERVAL '1 month'
+  ) M;
+
+INSERT INTO "public"."node_coldtag_event" ("id", "node_coldtag_id", "core_coldtag_id", "temperature", "humidity", "core_coldtag_received_time", "event_time", "latitude", "longitude", "time")
+SELECT
+  "id", "node_coldtag_id", "core_coldtag_id", "temperature", "humidity", "core_coldtag_received_time", "event_time", "latitude", "longitude", "time"
+FROM
+  "public"."node_coldtag_event_legacy";
+
+DROP TABLE "public"."node_coldtag_event_legacy";
+
+ALTER TABLE "public"."node_coldtag_event"
+ADD PRIMARY KEY ("id", "event_time"),
+ADD CONSTRAINT "node_coldtag_event_node_coldtag_id_event_time_key" UNIQUE ("node_coldtag_id", "event_time");
+
+CREATE INDEX "node_coldtag_event_event_time_brin_idx" ON "public"."node_coldtag_event" USING BRIN ("event_time");
+
+ALTER TABLE "public"."node_coldtag_event" ENABLE ROW LEVEL SECURITY;
+
+ALTER TABLE "public"."node_coldtag_event_default" ENABLE ROW LEVEL SECURITY;
+
+ALTER TABLE "public"."node_coldtag_event_alert_liquid"
+RENAME TO "node_coldtag_event_alert_liquid_legacy";
+
+CREATE TABLE "public"."node_coldtag_event_alert_liquid" (
+  "id" INT NOT NULL DEFAULT NEXTVAL('public.node_coldtag_event_alert_liquid_id_seq'),
+  "node_coldtag_id" INT NOT NULL REFERENCES "public"."create_node_coldtag" (ID),
+  "core_coldtag_id" INT NOT NULL REFERENCES "public"."create_core_coldtag" (ID),
+  "core_coldtag_received_time" TIMESTAMPTZ NOT NULL,
+  "event_time" TIMESTAMPTZ NOT NULL,
+  "latitude" DOUBLE PRECISION,
+  "longitude" DOUBLE PRECISION,
+  "time" TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP
+)
+PARTITION BY
+  RANGE ("event_time");
+
+ALTER SEQUENCE "public"."node_coldtag_event_alert_liquid_id_seq" OWNED BY "public"."node_coldtag_event_alert_liquid"."id";
+
+CREATE TABLE "public"."node_coldtag_event_alert_liquid_default" PARTITION OF "public"."node_coldtag_event_alert_liquid" DEFAULT;
+
+SELECT
+  "public"."create_event_partition" ('"public"."node_coldtag_event_alert_liquid"', M)
+FROM
+  GENERATE_SERIES(
+    DATE_TRUNC(
+      'month',
+      COALESCE(
+        (
+          SELECT
+            MIN(EVENT_TIME)
+          FROM
+            "public"."node_coldtag_event_alert_liquid_legacy"
+        ),
+        NOW()
+      )
+    ),
+    NOW() + INTERVAL '2 months',
+    INTERVAL '1 month'
+  ) M;
+
+INSERT INTO "public"."node_coldtag_event_alert_liquid" ("id", "node_coldtag_id", "core_coldtag_id", "core_coldtag_received_time", "event_time", "latitude", "longitude", "time")
+SELECT
+  "id", "node_coldtag_id", "core_coldtag_id", "core_coldtag_received_time", "event_time", "latitude", "longitude", "time"
+FROM
+  "public"."node_coldtag_event_alert_liquid_legacy";
+
+DROP TABLE "public"."node_coldtag_event_alert_liquid_legacy";
+
+ALTER TABLE "public"."node_coldtag_event_alert_liquid"
+ADD PRIMARY KEY ("id", "event_time"),
+ADD CONSTRAINT "node_coldtag_event_alert_liquid_node_coldtag_id_event_time_key" UNIQUE ("node_coldtag_id", "event_time");
+
+CREATE INDEX "node_coldtag_event_alert_liquid_event_time_brin_idx" ON "public"."node_coldtag_event_alert_liquid" USING BRIN ("event_time");
+
+ALTER TABLE "public"."node_coldtag_event_alert_liquid" ENABLE ROW LEVEL SECURITY;
+
+ALTER TABLE "public"."node_coldtag_event_alert_liquid_default" ENABLE ROW LEVEL SECURITY;
+
+ALTER TABLE "public"."node_coldtag_event_alert_impact"
+RENAME TO "node_coldtag_event_alert_impact_legacy";
+
+CREATE TABLE "public"."node_coldtag_event_alert_impact" (
+  "id" INT NOT NULL DEFAULT NEXTVAL('public.node_coldtag_event_alert_impact_id_seq'),
+  "node_coldtag_id" INT NOT NULL REFERENCES "public"."create_node_coldtag" (ID),
+  "core_coldtag_id" INT NOT NULL REFERENCES "public"."create_core_coldtag" (ID),
+  "core_coldtag_received_time" TIMESTAMPTZ NOT NULL,
+  "event_time" TIMESTAMPTZ NOT NULL,
+  "latitude" DOUBLE PRECISION,
+  "longitude" DOUBLE PRECISION,
+  "time" TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP
+)
+PARTITION BY
+  RANGE ("event_time");
+
+ALTER SEQUENCE "public"."node_coldtag_event_alert_impact_id_seq" OWNED BY "public"."node_coldtag_event_alert_impact"."id";
+
+CREATE TABLE "public"."node_coldtag_event_alert_impact_default" PARTITION OF "public"."node_coldtag_event_alert_impact" DEFAULT;
+
+SELECT
+  "public"."create_event_partition" ('"public"."node_coldtag_event_alert_impact"', M)
+FROM
+  GENERATE_SERIES(
+    DATE_TRUNC(
+      'month',
+      COALESCE(
+        (
+          SELECT
+            MIN(EVENT_TIME)
+          FROM
+            "public"."node_coldtag_event_alert_impact_legacy"
+        ),
+        NOW()
+      )
+    ),
+    NOW() + INTERVAL '2 months',
+    INTERVAL '1 month'
+  ) M;
+
+INSERT INTO "public"."node_coldtag_event_alert_impact" ("id", "node_coldtag_id", "core_coldtag_id", "core_coldtag_received_time", "event_time", "latitude", "longitude", "time")
+SELECT
+  "id", "node_coldtag_id", "core_coldtag_id", "core_coldtag_received_time", "event_time", "latitude", "longitude", "time"
+FROM
+  "public"."node_coldtag_event_alert_impact_legacy";
+
+DROP TABLE "public"."node_coldtag_event_alert_impact_legacy";
+
+ALTER TABLE "public"."node_coldtag_event_alert_impact"
+ADD PRIMARY KEY ("id", "event_time"),
+ADD CONSTRAINT "node_coldtag_event_alert_impact_node_coldtag_id_event_time_key" UNIQUE ("node_coldtag_id", "event_time");
+
+CREATE INDEX "node_coldtag_event_alert_impact_event_time_brin_idx" ON "public"."node_coldtag_event_alert_impact" USING BRIN ("event_time");
+
+ALTER TABLE "public"."node_coldtag_event_alert_impact" ENABLE ROW LEVEL SECURITY;
+
+ALTER TABLE "public"."node_coldtag_event_alert_impact_default" ENABLE ROW LEVEL SECURITY;
+
+ALTER TABLE "public"."route_cycle_alert_temperature"
+RENAME TO "route_cycle_alert_temperature_legacy";
+
+CREATE TABLE "public"."route_cycle_alert_temperature" (
+  "id" INT NOT NULL DEFAULT NEXTVAL('public.route_cycle_alert_temperature_id_seq'),
+  "route_cycle_id" INT NOT NULL REFERENCES "public"."create_route_cycle" (ID),
+  "node_coldtag_id" INT NOT NULL REFERENCES "public"."create_node_coldtag" (ID),
+  "core_coldtag_id" INT NOT NULL REFERENCES "public"."create_core_coldtag" (ID),
+  "temperature" DOUBLE PRECISION NOT NULL,
+  "temperature_alert_threshold" DOUBLE PRECISION NOT NULL,
+  "latitude" DOUBLE PRECISION,
+  "longitude" DOUBLE PRECISION,
+  "core_coldtag_received_time" TIMESTAMPTZ NOT NULL,
+  "event_time" TIMESTAMPTZ NOT NULL,
+  "time" TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP
+)
+PARTITION BY
+  RANGE ("event_time");
+
+ALTER SEQUENCE "public"."route_cycle_alert_temperature_id_seq" OWNED BY "public"."route_cycle_alert_temperature"."id";
+
+CREATE TABLE "public"."route_cycle_alert_temperature_default" PARTITION OF "public"."route_cycle_alert_temperature" DEFAULT;
+
+SELECT
+  "public"."create_event_partition" ('"public"."route_cycle_alert_temperature"', M)
+FROM
+  GENERATE_SERIES(
+    DATE_TRUNC(
+      'month',
+      COALESCE(
+        (
+          SELECT
+            MIN(EVENT_TIME)
+          FROM
+            "public"."route_cycle_alert_temperature_legacy"
+        ),
+        NOW()
+      )
+    ),
+    NOW() + INTERVAL '2 months',
+    INTERVAL '1 month'
+  ) M;
+
+INSERT INTO "public"."route_cycle_alert_temperature" ("id", "route_cycle_id", "node_coldtag_id", "core_coldtag_id", "temperature", "temperature_alert_threshold", "latitude", "longitude", "core_coldtag_received_time", "event_time", "time")
+SELECT
+  "id", "route_cycle_id", "node_coldtag_id", "core_coldtag_id", "temperature", "temperature_alert_threshold", "latitude", "longitude", "core_coldtag_received_time", "event_time", "time"
+FROM
+  "public"."route_cycle_alert_temperature_legacy";
+
+DROP TABLE "public"."route_cycle_alert_temperature_legacy";
+
+ALTER TABLE "public"."route_cycle_alert_temperature"
+ADD PRIMARY KEY ("id", "event_time"),
+ADD CONSTRAINT "route_cycle_alert_temperature_route_cycle_id_event_time_key" UNIQUE ("route_cycle_id", "event_time");
+
+CREATE INDEX "route_cycle_alert_temperature_event_time_brin_idx" ON "public"."route_cycle_alert_temperature" USING BRIN ("event_time");
+
+ALTER TABLE "public"."route_cycle_alert_temperature" ENABLE ROW LEVEL SECURITY;
+
+ALTER TABLE "public"."route_cycle_alert_temperature_default" ENABLE ROW LEVEL SECURITY;
+
+ALTER TABLE "public"."route_cycle_alert_humidity"
+RENAME TO "route_cycle_alert_humidity_legacy";
+
+CREATE TABLE "public"."route_cycle_alert_humidity" (
+  "id" INT NOT NULL DEFAULT NEXTVAL('public.route_cycle_alert_humidity_id_seq'),
+  "route_cycle_id" INT NOT NULL REFERENCES "public"."create_route_cycle" (ID),
+  "node_coldtag_id" INT NOT NULL REFERENCES "public"."create_node_coldtag" (ID),
+  "core_coldtag_id" INT NOT NULL REFERENCES "public"."create_core_coldtag" (ID),
+  "humidity" DOUBLE PRECISION NOT NULL,
+  "humidity_alert_threshold" DOUBLE PRECISION NOT NULL,
+  "latitude" DOUBLE PRECISION,
+  "longitude" DOUBLE PRECISION,
+  "core_coldtag_received_time" TIMESTAMPTZ NOT NULL,
+  "event_time" TIMESTAMPTZ NOT NULL,
+  "time" TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP
+)
+PARTITION BY
+  RANGE ("event_time");
+
+ALTER SEQUENCE "public"."route_cycle_alert_humidity_id_seq" OWNED BY "public"."route_cycle_alert_humidity"."id";
+
+CREATE TABLE "public"."route_cycle_alert_humidity_default" PARTITION OF "public"."route_cycle_alert_humidity" DEFAULT;
+
+SELECT
+  "public"."create_event_partition" ('"public"."route_cycle_alert_humidity"', M)
+FROM
+  GENERATE_SERIES(
+    DATE_TRUNC(
+      'month',
+      COALESCE(
+        (
+          SELECT
+            MIN(EVENT_TIME)
+          FROM
+            "public"."route_cycle_alert_humidity_legacy"
+        ),
+        NOW()
+      )
+    ),
+    NOW() + INTERVAL '2 months',
+    INTERVAL '1 month'
+  ) M;
+
+INSERT INTO "public"."route_cycle_alert_humidity" ("id", "route_cycle_id", "node_coldtag_id", "core_coldtag_id", "humidity", "humidity_alert_threshold", "latitude", "longitude", "core_coldtag_received_time", "event_time", "time")
+SELECT
+  "id", "route_cycle_id", "node_coldtag_id", "core_coldtag_id", "humidity", "humidity_alert_threshold", "latitude", "longitude", "core_coldtag_received_time", "event_time", "time"
+FROM
+  "public"."route_cycle_alert_humidity_legacy";
+
+DROP TABLE "public"."route_cycle_alert_humidity_legacy";
+
+ALTER TABLE "public"."route_cycle_alert_humidity"
+ADD PRIMARY KEY ("id", "event_time"),
+ADD CONSTRAINT "route_cycle_alert_humidity_route_cycle_id_event_time_key" UNIQUE ("route_cycle_id", "event_time");
+
+CREATE INDEX "route_cycle_alert_humidity_event_time_brin_idx" ON "public"."route_cycle_alert_humidity" USING BRIN ("event_time");
+
+ALTER TABLE "public"."route_cycle_alert_humidity" ENABLE ROW LEVEL SECURITY;
+
+ALTER TABLE "public"."route_cycle_alert_humidity_default" ENABLE ROW LEVEL SECURITY;
@@ -0,0 +1,127 @@
+CREATE TABLE "public"."node_coldtag_event_rollup" (
+  "node_coldtag_id" INT NOT NULL REFERENCES "public"."create_node_coldtag" (ID),
+  "resolution" INT NOT NULL,
+  "bucket_time" TIMESTAMPTZ NOT NULL,
+  "count" INT NOT NULL,
+  "temperature_count" INT NOT NULL,
+  "temperature_sum" DOUBLE PRECISION NOT NULL,
+  "temperature_min" DOUBLE PRECISION,
+  "temperature_max" DOUBLE PRECISION,
+  "temperature_first" DOUBLE PRECISION,
+  "temperature_last" DOUBLE PRECISION,
+  "humidity_count" INT NOT NULL,
+  "humidity_sum" DOUBLE PRECISION NOT NULL,
+  "humidity_min" DOUBLE PRECISION,
+  "humidity_max" DOUBLE PRECISION,
+  "humidity_first" DOUBLE PRECISION,
+  "humidity_last" DOUBLE PRECISION,
+  "first_event_time" TIMESTAMPTZ NOT NULL,
+  "last_event_time" TIMESTAMPTZ NOT NULL,
+  PRIMARY KEY ("node_coldtag_id", "resolution", "bucket_time")
+);
+
+ALTER TABLE "public"."node_coldtag_event_rollup" ENABLE ROW LEVEL SECURITY;
+
+CREATE INDEX "node_coldtag_event_rollup_resolution_bucket_time_idx" ON "public"."node_coldtag_event_rollup" ("resolution", "bucket_time");
+
+-- Buckets of 1 minute, 15 minutes and 1 hour, merged with what earlier inserts already rolled up.
+-- Rows dropped by ON CONFLICT DO NOTHING never reach the transition table and are not counted twice.
+-- First and last values skip missing readings, a bucket keeps the value it has when a merge brings none.
+-- Buckets are upserted in (resolution, node, bucket) order so concurrent statements lock them in the same order
+CREATE FUNCTION "public"."rollup_node_coldtag_event" () RETURNS TRIGGER LANGUAGE PLPGSQL AS $$
+BEGIN
+  INSERT INTO "public"."node_coldtag_event_rollup" AS NCER
+  SELECT
+    NCE.NODE_COLDTAG_ID,
+    R.RESOLUTION,
+    DATE_BIN(MAKE_INTERVAL(SECS => R.RESOLUTION), NCE.EVENT_TIME, TIMESTAMPTZ 'epoch'),
+    COUNT(*),
+    COUNT(NCE.TEMPERATURE),
+    COALESCE(SUM(NCE.TEMPERATURE), 0),
+    MIN(NCE.TEMPERATURE),
+    MAX(NCE.TEMPERATURE),
+    (ARRAY_AGG(NCE.TEMPERATURE ORDER BY NCE.EVENT_TIME) FILTER (WHERE NCE.TEMPERATURE IS NOT NULL))[1],
+    (ARRAY_AGG(NCE.TEMPERATURE ORDER BY NCE.EVENT_TIME DESC) FILTER (WHERE NCE.TEMPERATURE IS NOT NULL))[1],
+    COUNT(NCE.HUMIDITY),
+    COALESCE(SUM(NCE.HUMIDITY), 0),
+    MIN(NCE.HUMIDITY),
+    MAX(NCE.HUMIDITY),
+    (ARRAY_AGG(NCE.HUMIDITY ORDER BY NCE.EVENT_TIME) FILTER (WHERE NCE.HUMIDITY IS NOT NULL))[1],
+    (ARRAY_AGG(NCE.HUMIDITY ORDER BY NCE.EVENT_TIME DESC) FILTER (WHERE NCE.HUMIDITY IS NOT NULL))[1],
+    MIN(NCE.EVENT_TIME),
+    MAX(NCE.EVENT_TIME)
+  FROM
+    "inserted" NCE
+    CROSS JOIN (
+      VALUES
+        (60),
+        (900),
+        (3600)
+    ) R (RESOLUTION)
+  GROUP BY
+    1,
+    2,
+    3
+  ORDER BY
+    2,
+    1,
+    3
+  ON CONFLICT (NODE_COLDTAG_ID, RESOLUTION, BUCKET_TIME) DO UPDATE SET
+    COUNT = NCER.COUNT + EXCLUDED.COUNT,
+    TEMPERATURE_COUNT = NCER.TEMPERATURE_COUNT + EXCLUDED.TEMPERATURE_COUNT,
+    TEMPERATURE_SUM = NCER.TEMPERATURE_SUM + EXCLUDED.TEMPERATURE_SUM,
+    TEMPERATURE_MIN = LEAST(NCER.TEMPERATURE_MIN, EXCLUDED.TEMPERATURE_MIN),
+    TEMPERATURE_MAX = GREATEST(NCER.TEMPERATURE_MAX, EXCLUDED.TEMPERATURE_MAX),
+    TEMPERATURE_FIRST = CASE WHEN EXCLUDED.FIRST_EVENT_TIME < NCER.FIRST_EVENT_TIME THEN COALESCE(EXCLUDED.TEMPERATURE_FIRST, NCER.TEMPERATURE_FIRST) ELSE COALESCE(NCER.TEMPERATURE_FIRST, EXCLUDED.TEMPERATURE_FIRST) END,
+    TEMPERATURE_LAST = CASE WHEN EXCLUDED.LAST_EVENT_TIME > NCER.LAST_EVENT_TIME THEN COALESCE(EXCLUDED.TEMPERATURE_LAST, NCER.TEMPERATURE_LAST) ELSE COALESCE(NCER.TEMPERATURE_LAST, EXCLUDED.TEMPERATURE_LAST) END,
+    HUMIDITY_COUNT = NCER.HUMIDITY_COUNT + EXCLUDED.HUMIDITY_COUNT,
+    HUMIDITY_SUM = NCER.HUMIDITY_SUM + EXCLUDED.HUMIDITY_SUM,
+    HUMIDITY_MIN = LEAST(NCER.HUMIDITY_MIN, EXCLUDED.HUMIDITY_MIN),
+    HUMIDITY_MAX = GREATEST(NCER.HUMIDITY_MAX, EXCLUDED.HUMIDITY_MAX),
+    HUMIDITY_FIRST = CASE WHEN EXCLUDED.FIRST_EVENT_TIME < NCER.FIRST_EVENT_TIME THEN COALESCE(EXCLUDED.HUMIDITY_FIRST, NCER.HUMIDITY_FIRST) ELSE COALESCE(NCER.HUMIDITY_FIRST, EXCLUDED.HUMIDITY_FIRST) END,
+    HUMIDITY_LAST = CASE WHEN EXCLUDED.LAST_EVENT_TIME > NCER.LAST_EVENT_TIME THEN COALESCE(EXCLUDED.HUMIDITY_LAST, NCER.HUMIDITY_LAST) ELSE COALESCE(NCER.HUMIDITY_LAST, EXCLUDED.HUMIDITY_LAST) END,
+    FIRST_EVENT_TIME = LEAST(NCER.FIRST_EVENT_TIME, EXCLUDED.FIRST_EVENT_TIME),
+    LAST_EVENT_TIME = GREATEST(NCER.LAST_EVENT_TIME, EXCLUDED.LAST_EVENT_TIME);
+
+  RETURN NULL;
+END;
+$$;
+
+CREATE TRIGGER "node_coldtag_event_rollup"
+AFTER INSERT ON "public"."node_coldtag_event" REFERENCING NEW TABLE AS "inserted" FOR EACH STATEMENT
+EXECUTE FUNCTION "public"."rollup_node_coldtag_event" ();
+
+LOCK TABLE "public"."node_coldtag_event" IN SHARE MODE;
+
+INSERT INTO "public"."node_coldtag_event_rollup"
+SELECT
+  NCE.NODE_COLDTAG_ID,
+  R.RESOLUTION,
+  DATE_BIN(MAKE_INTERVAL(SECS => R.RESOLUTION), NCE.EVENT_TIME, TIMESTAMPTZ 'epoch'),
+  COUNT(*),
+  COUNT(NCE.TEMPERATURE),
+  COALESCE(SUM(NCE.TEMPERATURE), 0),
+  MIN(NCE.TEMPERATURE),
+  MAX(NCE.TEMPERATURE),
+  (ARRAY_AGG(NCE.TEMPERATURE ORDER BY NCE.EVENT_TIME) FILTER (WHERE NCE.TEMPERATURE IS NOT NULL))[1],
+  (ARRAY_AGG(NCE.TEMPERATURE ORDER BY NCE.EVENT_TIME DESC) FILTER (WHERE NCE.TEMPERATURE IS NOT NULL))[1],
+  COUNT(NCE.HUMIDITY),
+  COALESCE(SUM(NCE.HUMIDITY), 0),
+  MIN(NCE.HUMIDITY),
+  MAX(NCE.HUMIDITY),
+  (ARRAY_AGG(NCE.HUMIDITY ORDER BY NCE.EVENT_TIME) FILTER (WHERE NCE.HUMIDITY IS NOT NULL))[1],
+  (ARRAY_AGG(NCE.HUMIDITY ORDER BY NCE.EVENT_TIME DESC) FILTER (WHERE NCE.HUMIDITY IS NOT NULL))[1],
+  MIN(NCE.EVENT_TIME),
+  MAX(NCE.EVENT_TIME)
+FROM
+  "public"."node_coldtag_event" NCE
+  CROSS JOIN (
+    VALUES
+      (60),
+      (900),
+      (3600)
+  ) R (RESOLUTION)
+GROUP BY
+  1,
+  2,
+  3;
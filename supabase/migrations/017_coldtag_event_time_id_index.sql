@@ -0,0 +1,9 @@
+-- Fleet-wide connections page on (event_time, id) without an owner filter, BRIN cannot return rows in that order.
+-- Indexes on the partitioned parents are created on every partition, including the ones attached later
+CREATE INDEX "core_coldtag_event_event_time_id_idx" ON "public"."core_coldtag_event" ("event_time", "id");
+
+CREATE INDEX "node_coldtag_event_event_time_id_idx" ON "public"."node_coldtag_event" ("event_time", "id");
+
+CREATE INDEX "node_coldtag_event_alert_liquid_event_time_id_idx" ON "public"."node_coldtag_event_alert_liquid" ("event_time", "id");
+
+CREATE INDEX "node_coldtag_event_alert_impact_event_time_id_idx" ON "public"."node_coldtag_event_alert_impact" ("event_time", "id");
@@ -0,0 +1,25 @@
+-- Addresses are registered and looked up as upper case hex split by colons, rows registered before are brought in line.
+-- The projections are only refreshed on insert, so they are updated alongside
+UPDATE "public"."create_core_coldtag"
+SET
+  "mac_address" = UPPER(REPLACE("mac_address", '-', ':'))
+WHERE
+  "mac_address" <> UPPER(REPLACE("mac_address", '-', ':'));
+
+UPDATE "public"."core_coldtag_projection"
+SET
+  "mac_address" = UPPER(REPLACE("mac_address", '-', ':'))
+WHERE
+  "mac_address" <> UPPER(REPLACE("mac_address", '-', ':'));
+
+UPDATE "public"."create_node_coldtag"
+SET
+  "mac_address" = UPPER(REPLACE("mac_address", '-', ':'))
+WHERE
+  "mac_address" <> UPPER(REPLACE("mac_address", '-', ':'));
+
+UPDATE "public"."node_coldtag_projection"
+SET
+  "mac_address" = UPPER(REPLACE("mac_address", '-', ':'))
+WHERE
+  "mac_address" <> UPPER(REPLACE("mac_address", '-', ':'));